@@ -0,0 +1,2 @@
+# Gemaakt door Joshua Meuleman
+"""Benchmark suite for the engine hot paths; run with `python -m benchmarks`."""
@@ -0,0 +1,51 @@
+# Gemaakt door Joshua Meuleman
+"""Command line for the benchmark suite.
+
+    python -m benchmarks run [--out current.json] [--filter hand] [--quick]
+    python -m benchmarks compare baseline.json current.json [--threshold 0.10]
+
+`compare` exits with status 1 when a benchmark got slower than the threshold.
+"""
+import argparse
+import sys
+
+from . import cases  # noqa: F401  (registers the benchmarks)
+from .harness import REGISTRY, compare, format_comparison, load_report, run_all, save_report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run the benchmarks")
+    run.add_argument("--out", help="write the JSON report to this file")
+    run.add_argument("--filter", help="only benchmarks whose name contains this text")
+    run.add_argument("--group", choices=("micro", "macro"), help="only this group")
+    run.add_argument("--repeat", type=int, default=7)
+    run.add_argument("--min-time", type=float, default=0.05, help="seconds per timed sample")
+    run.add_argument("--quick", action="store_true", help="3 short samples (smoke test)")
+    cmp_ = sub.add_parser("compare", help="compare a report against a baseline")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=0.10,
+                      help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        benchmarks = [b for b in REGISTRY if args.group in (None, b.group)]
+        repeat, min_time, warmup = args.repeat, args.min_time, 0.05
+        if args.quick:
+            repeat, min_time, warmup = 3, 0.005, 0.0
+        report = run_all(benchmarks, args.filter, repeat=repeat, min_time=min_time, warmup=warmup)
+        if args.out:
+            save_report(report, args.out)
+        return 0
+
+    rows = compare(load_report(args.baseline), load_report(args.current), args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(r["regression"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,173 @@
+# Gemaakt door Joshua Meuleman
+"""Registered benchmarks: micro (per card, per decision) and macro (rounds/sec).
+
+Every setup builds its inputs once and returns the callable that is timed.
+Inputs are fixed (seeded shuffles, card lists cycled in a loop) so two runs on
+the same machine time the same work.
+"""
+import random
+
+from src import deck
+from src.ai.basic_strategy import BASIC_TABLE, choose_action, choose_action_code, hand_state
+from src.ai.counting import Counting
+from src.ai.npc import NPC
+from src.game import Game
+from src.hand import Hand, parse_card
+from src.player_impls import BaselinePlayer
+
+from .harness import bench
+
+# 312 card codes of a seeded six-deck shoe, reused by the per-card benchmarks
+_SHOE = deck.create_shoe(6)
+deck.shuffle(_SHOE, random.Random(1))
+_CODES = list(_SHOE)
+_DICTS = [deck.card_from_code(c) for c in _CODES]
+_STRINGS = [parse_card(c) for c in _CODES]
+
+# two-card player hands against every upcard
+_HANDS = []
+for _i in range(0, 300, 3):
+    _h = Hand()
+    _h.add(_STRINGS[_i])
+    _h.add(_STRINGS[_i + 1])
+    _HANDS.append((_h, _STRINGS[_i + 2], _CODES[_i + 2]))
+
+
+@bench("hand.add", ops=len(_STRINGS), unit="card")
+def hand_add():
+    hand = Hand()
+
+    def run():
+        for card in _STRINGS:
+            hand.add(card)
+        hand.reset()
+    return run
+
+
+@bench("hand.values", ops=len(_HANDS), unit="hand")
+def hand_values():
+    hands = [h for h, _, _ in _HANDS]
+
+    def run():
+        for h in hands:
+            h.values()
+            h.best_value()
+    return run
+
+
+@bench("parse_card.dict", ops=len(_DICTS), unit="card")
+def parse_card_dict():
+    def run():
+        for card in _DICTS:
+            parse_card(card)
+    return run
+
+
+@bench("parse_card.code", ops=len(_CODES), unit="card")
+def parse_card_code():
+    def run():
+        for card in _CODES:
+            parse_card(card)
+    return run
+
+
+@bench("choose_action", ops=len(_HANDS), unit="hand")
+def choose_action_hands():
+    def run():
+        for hand, upcard, _ in _HANDS:
+            choose_action(hand, upcard)
+    return run
+
+
+@bench("choose_action_code", ops=len(_HANDS), unit="hand")
+def choose_action_codes():
+    states = [(hand_state(h), code) for h, _, code in _HANDS]
+
+    def run():
+        for state, upcard in states:
+            choose_action_code(state, upcard, BASIC_TABLE)
+    return run
+
+
+@bench("npc.choose_action", ops=len(_HANDS), unit="hand")
+def npc_choose_action():
+    npc = NPC()
+    npc.start_shoe(6)
+
+    def run():
+        for hand, upcard, _ in _HANDS:
+            npc.choose_action(hand, upcard)
+    return run
+
+
+@bench("counting.update", ops=len(_CODES), unit="card")
+def counting_update():
+    counting = Counting()
+
+    def run():
+        for card in _CODES:
+            counting.update(card)
+        counting.reset()
+    return run
+
+
+@bench("deck.draw", ops=len(_SHOE), unit="card")
+def deck_draw():
+    observers = deck.DrawObservers()
+
+    def run():
+        shoe = _SHOE[:]
+        for _ in range(len(_SHOE)):
+            deck.draw(shoe, True, observers)
+    return run
+
+
+@bench("deck.draw.observed", ops=len(_SHOE), unit="card")
+def deck_draw_observed():
+    observers = deck.DrawObservers()
+    observers.register(Counting().update)
+
+    def run():
+        shoe = _SHOE[:]
+        for _ in range(len(_SHOE)):
+            deck.draw(shoe, True, observers)
+    return run
+
+
+def _table(seats: int, rounds: int):
+    # one Game per benchmark; reshuffles are part of the measured rounds
+    game = Game(num_decks=6, compact=True, rng=random.Random(seats))
+    players = [BaselinePlayer(f"seat{i}", fixed_bet=1) for i in range(seats)]
+    for p in players:
+        p.bankroll = 1e12
+
+    def run():
+        for _ in range(rounds):
+            game.play_round(players)
+    return run
+
+
+for _seats in (1, 3, 7):
+    bench(f"game.play_round.{_seats}seat", group="macro", ops=200, unit="round")(
+        lambda _seats=_seats: _table(_seats, 200))
+
+
+@bench("table.headless.7seat", group="macro", ops=200, unit="round")
+def headless_table():
+    from src.sim.table import HeadlessTable
+    table = HeadlessTable(seats=7, rng=random.Random(7))
+
+    def run():
+        table.play(200)
+    return run
+
+
+@bench("simulate_shoes.vector", group="macro", ops=64, unit="shoe")
+def simulate_shoes_vector():
+    from src.sim.runner import simulate_shoes
+
+    def run():
+        simulate_shoes(64, seed=1, chunk_shoes=64)
+    return run
+
+# Gemaakt door Joshua Meuleman
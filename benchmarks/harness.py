@@ -0,0 +1,152 @@
+# Gemaakt door Joshua Meuleman
+"""Small benchmark harness: registry, timing, memory peak and JSON reports.
+
+A benchmark is a setup function registered with `@bench`. The setup runs once
+and returns a callable that performs `ops` operations per call; the harness
+times that callable only, so table and shoe construction stay out of the
+numbers.
+
+Per benchmark `run_benchmark`:
+- warms up for `warmup` seconds;
+- calibrates how many calls fill `min_time` seconds;
+- takes `repeat` samples with `time.perf_counter_ns` and reports ns per op
+  (min, median, mean, stdev) and ops/sec from the median;
+- runs one extra call under `tracemalloc` for the peak of newly allocated
+  memory (tracing is slow, so it never overlaps the timed samples).
+
+`compare` matches two reports by name and flags benchmarks whose median got
+slower than `threshold` (a fraction, 0.10 = 10%).
+"""
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Benchmark(NamedTuple):
+    name: str
+    group: str
+    ops: int
+    unit: str
+    setup: Callable[[], Callable[[], Any]]
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def bench(name: str, group: str = "micro", ops: int = 1, unit: str = "op"):
+    """Register a setup function; its return value is the timed callable."""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        REGISTRY.append(Benchmark(name, group, ops, unit, setup))
+        return setup
+    return register
+
+
+def _time_calls(fn: Callable[[], Any], number: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        fn()
+    return time.perf_counter_ns() - start
+
+
+def run_benchmark(b: Benchmark, repeat: int = 7, min_time: float = 0.05,
+                  warmup: float = 0.05) -> Dict[str, Any]:
+    """Time one benchmark; returns its JSON-ready result."""
+    fn = b.setup()
+    deadline = time.perf_counter() + warmup
+    fn()
+    while time.perf_counter() < deadline:
+        fn()
+
+    number = 1
+    while True:
+        elapsed = _time_calls(fn, number)
+        if elapsed >= min_time * 1e9 or number >= 1 << 20:
+            break
+        number = max(number * 2, int(number * min_time * 1e9 / max(elapsed, 1)))
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = [_time_calls(fn, number) / (number * b.ops) for _ in range(repeat)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(samples)
+    return {"group": b.group, "unit": b.unit, "ops_per_call": b.ops, "calls": number,
+            "repeat": repeat, "min_ns": min(samples), "median_ns": median,
+            "mean_ns": statistics.fmean(samples),
+            "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "per_sec": 1e9 / median if median else 0.0, "peak_bytes": peak}
+
+
+def run_all(benchmarks: List[Benchmark], name_filter: Optional[str] = None,
+            write: Callable[[str], Any] = print, **options) -> Dict[str, Any]:
+    """Run every benchmark whose name contains `name_filter`; returns the report."""
+    results = {}
+    for b in benchmarks:
+        if name_filter and name_filter not in b.name:
+            continue
+        res = run_benchmark(b, **options)
+        results[b.name] = res
+        write(f"{b.name:<32}{res['median_ns']:>14,.1f} ns/{b.unit:<6}"
+              f"{res['per_sec']:>16,.0f} {b.unit}/s{res['peak_bytes'] / 1024:>10.1f} KiB peak")
+    return {"meta": environment(), "results": results}
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {"python": sys.version.split()[0], "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(),
+            "numpy": numpy_version, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Per common benchmark: ratio current/baseline of the median and a regression flag."""
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["median_ns"]:
+            continue
+        ratio = cur["median_ns"] / base["median_ns"]
+        rows.append({"name": name, "baseline_ns": base["median_ns"], "current_ns": cur["median_ns"],
+                     "ratio": ratio, "regression": ratio > 1.0 + threshold})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<32}{'baseline ns':>14}{'current ns':>14}{'change':>9}"]
+    for r in rows:
+        flag = "  SLOWER" if r["regression"] else ""
+        lines.append(f"{r['name']:<32}{r['baseline_ns']:>14,.1f}{r['current_ns']:>14,.1f}"
+                     f"{r['ratio'] - 1:>+9.1%}{flag}")
+    return "\n".join(lines)
+
+# Gemaakt door Joshua Meuleman
@@ -17,7 +17,6 @@ if str(ROOT) not in sys.path:
 
 from src.game import Game
 from src.player_impls import HumanPlayer, NPCPlayer
-from src import deck
 
 
 def main():
@@ -34,8 +33,9 @@ def main():
     npc_agent = NPCPlayer("NPC")
 
     # Inform NPC about shoe and register observer
+    game.register_shoe_observer(npc_agent.start_shoe)
+    game.register_batch_observer(npc_agent.npc.observe_cards)
     game.start_shoe()
-    deck.register_draw_observer(npc_agent.npc.observe_card)
 
     round_no = 0
     try:
@@ -48,7 +48,7 @@ def main():
             if not cont.strip().lower().startswith("y"):
                 break
     finally:
-        deck.unregister_draw_observer(npc_agent.npc.observe_card)
+        game.unregister_batch_observer(npc_agent.npc.observe_cards)
         print("Exiting — observer unregistered")
 
 
@@ -23,7 +23,7 @@ def format_card(card):
 def run_demo(num_decks: int = 6, rounds: int = 5):
     deck = create_deck(num_decks)
     shuffle(deck)
-    npc = NPC(bet_unit=1)
+    npc = NPC(bet_unit=1, history_size=12)
     npc.start_shoe(num_decks)
     # Register NPC as observer so it automatically sees every drawn card
     register_draw_observer(npc.observe_card)
@@ -56,7 +56,8 @@ def run_demo(num_decks: int = 6, rounds: int = 5):
             print("Dealer hole kaart wordt onthuld:", format_card(dealer[1]))
             print(f"Running count (na onthulling): {npc.running_count()}")
             print(f"True count (est): {npc.true_count():.2f}")
-            print(f"Totaal geziene kaarten: {len(npc.counting.seen)}")
+            print(f"Totaal geziene kaarten: {npc.counting.cards_seen}")
+            print(f"Laatste kaarten: {' '.join(npc.counting.history)}")
             print(f"Kaarten resterend in deck: {len(deck)}\n")
     finally:
         unregister_draw_observer(npc.observe_card)
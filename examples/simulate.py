@@ -6,6 +6,14 @@ player. Prints win counts and relative advantage.
 
 Usage:
     python ./examples/simulate.py --rounds 1000 --decks 6
+    python ./examples/simulate.py --strategy tests/BasicStrategy.csv
+    python ./examples/simulate.py --rounds 1000000 --workers 0 --seed 42
+    python ./examples/simulate.py --rounds 10000000 --ci-width 0.02
+    python ./examples/simulate.py --rounds 100000000 --checkpoint run.ckpt [--resume]
+    python ./examples/simulate.py --rounds 1000000 --profile 10
+    python ./examples/simulate.py --crn 10000 --workers 0
+    python ./examples/simulate.py --make-corpus 100000 --corpus shoes.bin [--seed 1]
+    python ./examples/simulate.py --crn 100000 --corpus shoes.bin --workers 0
 
 """
 import sys
@@ -16,44 +24,29 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.game import Game
-from src.player_impls import BaselinePlayer, NPCPlayer
-from src import deck
-
-
-def run_simulation(rounds: int = 1000, num_decks: int = 6):
-    game = Game(num_decks=num_decks)
-    # create players
-    baseline = BaselinePlayer("You", fixed_bet=1)
-    npc = NPCPlayer("NPC")
-
-    # start shoe and register observer so NPC sees cards
-    game.start_shoe()
-    deck.register_draw_observer(npc.npc.observe_card)
-
-    stats = {"rounds": 0, "baseline_wins": 0, "npc_wins": 0, "pushes": 0, "baseline_net": 0.0, "npc_net": 0.0}
-
-    for i in range(rounds):
-        res = game.play_round([baseline, npc])
-        stats["rounds"] += 1
-        bnet = res.get(baseline.id, {}).get("net", 0.0)
-        nnet = res.get(npc.id, {}).get("net", 0.0)
-        stats["baseline_net"] += float(bnet)
-        stats["npc_net"] += float(nnet)
-
-        # decide win by net>0
-        if bnet > 0 and nnet <= 0:
-            stats["baseline_wins"] += 1
-        elif nnet > 0 and bnet <= 0:
-            stats["npc_wins"] += 1
-        elif bnet > 0 and nnet > 0:
-            # both won: count both
-            stats["baseline_wins"] += 1
-            stats["npc_wins"] += 1
-        else:
-            stats["pushes"] += 1
-
-    deck.unregister_draw_observer(npc.npc.observe_card)
+from src.sim.runner import simulate_rounds
+from src.sim.compare import compare_strategies, paired_difference
+from src.sim.corpus import write_corpus
+from src.profiling import format_snapshot, periodic_dump
+
+
+def print_edge(name: str, acc) -> None:
+    s = acc.summary()
+    print(f"{name} edge: {s['edge'] * 100:+.3f}% per unit "
+          f"(95% CI {s['ci_low'] * 100:+.3f}% .. {s['ci_high'] * 100:+.3f}%)")
+    print(f"{name} SD/round: {s['std']:.3f}  N0: {s['n0']:,.0f}  SCORE: {s['score']:.2f}  "
+          f"W/L/P: {s['win_rate']:.3f}/{s['loss_rate']:.3f}/{s['push_rate']:.3f}")
+
+
+def run_simulation(rounds: int = 1000, num_decks: int = 6, strategy_path: str = None,
+                   workers: int = 1, seed: int = None, ci_width: float = None,
+                   checkpoint: str = None, resume: bool = False, profile: float = None):
+    # rounds are split into fixed-size tasks with their own seed stream, so the
+    # same seed gives the same result for any number of workers
+    progress = periodic_dump(profile) if profile else None
+    stats = simulate_rounds(rounds, num_decks, strategy_path, seed=seed, workers=workers,
+                            ci_width=ci_width, checkpoint=checkpoint, resume=resume,
+                            profile=bool(profile), progress=progress)
 
     # compute comparative metrics
     b_w = stats["baseline_wins"]
@@ -73,14 +66,63 @@ def run_simulation(rounds: int = 1000, num_decks: int = 6):
         print(f"NPC won {adv_pct:.2f}% more wins than the baseline (relative to baseline wins)")
     print(f"Baseline net total: {stats['baseline_net']:.2f}")
     print(f"NPC net total: {stats['npc_net']:.2f}")
+    print_edge("Baseline", stats["baseline"])
+    print_edge("NPC", stats["npc"])
+    if "profile" in stats:
+        print(format_snapshot(stats["profile"].snapshot()))
+
+
+def run_comparison(n_shoes: int, num_decks: int = 6, strategy_path: str = None,
+                   workers: int = 1, seed: int = None, corpus: str = None):
+    # common random numbers: NPC and baseline each play the same shoes alone
+    summary = compare_strategies(("baseline", "npc"), n_shoes, num_decks, strategy_path,
+                                 seed=seed, workers=workers, corpus=corpus)
+    print("CRN comparison finished")
+    source = f"corpus {corpus}" if corpus else f"seed {summary['seed']}"
+    print(f"Shoes: {summary['shoes']} ({source})")
+    for kind, acc in summary["per_strategy"].items():
+        low, high = acc.confidence_interval()
+        print(f"{kind}: {summary['rounds'][kind]} rounds, edge {acc.edge * 100:+.3f}% per unit "
+              f"(95% CI {low * 100:+.3f}% .. {high * 100:+.3f}%)")
+    diff, low, high = paired_difference(summary, "npc")
+    print(f"NPC - baseline: {diff:+.4f} units per round (95% CI {low:+.4f} .. {high:+.4f}), "
+          f"variance reduction x{summary['variance_ratio']['npc']:.1f}")
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--rounds", type=int, default=1000)
     parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--strategy", default=None, help="strategy CSV (e.g. tests/BasicStrategy.csv)")
+    parser.add_argument("--workers", type=int, default=1, help="processes (0 = all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ci-width", type=float, default=None,
+                        help="stop once the 95%% CI on the NPC edge is this wide (--rounds is the maximum)")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file, replaced every ~2M rounds")
+    parser.add_argument("--resume", action="store_true", help="continue from --checkpoint")
+    parser.add_argument("--crn", type=int, default=None, metavar="SHOES",
+                        help="compare NPC and baseline separately on the same SHOES shoes")
+    parser.add_argument("--profile", type=float, default=None, metavar="SECONDS",
+                        help="time the phases of play_round and print them every SECONDS")
+    parser.add_argument("--corpus", default=None, help="recorded shoe corpus file for --crn")
+    parser.add_argument("--make-corpus", type=int, default=None, metavar="SHOES",
+                        help="write SHOES shuffled shoes to --corpus and exit")
     args = parser.parse_args()
-    run_simulation(rounds=args.rounds, num_decks=args.decks)
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    if args.make_corpus:
+        if not args.corpus:
+            parser.error("--make-corpus needs --corpus")
+        write_corpus(args.corpus, args.make_corpus, args.decks, seed=args.seed)
+        print(f"Wrote {args.make_corpus} shoes to {args.corpus}")
+        return
+    if args.crn:
+        run_comparison(args.crn, num_decks=args.decks, strategy_path=args.strategy,
+                       workers=args.workers or None, seed=args.seed, corpus=args.corpus)
+        return
+    run_simulation(rounds=args.rounds, num_decks=args.decks, strategy_path=args.strategy,
+                   workers=args.workers or None, seed=args.seed, ci_width=args.ci_width,
+                   checkpoint=args.checkpoint, resume=args.resume, profile=args.profile)
 
 
 if __name__ == "__main__":
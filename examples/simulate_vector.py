@@ -0,0 +1,51 @@
+"""
+# Gemaakt door Joshua Meuleman
+
+Snelle simulatie met de gevectoriseerde engine (`src.sim.vector`): speelt
+volledige shoes voor baseline spelers (basic strategy, vaste inzet) en print
+het geschatte huisvoordeel.
+
+Usage:
+    python ./examples/simulate_vector.py --shoes 20000 --decks 6 --seats 1
+    python ./examples/simulate_vector.py --strategy tests/BasicStrategy.csv
+
+"""
+import sys
+import time
+from pathlib import Path
+import argparse
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from src.sim.vector import VectorSimulator
+from src.ai.strategy_loader import load_strategy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shoes", type=int, default=20000)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--seats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--strategy", default=None, help="strategy CSV (e.g. tests/BasicStrategy.csv)")
+    args = parser.parse_args()
+
+    strategy = load_strategy(args.strategy) if args.strategy else None
+    sim = VectorSimulator(num_decks=args.decks, seats=args.seats, strategy=strategy)
+    start = time.perf_counter()
+    res = sim.run(args.shoes, np.random.default_rng(args.seed))
+    elapsed = time.perf_counter() - start
+
+    nets = res.played()
+    rounds = int(res.rounds.sum())
+    print(f"Shoes: {args.shoes}  rounds: {rounds}  hands: {nets.size}")
+    print(f"Mean net per hand: {nets.mean():+.5f} (+/- {nets.std() / np.sqrt(nets.size):.5f})")
+    print(f"{rounds / elapsed:,.0f} rounds/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,109 +9,254 @@ Opzet:
 - Ondersteunt kaartrepresentatie als dict {'rank','suit'} of als string.
 - Ondersteunt beslissingen voor hard totals, soft totals (usable ace) en pairs.
 - Regels zijn niet alle casino-varianten volledig dekkend — pas regels aan naar behoefte.
+- De regels worden bij import één keer gecompileerd naar een tabel
+  (hand state x dealer upcard); `choose_action_code` is dan één indexering.
 """
+from functools import lru_cache, partial
 from typing import List
 
-from ..hand import parse_card, value, card_value, is_pair
+from ..hand import Hand, rank_code, value, HARD_VALUES, ACE, RANK_SHORT
+from ..rules import Rules, as_rules
 
 
-def choose_action(player_hand: List[object], dealer_upcard: object, rules: dict = None) -> str:
-	"""Kies een actie volgens een vereenvoudigde basic strategy.
+# Action codes; `ACTIONS[code]` gives the action string.
+HIT, STAND, DOUBLE, SPLIT, SURRENDER = range(5)
+ACTIONS = ("hit", "stand", "double", "split", "surrender")
+
+# Hand states: hard totals 0..31, soft totals 11..21 and pairs per rank code.
+HARD_STATES = 32
+SOFT_BASE = HARD_STATES
+PAIR_BASE = SOFT_BASE + 11
+NUM_STATES = PAIR_BASE + 13
+
+# Table row per state with 16 upcard columns: rank codes 0..12 and column 15
+# (rank_code -1 & 15) for an unknown upcard.
+UPCARD_COLUMNS = 16
+
+
+def hard_state(total: int) -> int:
+	return total if total < HARD_STATES else HARD_STATES - 1
+
+
+def soft_state(total: int) -> int:
+	"""State for a soft total 11..21 (11 is a lone Ace)."""
+	return SOFT_BASE + total - 11
 
-	player_hand: lijst van kaarten (dicts of strings)
-	dealer_upcard: kaart (dict of str)
-	rules: optioneel dict voor casino opties (niet gebruikt in deze simplificatie)
 
-	Retourneert één van: 'hit', 'stand', 'double', 'split'
+def pair_state(code: int) -> int:
+	"""State for a pair of the given rank code."""
+	return PAIR_BASE + code
+
+
+def hand_state(player_hand) -> int:
+	"""Map a `Hand` or list of cards to its hand state.
+
+	Pair states are only used for two-card hands.
 	"""
-	# Compute hand value and whether it's soft
-	total, usable = value(player_hand)
-	dealer_rank = parse_card(dealer_upcard)
-	# normalize dealer upcard value for comparisons (Ace high)
-	if dealer_rank in ("A", "Ace"):
-		d = 11
-	else:
-		d = card_value(dealer_rank)
+	cards = player_hand.cards if isinstance(player_hand, Hand) else player_hand
+	if len(cards) == 2:
+		a = rank_code(cards[0])
+		if a >= 0 and a == rank_code(cards[1]):
+			return PAIR_BASE + a
+	if isinstance(player_hand, Hand):
+		if player_hand.is_soft():
+			return SOFT_BASE + player_hand.hard_total - 1
+		return hard_state(player_hand.hard_total)
+	total, usable = value(cards)
+	if usable:
+		return soft_state(total)
+	return hard_state(total)
+
+
+def total_state(hand: Hand) -> int:
+	"""State van het totaal van een `Hand`, zonder pair states (bv. als splitsen niet mag)."""
+	if hand.is_soft():
+		return SOFT_BASE + hand.hard_total - 1
+	return hard_state(hand.hard_total)
+
 
+def _chart_action(total: int, usable: bool, pair: int, d: int) -> int:
+	"""De vereenvoudigde basic strategy als regels.
+
+	total/usable: handwaarde en of ze soft is, pair: rank code van een paar of
+	-1, d: dealer upcard waarde (Ace = 11). Wordt één keer per tabelcel
+	uitgevoerd om de beslissingstabel te compileren.
+	"""
 	# Check pair rules first (simple)
-	if is_pair(player_hand):
-		r = parse_card(player_hand[0])
+	if pair >= 0:
+		r = RANK_SHORT[pair]
 		# always split Aces and 8s
-		if r in ("A", "Ace"):
-			return "split"
-		if r == "8":
-			return "split"
+		if r in ("A", "8"):
+			return SPLIT
 		# never split 5s or 10s
 		if r == "5":
 			# treat as hard 10
 			total = 10
 			usable = False
-		if r in ("10", "J", "Q", "K", "Jack", "Queen", "King"):
-			return "stand"
+		if r in ("10", "J", "Q", "K"):
+			return STAND
 		# split 2s/3s against dealer 2-7
 		if r in ("2", "3"):
-			if 2 <= d <= 7:
-				return "split"
-			else:
-				return "hit"
+			return SPLIT if 2 <= d <= 7 else HIT
 		# split 6s against dealer 2-6
 		if r == "6":
-			if 2 <= d <= 6:
-				return "split"
-			else:
-				return "hit"
+			return SPLIT if 2 <= d <= 6 else HIT
 		# split 7s against dealer 2-7
 		if r == "7":
-			if 2 <= d <= 7:
-				return "split"
-			else:
-				return "hit"
+			return SPLIT if 2 <= d <= 7 else HIT
 		# split 9s against dealer 2-6,8,9
 		if r == "9":
-			if (2 <= d <= 6) or d in (8, 9):
-				return "split"
-			else:
-				return "stand"
+			return SPLIT if (2 <= d <= 6) or d in (8, 9) else STAND
 
 	# Soft hands (usable ace)
 	if usable:
 		# common simplified soft rules
 		# soft totals: treat Ace as 11 where possible
 		if total >= 19:
-			return "stand"
+			return STAND
 		if total == 18:
 			if 2 <= d <= 6:
-				return "double"
+				return DOUBLE
 			if d in (7, 8):
-				return "stand"
-			return "hit"
-		if total <= 17:
-			if 4 <= d <= 6:
-				return "double"
-			return "hit"
+				return STAND
+			return HIT
+		if 4 <= d <= 6:
+			return DOUBLE
+		return HIT
 
 	# Hard hands
 	# Simplified hard strategy table
 	if total >= 17:
-		return "stand"
+		return STAND
 	if 13 <= total <= 16:
-		if 2 <= d <= 6:
-			return "stand"
-		else:
-			return "hit"
+		return STAND if 2 <= d <= 6 else HIT
 	if total == 12:
-		if 4 <= d <= 6:
-			return "stand"
+		return STAND if 4 <= d <= 6 else HIT
+	# 11 or less: double on 10/11 commonly; simplified: double on 11,10 vs dealer low
+	if total == 11:
+		return DOUBLE
+	if total == 10 and d <= 9:
+		return DOUBLE
+	if total == 9 and 3 <= d <= 6:
+		return DOUBLE
+	return HIT
+
+
+def compile_table(rule) -> bytes:
+	"""Compileer een regelfunctie `rule(total, usable, pair, d)` naar een tabel.
+
+	Resultaat: `NUM_STATES * UPCARD_COLUMNS` action codes, geïndexeerd met
+	`(state << 4) | upcard_rank_code`.
+	"""
+	table = bytearray(NUM_STATES * UPCARD_COLUMNS)
+	for col in range(UPCARD_COLUMNS):
+		if col < 13:
+			d = 11 if col == ACE else HARD_VALUES[col]
 		else:
-			return "hit"
-	if total <= 11:
-		# 11 or less: double on 10/11 commonly; simplified: double on 11,10 vs dealer low
-		if total == 11:
-			return "double"
-		if total == 10 and d <= 9:
-			return "double"
-		if total == 9 and 3 <= d <= 6:
-			return "double"
-		return "hit"
-# Gemaakt door Joshua Meuleman
+			d = 0
+		for total in range(HARD_STATES):
+			table[(hard_state(total) << 4) | col] = rule(total, False, -1, d)
+		for total in range(11, 22):
+			table[(soft_state(total) << 4) | col] = rule(total, True, -1, d)
+		for code in range(13):
+			if code == ACE:
+				total, usable = 12, True
+			else:
+				total, usable = 2 * HARD_VALUES[code], False
+			table[(pair_state(code) << 4) | col] = rule(total, usable, code, d)
+	return bytes(table)
+
+
+BASIC_TABLE = compile_table(_chart_action)
+
+
+def _rules_action(rules, total: int, usable: bool, pair: int, d: int) -> int:
+	"""`_chart_action` aangepast aan een `Rules` set.
+
+	- zonder splitsen worden paren als gewone totalen gespeeld;
+	- zonder double after split enkel 2s/3s tegen 4-7 en 6s tegen 3-6 splitsen;
+	- dealer hit soft 17: soft 19 tegen 6 verdubbelen;
+	- late surrender: hard 16 tegen 9-A en 15 tegen 10, bij H17 ook 15 en 17 tegen A.
+	"""
+	if pair >= 0 and rules.max_splits < 1:
+		pair = -1
+	action = _chart_action(total, usable, pair, d)
+	if action == SPLIT and not rules.double_after_split:
+		r = RANK_SHORT[pair]
+		if (r in ("2", "3") and d < 4) or (r == "6" and d < 3):
+			return HIT
+	if pair >= 0:
+		return action
+	h17 = not rules.stand_on_soft_17
+	if usable:
+		if h17 and total == 19 and d == 6:
+			return DOUBLE
+		return action
+	if rules.surrender:
+		if (total == 16 and d >= 9) or (total == 15 and d == 10):
+			return SURRENDER
+		if h17 and total in (15, 17) and d == 11:
+			return SURRENDER
+	return action
+
+
+def without_splits(table: bytes) -> bytes:
+	"""Kopie van `table` waarin SPLIT vervangen is door de actie voor het totaal van het paar."""
+	out = bytearray(table)
+	for code in range(13):
+		pair = pair_state(code) << 4
+		total = (soft_state(12) if code == ACE else hard_state(2 * HARD_VALUES[code])) << 4
+		for col in range(UPCARD_COLUMNS):
+			if out[pair | col] == SPLIT:
+				out[pair | col] = table[total | col]
+	return bytes(out)
+
+
+@lru_cache(maxsize=None)
+def without_surrender(table: bytes) -> bytes:
+	"""Kopie van `table` waarin SURRENDER vervangen is door de actie zonder surrender.
+
+	Dat is de actie van de chart (`_chart_action`) voor die cel; een paar
+	krijgt de actie van zijn totaal. Te spelen wanneer surrender niet mag,
+	bv. na een split of met meer dan twee kaarten: 17 tegen een Ace blijft
+	dan staan in plaats van te hitten.
+	"""
+	if SURRENDER not in table:
+		return table
+	plain = _PLAIN_TABLE
+	return bytes(plain[i] if a == SURRENDER else a for i, a in enumerate(table))
+
 
+@lru_cache(maxsize=None)
+def rules_table(rules=None) -> bytes:
+	"""Gecompileerde strategy table voor een `Rules` set (één keer per rule set).
+
+	Voor de standaardregels is dit `BASIC_TABLE`.
+	"""
+	rules = as_rules(rules)
+	table = compile_table(partial(_rules_action, rules))
+	return BASIC_TABLE if table == BASIC_TABLE else table
+
+
+# the chart without splits: the action without surrender for every cell
+_PLAIN_TABLE = without_splits(BASIC_TABLE)
+
+
+def choose_action_code(state: int, upcard: int, table: bytes = BASIC_TABLE) -> int:
+	"""Action code voor een hand state en upcard (rank code of kaartcode)."""
+	return table[(state << 4) | (upcard & 15)]
+
+
+def choose_action(player_hand: List[object], dealer_upcard: object, rules: Rules = None) -> str:
+	"""Kies een actie volgens een vereenvoudigde basic strategy.
+
+	player_hand: `Hand` of lijst van kaarten (dicts of strings)
+	dealer_upcard: kaart (dict of str)
+	rules: optioneel `Rules` (of dict met velden) voor de casino opties; de
+	tabel wordt per rule set één keer gecompileerd (`rules_table`)
+
+	Retourneert één van: 'hit', 'stand', 'double', 'split', 'surrender'
+	"""
+	table = BASIC_TABLE if rules is None else rules_table(as_rules(rules))
+	return ACTIONS[table[(hand_state(player_hand) << 4) | (rank_code(dealer_upcard) & 15)]]
+# Gemaakt door Joshua Meuleman
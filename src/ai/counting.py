@@ -2,42 +2,56 @@
 
 """Hi-Lo counting module.
 
-Counting class that maintains a running count and a record of seen cards.
+Counting class that maintains a running count and a fixed-size record of seen
+cards: how many of each of the 13 ranks were seen plus the total. Memory stays
+the same no matter how many cards are observed. An optional ring buffer keeps
+the last `history_size` ranks for debugging and the demos.
 Uses Hi-Lo system: 2-6 => +1, 7-9 => 0, 10-A => -1.
 """
-from typing import List, Dict, Any
+from collections import deque
+from typing import Any, List, Optional
 import json
 
-from ..hand import parse_card
+from ..hand import rank_code, parse_card, RANK_SHORT, HI_LO_TAGS
 
 
 class Counting:
-    def __init__(self):
+    def __init__(self, history_size: int = 0):
+        self.history_size = int(history_size)
         self.reset()
 
     def reset(self) -> None:
         self._running = 0
-        self.seen: List[Dict[str, Any]] = []
+        # seen cards per rank code (2..A) and in total
+        self.composition: List[int] = [0] * 13
+        self.cards_seen = 0
+        self.history: Optional[deque] = deque(maxlen=self.history_size) if self.history_size else None
 
     def _hi_lo_value(self, rank: str) -> int:
         # ranks provided as strings like '2','10','A','K','Queen'
-        if rank in ("2", "3", "4", "5", "6"):
-            return 1
-        if rank in ("7", "8", "9"):
-            return 0
-        # 10,J,Q,K,A -> -1
-        return -1
+        # 2-6 -> +1, 7-9 -> 0, 10,J,Q,K,A -> -1 (via the shared tag table)
+        code = rank_code(rank)
+        return HI_LO_TAGS[code] if code >= 0 else -1
 
     def update(self, card: Any) -> None:
         """Update running count with a card (dict or string supported)."""
-        rank = parse_card(card)
-        v = self._hi_lo_value(rank)
-        self._running += v
-        # store a compact record
-        if isinstance(card, dict):
-            self.seen.append({"rank": rank})
-        else:
-            self.seen.append({"rank": rank})
+        code = rank_code(card)
+        self.cards_seen += 1
+        if code < 0:
+            self._running -= 1
+            if self.history is not None:
+                self.history.append(parse_card(card))
+            return
+        self._running += HI_LO_TAGS[code]
+        self.composition[code] += 1
+        if self.history is not None:
+            self.history.append(RANK_SHORT[code])
+
+    def update_many(self, cards: Any) -> None:
+        """Update running count with a sequence of cards in one call."""
+        update = self.update
+        for card in cards:
+            update(card)
 
     def running_count(self) -> int:
         return self._running
@@ -52,7 +66,9 @@ class Counting:
         return self._running / remaining_decks_estimate
 
     def save(self, path: str) -> None:
-        data = {"running": self._running, "seen": self.seen}
+        data = {"running": self._running, "composition": self.composition, "cards_seen": self.cards_seen}
+        if self.history is not None:
+            data["history"] = list(self.history)
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f)
 
@@ -60,6 +76,22 @@ class Counting:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         self._running = int(data.get("running", 0))
-        self.seen = data.get("seen", [])
+        self.composition = [0] * 13
+        self.cards_seen = 0
+        self.history = deque(maxlen=self.history_size) if self.history_size else None
+        if "composition" in data:
+            self.composition = [int(n) for n in data["composition"]]
+            self.cards_seen = int(data.get("cards_seen", sum(self.composition)))
+            ranks = data.get("history", [])
+        else:
+            # older files store one {"rank": ...} record per seen card
+            ranks = [rec.get("rank") for rec in data.get("seen", [])]
+            for rank in ranks:
+                code = rank_code(rank)
+                if code >= 0:
+                    self.composition[code] += 1
+            self.cards_seen = len(ranks)
+        if self.history is not None:
+            self.history.extend(ranks)
 
     # Gemaakt door Joshua Meuleman
@@ -0,0 +1,167 @@
+# Gemaakt door Joshua Meuleman
+
+"""Exacte kansverdeling van de eindtotaal van de dealer.
+
+Voor een upcard, de resterende samenstelling van de shoe en de soft-17 regel
+berekent `dealer_probabilities` de kans op 17, 18, 19, 20, 21, bust en
+blackjack. De recursie over alle mogelijke kaartvolgordes wordt gememoized
+op (dealer state, samenstelling), zodat herhaalde vragen uit de cache komen.
+Een kaart waarop de dealer stopt of bust wordt meteen opgeteld, zonder eigen
+cache entry; enkel states waarin de dealer nog trekt staan in de cache.
+
+Samenstellingen zijn tuples van 10 aantallen per kaartwaarde:
+index 0 = Ace, 1..8 = 2..9, 9 = alle tienwaarden (10, J, Q, K).
+"""
+from functools import lru_cache
+from typing import Iterable, Sequence, Tuple
+
+from ..hand import rank_code, HARD_VALUES
+
+# Outcome indices in the returned tuples.
+OUTCOMES = ("17", "18", "19", "20", "21", "bust", "blackjack")
+BUST = 5
+BLACKJACK = 6
+TEN = 9
+
+
+def value_index(card) -> int:
+    """Samenstellingsindex van een kaart (Ace = 0, ..., tienwaarde = 9)."""
+    return HARD_VALUES[rank_code(card)] - 1
+
+
+def shoe_composition(num_decks: int) -> Tuple[int, ...]:
+    """Samenstelling van een volle shoe van `num_decks` decks."""
+    n = 4 * int(num_decks)
+    return (n,) * 9 + (4 * n,)
+
+
+def composition_from_ranks(counts: Sequence[int]) -> Tuple[int, ...]:
+    """Zet 13 aantallen per rank code (zoals `Counting.composition`) om."""
+    comp = [0] * 10
+    for code, n in enumerate(counts[:13]):
+        comp[HARD_VALUES[code] - 1] += n
+    return tuple(comp)
+
+
+def remove_cards(composition: Sequence[int], cards: Iterable) -> Tuple[int, ...]:
+    """Samenstelling zonder de gegeven kaarten."""
+    comp = list(composition)
+    for card in cards:
+        i = value_index(card)
+        if comp[i] <= 0:
+            raise ValueError(f"card {card!r} is not in the composition")
+        comp[i] -= 1
+    return tuple(comp)
+
+
+def _final_total(hard: int, soft: bool, hit_soft_17: bool) -> int:
+    """Eindtotaal (17..21, of 22 voor bust) als de dealer hier stopt, anders 0.
+
+    `total - 17` is dan de index in de verdeling van `_dealer_final`.
+    """
+    if hard > 21:
+        return 22
+    total = hard + 10 if soft and hard <= 11 else hard
+    if total >= 17 and not (hit_soft_17 and total == 17 and hard <= 7):
+        return total
+    return 0
+
+
+# `_final_total` per soft-17 regel, geïndexeerd op 2 * hard + soft
+_FINAL = {h17: tuple(_final_total(h, s, h17) for h in range(32) for s in (False, True))
+          for h17 in (False, True)}
+
+
+@lru_cache(maxsize=None)
+def _dealer_final(hard: int, soft: bool, comp: Tuple[int, ...], hit_soft_17: bool) -> Tuple[float, ...]:
+    """Verdeling over 17..21/bust vanaf een dealerhand met hard total `hard`.
+
+    `soft`: de hand bevat een Ace. Raakt de shoe leeg voor de dealer aan 17
+    zit, dan telt die hand mee als 17.
+    """
+    final_of = _FINAL[hit_soft_17]
+    final = final_of[2 * hard + soft]
+    if final:
+        out = [0.0] * 6
+        out[final - 17] = 1.0
+        return tuple(out)
+    n = sum(comp)
+    if n == 0:
+        return (1.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    acc = [0.0] * 6
+    lst = list(comp)
+    for i, c in enumerate(comp):
+        if not c:
+            continue
+        p = c / n
+        h = hard + i + 1
+        s = soft or i == 0
+        final = final_of[2 * h + s]
+        if final:
+            # the dealer stops (or busts) on this card: no cache entry needed
+            acc[final - 17] += p
+            continue
+        lst[i] = c - 1
+        s17, s18, s19, s20, s21, bust = _dealer_final(h, s, tuple(lst), hit_soft_17)
+        lst[i] = c
+        acc[0] += p * s17
+        acc[1] += p * s18
+        acc[2] += p * s19
+        acc[3] += p * s20
+        acc[4] += p * s21
+        acc[5] += p * bust
+    return tuple(acc)
+
+
+@lru_cache(maxsize=None)
+def _dealer_from_upcard(up: int, comp: Tuple[int, ...], hit_soft_17: bool, peek: bool) -> Tuple[float, ...]:
+    n = sum(comp)
+    acc = [0.0] * 7
+    excluded = 0.0
+    lst = list(comp)
+    for i, c in enumerate(comp):
+        if not c:
+            continue
+        p = c / n
+        if (up == 0 and i == TEN) or (up == TEN and i == 0):
+            if peek:
+                excluded += p
+            else:
+                acc[BLACKJACK] += p
+            continue
+        lst[i] = c - 1
+        sub = _dealer_final(up + i + 2, up == 0 or i == 0, tuple(lst), hit_soft_17)
+        lst[i] = c
+        for k in range(6):
+            acc[k] += p * sub[k]
+    if excluded:
+        scale = 1.0 / (1.0 - excluded)
+        acc = [v * scale for v in acc]
+    return tuple(acc)
+
+
+def dealer_probabilities(upcard, composition: Sequence[int], stand_on_soft_17: bool = True,
+                         peek: bool = True) -> Tuple[float, ...]:
+    """Kansen (17, 18, 19, 20, 21, bust, blackjack) voor de dealer.
+
+    upcard: kaart (dict, rank string of kaartcode).
+    composition: resterende shoe zonder de upcard (10 waarden, zie module).
+    stand_on_soft_17: zoals `Dealer.stand_on_soft_17`.
+    peek: conditioneer op 'dealer heeft geen blackjack' (de dealer kijkt bij
+        een Ace of tienwaarde); de blackjack-kans is dan 0. Zonder peek
+        krijgt blackjack een eigen kans.
+    """
+    return _dealer_from_upcard(value_index(upcard), tuple(composition), not stand_on_soft_17, peek)
+
+
+def cache_size() -> int:
+    """Aantal gememoizede dealer states."""
+    return _dealer_final.cache_info().currsize + _dealer_from_upcard.cache_info().currsize
+
+
+def clear_cache() -> None:
+    """Leeg de memoization-caches (bv. tussen lange runs)."""
+    _dealer_final.cache_clear()
+    _dealer_from_upcard.cache_clear()
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,208 @@
+# Gemaakt door Joshua Meuleman
+"""True-count deviaties op basic strategy (Hi-Lo indices).
+
+Een deviatietabel is een dict `{(state << 4) | upcard_code: (index, above, below)}`
+met dezelfde sleutels als de cellen van `basic_strategy.BASIC_TABLE`:
+bij een true count >= `index` speelt de NPC `above`, anders `below` (action
+codes). `NPC.choose_action` doet dus één lookup en één vergelijking.
+
+Ingebouwd: de Illustrious 18 (zonder insurance, die de engine niet kent) en
+de Fab 4 surrenders, als indices voor S17. De surrenders staan in een eigen
+tabel (`SURRENDER_DEVIATIONS`): 15 tegen 10 staat in beide, en de NPC kijkt de
+surrender-cel enkel eerst na wanneer de regels surrender toelaten. Eigen tabellen kunnen offline
+berekend worden met `generate_deviations`: voor elke kandidaat-hand en elke
+true count wordt de beste actie bepaald met de EV analyzer (`src.ai.ev`) op
+een samenstelling met die count. Dat loopt parallel over alle cores en het
+resultaat wordt per ruleset als JSON gecached.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from ..hand import rank_code
+from .basic_strategy import (
+    ACTIONS, HIT, STAND, DOUBLE, SPLIT, SURRENDER, PAIR_BASE, hand_state,
+)
+from .dealer_probs import shoe_composition, remove_cards
+from .ev import action_evs
+from .strategy_loader import default_cache_dir
+
+# Rank codes of the ten-valued ranks (10, J, Q, K).
+_TEN_CODES = (8, 9, 10, 11)
+_CACHE_VERSION = 1
+
+# (player cards, upcard, index, action at or above the index, action below)
+ILLUSTRIOUS_18 = (
+    (("10", "6"), "10", 0, STAND, HIT),
+    (("10", "5"), "10", 4, STAND, HIT),
+    (("10", "10"), "5", 5, SPLIT, STAND),
+    (("10", "10"), "6", 4, SPLIT, STAND),
+    (("6", "4"), "10", 4, DOUBLE, HIT),
+    (("5", "5"), "10", 4, DOUBLE, HIT),
+    (("10", "2"), "3", 2, STAND, HIT),
+    (("10", "2"), "2", 3, STAND, HIT),
+    (("6", "5"), "A", 1, DOUBLE, HIT),
+    (("5", "4"), "2", 1, DOUBLE, HIT),
+    (("6", "4"), "A", 4, DOUBLE, HIT),
+    (("5", "5"), "A", 4, DOUBLE, HIT),
+    (("5", "4"), "7", 3, DOUBLE, HIT),
+    (("10", "6"), "9", 5, STAND, HIT),
+    (("10", "3"), "2", -1, STAND, HIT),
+    (("10", "2"), "4", 0, STAND, HIT),
+    (("10", "2"), "5", -2, STAND, HIT),
+    (("10", "2"), "6", -1, STAND, HIT),
+    (("10", "3"), "3", -2, STAND, HIT),
+)
+
+FAB_4 = (
+    (("10", "4"), "10", 3, SURRENDER, HIT),
+    (("10", "5"), "10", 0, SURRENDER, HIT),
+    (("10", "5"), "9", 2, SURRENDER, HIT),
+    (("10", "5"), "A", 1, SURRENDER, HIT),
+)
+
+
+def _keys(cards: Sequence, upcard) -> Tuple[int, ...]:
+    """Tabelsleutels voor een hand en upcard; tienwaarden worden uitgebreid."""
+    state = hand_state(list(cards))
+    states = (state,)
+    if state - PAIR_BASE in _TEN_CODES:
+        states = tuple(PAIR_BASE + c for c in _TEN_CODES)
+    up = rank_code(upcard)
+    ups = _TEN_CODES if up in _TEN_CODES else (up,)
+    return tuple((s << 4) | u for s in states for u in ups)
+
+
+def build_table(entries: Iterable[Tuple]) -> Dict[int, Tuple[float, int, int]]:
+    """Zet (cards, upcard, index, above, below) regels om naar een tabel.
+
+    Acties mogen codes of strings ('stand', ...) zijn; latere regels voor
+    dezelfde cel overschrijven eerdere.
+    """
+    table: Dict[int, Tuple[float, int, int]] = {}
+    for cards, upcard, index, above, below in entries:
+        cell = (float(index), _action_code(above), _action_code(below))
+        for key in _keys(cards, upcard):
+            table[key] = cell
+    return table
+
+
+def _action_code(action) -> int:
+    if isinstance(action, str):
+        return ACTIONS.index(action.lower())
+    if not 0 <= action < len(ACTIONS):
+        raise ValueError(f"unknown action code {action!r}")
+    return int(action)
+
+
+def normalize_table(table: Dict) -> Dict[int, Tuple[float, int, int]]:
+    """Controleer een eigen tabel en zet acties om naar codes."""
+    return {int(key): (float(index), _action_code(above), _action_code(below))
+            for key, (index, above, below) in table.items()}
+
+
+DEFAULT_DEVIATIONS = build_table(ILLUSTRIOUS_18)
+SURRENDER_DEVIATIONS = build_table(FAB_4)
+
+
+def count_composition(true_count: float, decks_remaining: int) -> Tuple[int, ...]:
+    """Samenstelling van `decks_remaining` decks met ongeveer die Hi-Lo true count.
+
+    Een positieve count haalt lage kaarten (2..6) weg, een negatieve count
+    tienwaarden en azen (in verhouding 4:1).
+    """
+    comp = list(shoe_composition(decks_remaining))
+    running = round(true_count * decks_remaining)
+    order = (1, 2, 3, 4, 5) if running > 0 else (9, 9, 9, 9, 0)
+    for k in range(abs(running)):
+        comp[order[k % 5]] -= 1
+    if min(comp) < 0:
+        raise ValueError(f"true count {true_count} is out of range for {decks_remaining} decks")
+    return tuple(comp)
+
+
+def _best_by_count(task) -> Tuple[int, ...]:
+    """Worker: beste action code per true count voor één kandidaat."""
+    cards, upcard, counts, decks_remaining, rules = task
+    best = []
+    for tc in counts:
+        comp = remove_cards(count_composition(tc, decks_remaining), list(cards) + [upcard])
+        evs = action_evs(list(cards), upcard, comp, **rules)
+        best.append(ACTIONS.index(max(evs, key=evs.get)))
+    return tuple(best)
+
+
+def _threshold(counts: Sequence[float], best: Sequence[int]) -> Optional[Tuple[float, int, int]]:
+    """(index, above, below) als de beste actie op één punt omslaat, anders None."""
+    below, above = best[0], best[-1]
+    if below == above:
+        return None
+    i = len(best) - 1
+    while i > 0 and best[i - 1] == above:
+        i -= 1
+    return (float(counts[i]), above, below)
+
+
+def generate_deviations(candidates: Iterable[Tuple[Sequence, object]],
+                        rules: Optional[dict] = None,
+                        counts: Sequence[float] = tuple(range(-6, 11)),
+                        decks_remaining: int = 2,
+                        workers: Optional[int] = None,
+                        cache_dir: Optional[str] = None) -> Dict[int, Tuple[float, int, int]]:
+    """Bereken een deviatietabel met de EV analyzer.
+
+    candidates: (player cards, upcard) paren, bv. [(("10", "6"), "10")]
+    rules: keyword-argumenten voor `ev.action_evs` (de ruleset)
+    counts: oplopende true counts die geëvalueerd worden
+    workers: aantal processen (None = alle cores, 1 = in dit proces)
+
+    Het resultaat wordt in `cache_dir` (standaard `default_cache_dir()`)
+    bewaard onder de SHA-256 van ruleset en parameters; `cache_dir=""`
+    schakelt de cache uit.
+    """
+    candidates = [(tuple(str(c) for c in cards), str(up)) for cards, up in candidates]
+    rules = dict(rules or {})
+    counts = [float(tc) for tc in counts]
+    spec = json.dumps({"version": _CACHE_VERSION, "rules": rules, "counts": counts,
+                       "decks_remaining": decks_remaining, "candidates": candidates},
+                      sort_keys=True)
+    digest = hashlib.sha256(spec.encode("utf-8")).hexdigest()
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    cache_path = os.path.join(cache_dir, digest + ".dev.json") if cache_dir else None
+    if cache_path and os.path.isfile(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return normalize_table({int(k): v for k, v in json.load(f)["table"].items()})
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    tasks = [(cards, up, counts, decks_remaining, rules) for cards, up in candidates]
+    if workers == 1:
+        results = list(map(_best_by_count, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_best_by_count, tasks))
+
+    table: Dict[int, Tuple[float, int, int]] = {}
+    for (cards, up), best in zip(candidates, results):
+        cell = _threshold(counts, best)
+        if cell is not None:
+            for key in _keys(cards, up):
+                table[key] = cell
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"spec": json.loads(spec), "table": table}, f)
+            os.replace(tmp, cache_path)
+        except OSError:
+            # a read-only cache should not stop the generation
+            pass
+    return table
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,193 @@
+# Gemaakt door Joshua Meuleman
+
+"""Composition-dependent EV analyzer (combinatorial analysis).
+
+Voor de kaarten van de speler, de dealer upcard en de exacte resterende
+samenstelling van de shoe berekent `action_evs` de verwachte winst (in
+inzet-eenheden) van stand, hit, double en split. Alle kaartvolgordes worden
+recursief opgesomd; elke deelberekening wordt gememoized op (hand state,
+samenstelling), en de dealerkansen komen uit `dealer_probs`. Elke beslissing
+heeft een andere samenstelling, dus de caches worden geleegd zodra ze bij een
+nieuwe oproep meer dan `CACHE_LIMIT` dealer states bevatten.
+
+Samenstellingen zijn tuples van 10 aantallen per kaartwaarde zoals in
+`src.ai.dealer_probs` (Ace, 2..9, tienwaarden) en bevatten enkel de kaarten
+die nog kunnen komen: zonder de kaarten van de speler en de upcard.
+
+Benaderingen (de gebruikelijke voor een CA):
+- Na een split wordt elke hand apart berekend op dezelfde samenstelling;
+  kaarten die de andere hand trekt worden niet afgetrokken.
+- Met peek wordt enkel de dealerverdeling op 'geen blackjack' geconditioneerd,
+  niet de kaarten die de speler trekt.
+"""
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+from ..hand import value, is_pair
+from . import dealer_probs
+from .dealer_probs import dealer_probabilities, value_index, BUST, BLACKJACK
+
+_DEALER_TOTALS = (17, 18, 19, 20, 21)
+
+# dealer states kept between two `action_evs` calls; a six-deck decision needs
+# well under this, states of earlier decisions (other compositions) rarely hit
+CACHE_LIMIT = 100_000
+
+
+@lru_cache(maxsize=None)
+def _stand_ev(total: int, comp: Tuple[int, ...], up: str, h17: bool, peek: bool) -> float:
+    if total > 21:
+        return -1.0
+    dist = dealer_probabilities(up, comp, not h17, peek)
+    ev = dist[BUST] - dist[BLACKJACK]
+    for k, p in zip(_DEALER_TOTALS, dist):
+        if total > k:
+            ev += p
+        elif total < k:
+            ev -= p
+    return ev
+
+
+def _total(hard: int, soft: bool) -> int:
+    return hard + 10 if soft and hard <= 11 else hard
+
+
+@lru_cache(maxsize=None)
+def _hit_ev(hard: int, soft: bool, comp: Tuple[int, ...], up: str, h17: bool, peek: bool) -> float:
+    """EV van één kaart nemen en daarna optimaal hit/stand spelen."""
+    n = sum(comp)
+    ev = 0.0
+    lst = list(comp)
+    for i, c in enumerate(comp):
+        if not c:
+            continue
+        h = hard + i + 1
+        if h > 21:
+            # a bust needs no cache entry
+            ev -= c / n
+            continue
+        lst[i] = c - 1
+        ev += c / n * _best_ev(h, soft or i == 0, tuple(lst), up, h17, peek)
+        lst[i] = c
+    return ev
+
+
+@lru_cache(maxsize=None)
+def _best_ev(hard: int, soft: bool, comp: Tuple[int, ...], up: str, h17: bool, peek: bool) -> float:
+    """EV van de beste keuze tussen hit en stand (geen double meer)."""
+    if hard > 21:
+        return -1.0
+    stand = _stand_ev(_total(hard, soft), comp, up, h17, peek)
+    if hard >= 21 or sum(comp) == 0:
+        return stand
+    return max(stand, _hit_ev(hard, soft, comp, up, h17, peek))
+
+
+@lru_cache(maxsize=None)
+def _double_ev(hard: int, soft: bool, comp: Tuple[int, ...], up: str, h17: bool, peek: bool) -> float:
+    """EV van verdubbelen: precies één kaart, dubbele inzet."""
+    n = sum(comp)
+    ev = 0.0
+    lst = list(comp)
+    for i, c in enumerate(comp):
+        if not c:
+            continue
+        lst[i] = c - 1
+        h = hard + i + 1
+        ev += c / n * (-1.0 if h > 21 else _stand_ev(_total(h, soft or i == 0), tuple(lst), up, h17, peek))
+        lst[i] = c
+    return 2.0 * ev
+
+
+@lru_cache(maxsize=None)
+def _split_hand_ev(v: int, comp: Tuple[int, ...], up: str, h17: bool, peek: bool,
+                   splits_left: int, das: bool, hit_split_aces: bool) -> float:
+    """EV van één hand die met een gesplitste kaart (waarde-index v) begint."""
+    n = sum(comp)
+    ev = 0.0
+    lst = list(comp)
+    for i, c in enumerate(comp):
+        if not c:
+            continue
+        lst[i] = c - 1
+        sub = tuple(lst)
+        hard = v + i + 2
+        soft = v == 0 or i == 0
+        if v == 0 and not hit_split_aces:
+            # split aces get one card each
+            best = _stand_ev(_total(hard, soft), sub, up, h17, peek)
+        else:
+            best = _best_ev(hard, soft, sub, up, h17, peek)
+            if das:
+                best = max(best, _double_ev(hard, soft, sub, up, h17, peek))
+        if i == v and splits_left > 0 and (v != 0 or hit_split_aces):
+            best = max(best, 2.0 * _split_hand_ev(v, sub, up, h17, peek, splits_left - 1, das, hit_split_aces))
+        ev += c / n * best
+        lst[i] = c
+    return ev
+
+
+def action_evs(player_cards: Sequence, upcard, composition: Sequence[int],
+               stand_on_soft_17: bool = True, peek: bool = True, blackjack_payout: float = 1.5,
+               max_splits: int = 1, double_after_split: bool = True,
+               hit_split_aces: bool = False, surrender: bool = False,
+               hands: int = 1) -> Dict[str, float]:
+    """EV per legale actie voor de hand van de speler.
+
+    player_cards: kaarten van de speler (dicts, rank strings of kaartcodes)
+    upcard: dealer upcard
+    composition: resterende shoe zonder spelerkaarten en upcard
+    max_splits: hoeveel keer er gesplitst mag worden (1 = geen resplit)
+    surrender: late surrender toegelaten (EV -0.5; zonder peek verliest een
+        surrender tegen een dealer blackjack toch de volle inzet)
+    hands: aantal handen van de speler in deze ronde (1 = niet gesplitst)
+
+    Retourneert {'stand', 'hit'} en, voor twee kaarten, 'double', bij een
+    paar 'split' en eventueel 'surrender'. Een blackjack geeft enkel 'stand'.
+    Na een split (hands > 1) volgen de regels van `Game`: double alleen met
+    double_after_split, split zolang hands <= max_splits, geen surrender en
+    21 met twee kaarten is geen blackjack.
+    """
+    if dealer_probs.cache_size() > CACHE_LIMIT:
+        clear_cache()
+    comp = tuple(composition)
+    up = "A" if value_index(upcard) == 0 else str(value_index(upcard) + 1)
+    h17 = not stand_on_soft_17
+    total, soft = value(player_cards)
+    hard = total - 10 if soft else total
+
+    split = hands > 1
+    if len(player_cards) == 2 and total == 21 and not split:
+        dist = dealer_probabilities(up, comp, stand_on_soft_17, peek)
+        return {"stand": blackjack_payout * (1.0 - dist[BLACKJACK])}
+
+    evs = {"stand": _stand_ev(total, comp, up, h17, peek)}
+    if total < 21:
+        evs["hit"] = _hit_ev(hard, soft, comp, up, h17, peek)
+    if len(player_cards) == 2:
+        if double_after_split or not split:
+            evs["double"] = _double_ev(hard, soft, comp, up, h17, peek)
+        if hands <= max_splits and is_pair(player_cards):
+            v = value_index(player_cards[0])
+            evs["split"] = 2.0 * _split_hand_ev(v, comp, up, h17, peek, max_splits - hands,
+                                                double_after_split, hit_split_aces)
+        if surrender and not split:
+            # with peek the blackjack chance is 0: the dealer already checked
+            dist = dealer_probabilities(up, comp, stand_on_soft_17, peek)
+            evs["surrender"] = -0.5 - 0.5 * dist[BLACKJACK]
+    return evs
+
+
+def best_action(player_cards: Sequence, upcard, composition: Sequence[int], **rules) -> str:
+    """De actie met de hoogste EV volgens `action_evs`."""
+    evs = action_evs(player_cards, upcard, composition, **rules)
+    return max(evs, key=evs.get)
+
+
+def clear_cache() -> None:
+    """Leeg de memoization-caches, ook die van `dealer_probs`."""
+    for fn in (_stand_ev, _hit_ev, _best_ev, _double_ev, _split_hand_ev):
+        fn.cache_clear()
+    dealer_probs.clear_cache()
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,98 @@
+# Gemaakt door Joshua Meuleman
+
+"""Multi-system card counting.
+
+`MultiCounting` houdt meerdere telsystemen tegelijk bij. De tags staan in
+een matrix (rank x systeem), zodat één kaart één vectoroptelling is en een
+batch kaarten één matrix-vector product. Zo kunnen systemen vergeleken
+worden op exact dezelfde gedeelde kaarten, in één simulatie.
+
+Gebruik als draw observer:
+    counter = MultiCounting(["hi_lo", "omega_ii", "zen"])
+    game.register_shoe_observer(counter.start_shoe)
+    game.register_batch_observer(counter.update_many)
+"""
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from ..hand import rank_code, HI_LO_TAGS
+
+# Tags per rank code: 2, 3, 4, 5, 6, 7, 8, 9, 10, J, Q, K, A
+SYSTEMS: Dict[str, Sequence[float]] = {
+    "hi_lo": HI_LO_TAGS,
+    "omega_ii": (1, 1, 2, 2, 2, 1, 0, -1, -2, -2, -2, -2, 0),
+    "ko": (1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1, -1),
+    "zen": (1, 1, 2, 2, 2, 1, 0, 0, -2, -2, -2, -2, -1),
+    "wong_halves": (0.5, 1, 1, 1.5, 1, 0.5, 0, -0.5, -1, -1, -1, -1, -1),
+}
+
+# Unbalanced systems start at an initial running count per number of decks.
+INITIAL_RUNNING = {
+    "ko": lambda num_decks: 4 - 4 * num_decks,
+}
+
+
+class MultiCounting:
+    """Running en true counts voor meerdere telsystemen tegelijk.
+
+    systems: namen uit `SYSTEMS` of een dict {naam: 13 tags}; standaard alle.
+    """
+
+    def __init__(self, systems: Optional[Union[Iterable[str], Dict[str, Sequence[float]]]] = None,
+                 num_decks: int = 1):
+        if systems is None:
+            systems = SYSTEMS
+        if isinstance(systems, dict):
+            table = dict(systems)
+        else:
+            table = {name: SYSTEMS[name] for name in systems}
+        for name, tags in table.items():
+            if len(tags) != 13:
+                raise ValueError(f"system {name!r} needs 13 tags (2..Ace), got {len(tags)}")
+        self.names = tuple(table)
+        # rows: rank codes 0..12 plus padding so `code & 15` (incl. unknown = 15) is valid
+        self.tags = np.zeros((16, len(self.names)), dtype=np.float64)
+        for j, name in enumerate(self.names):
+            self.tags[:13, j] = table[name]
+        self.start_shoe(num_decks)
+
+    def start_shoe(self, num_decks: int) -> None:
+        """Reset alle tellingen voor een nieuwe shoe van `num_decks` decks."""
+        self.num_decks = int(num_decks)
+        self.cards_seen = 0
+        self._initial = np.array(
+            [INITIAL_RUNNING[n](self.num_decks) if n in INITIAL_RUNNING else 0 for n in self.names],
+            dtype=np.float64)
+        self.running = self._initial.copy()
+
+    def update(self, card: Any) -> None:
+        """Tel één kaart (dict, rank string of kaartcode)."""
+        np.add(self.running, self.tags[rank_code(card) & 15], out=self.running)
+        self.cards_seen += 1
+
+    def update_many(self, cards: Any) -> None:
+        """Tel een reeks kaarten met één matrix-vector product."""
+        codes = np.fromiter((rank_code(c) & 15 for c in cards), dtype=np.intp)
+        if codes.size:
+            self.running += np.bincount(codes, minlength=16) @ self.tags
+            self.cards_seen += int(codes.size)
+
+    def remaining_decks(self) -> float:
+        """Schatting van de resterende decks (minimaal 0.1)."""
+        return max(0.1, (self.num_decks * 52 - self.cards_seen) / 52.0)
+
+    def running_counts(self) -> Dict[str, float]:
+        return dict(zip(self.names, self.running.tolist()))
+
+    def true_counts(self, remaining_decks: Optional[float] = None) -> Dict[str, float]:
+        """True count per systeem: running count / resterende decks.
+
+        Voor ongebalanceerde systemen (KO) is de running count de eigenlijke
+        indicator; hun true count wordt enkel ter vergelijking gegeven.
+        """
+        if remaining_decks is None:
+            remaining_decks = self.remaining_decks()
+        return dict(zip(self.names, (self.running / remaining_decks).tolist()))
+
+# Gemaakt door Joshua Meuleman
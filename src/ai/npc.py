@@ -10,8 +10,12 @@ Belangrijk: dit is volledig algorithmisch — er is géén machine learning.
 from typing import Any, Optional
 
 from .counting import Counting
-from .basic_strategy import choose_action
-from ..hand import Hand
+from .basic_strategy import ACTIONS, BASIC_TABLE, choose_action_code, hand_state, rules_table
+from .dealer_probs import composition_from_ranks, shoe_composition
+from .deviations import normalize_table
+from . import ev
+from ..hand import rank_code
+from ..rules import Rules
 
 
 class NPC:
@@ -20,25 +24,59 @@ class NPC:
     Usage:
     - call `start_shoe(num_decks)` when a new shoe begins
     - call `observe_card(card)` for every card that becomes visible
+      (or `observe_cards(cards)` for a batch, e.g. as a deck batch observer)
     - call `recommended_bet()` or `running_count()/true_count()` to inspect
     - call `choose_action(player_hand, dealer_upcard)` for an action
+
+    With `composition_play=True` the NPC plays the action with the highest EV
+    for the exact remaining shoe (see `src.ai.ev`) once `start_shoe` was
+    called; `ev_rules` are passed on to `ev.action_evs`. Its caches stay
+    bounded (`ev.CACHE_LIMIT`), but a cold six-deck decision still enumerates
+    tens of thousands of dealer states.
+    With `rules` (`src.rules.Rules`) the default strategy table and EV rules
+    follow that rule set.
     """
 
-    def __init__(self, bet_unit: int = 1, deviations: Optional[dict] = None):
-        self.counting = Counting()
+    def __init__(self, bet_unit: int = 1, deviations: Optional[dict] = None,
+                 strategy: Optional[bytes] = None, history_size: int = 0,
+                 composition_play: bool = False, ev_rules: Optional[dict] = None,
+                 rules: Optional[Rules] = None, surrender_deviations: Optional[dict] = None):
+        # history_size > 0 keeps the last N seen ranks in `counting.history`
+        self.counting = Counting(history_size)
         self.bet_unit = int(bet_unit)
-        self.deviations = deviations or {}
+        # true-count deviations, see src.ai.deviations (e.g. DEFAULT_DEVIATIONS)
+        self.deviations = normalize_table(deviations) if deviations else {}
+        # compiled strategy table (see src.ai.strategy_loader); default: basic strategy
+        self.strategy = strategy or (rules_table(rules) if rules is not None else BASIC_TABLE)
         self.original_deck_cards: Optional[int] = None
+        self.composition_play = composition_play
+        # the engine deals without a hole-card peek
+        if ev_rules is None:
+            ev_rules = rules.ev_rules() if rules is not None else {"peek": False}
+        self.ev_rules = dict(ev_rules)
+        # surrender indices (e.g. SURRENDER_DEVIATIONS), only used when the
+        # rules allow surrender; below its index a cell falls through
+        self.surrender_deviations = (normalize_table(surrender_deviations)
+                                     if surrender_deviations and self.ev_rules.get("surrender") else {})
+        self._full_shoe = None
 
     def start_shoe(self, num_decks: int) -> None:
         """Initialize shoe size (number of decks) and reset memory."""
         self.original_deck_cards = int(num_decks) * 52
+        self._full_shoe = shoe_composition(num_decks)
         self.counting.reset()
+        if self.composition_play:
+            # EV caches of the previous shoe will not be hit again
+            ev.clear_cache()
 
     def observe_card(self, card: Any) -> None:
         """Record a seen card into internal counting memory."""
         self.counting.update(card)
 
+    def observe_cards(self, cards: Any) -> None:
+        """Record a batch of seen cards in one call."""
+        self.counting.update_many(cards)
+
     def remaining_decks_estimate(self) -> float:
         """Estimate remaining decks from original shoe size and seen cards.
 
@@ -46,10 +84,24 @@ class NPC:
         """
         if not self.original_deck_cards:
             return 1.0
-        seen = len(self.counting.seen)
+        seen = self.counting.cards_seen
         remaining_cards = max(0, self.original_deck_cards - seen)
         return max(0.1, remaining_cards / 52.0)
 
+    def remaining_composition(self) -> Optional[tuple]:
+        """Unseen cards per value (Ace, 2..9, ten) or None when unknown.
+
+        None when `start_shoe` was not called or more cards were seen than
+        the shoe holds (e.g. a reshuffle the NPC was not told about).
+        """
+        if self._full_shoe is None:
+            return None
+        seen = composition_from_ranks(self.counting.composition)
+        comp = tuple(n - s for n, s in zip(self._full_shoe, seen))
+        if min(comp) < 0:
+            return None
+        return comp
+
     def running_count(self) -> int:
         return self.counting.running_count()
 
@@ -70,13 +122,36 @@ class NPC:
             return self.bet_unit * 2
         return self.bet_unit * 4
 
-    def choose_action(self, player_hand: Any, dealer_upcard: Any) -> str:
-        """Return basic strategy action. `true_count` available for deviations later."""
+    def choose_action(self, player_hand: Any, dealer_upcard: Any, hands: int = 1) -> str:
+        """Return basic strategy action, or the best EV action in composition play.
+
+        `hands` is the number of hands the player holds after splitting; in
+        composition play it keeps split, double and surrender to the actions
+        the rules allow for a split hand.
+
+        A deviation for the (hand state, upcard) cell overrides the chart:
+        its `above` action when `true_count()` reaches the index, else `below`.
+        A surrender deviation comes first, but only at or above its index.
+
+        The player's cards and the upcard must already have been observed.
+        """
+        if self.composition_play:
+            comp = self.remaining_composition()
+            if comp is not None:
+                cards = getattr(player_hand, "cards", player_hand)
+                return ev.best_action(cards, dealer_upcard, comp, hands=hands, **self.ev_rules)
         # Accept either a `Hand` instance or a raw list of card objects
-        if isinstance(player_hand, Hand):
-            cards = player_hand.cards
-        else:
-            cards = player_hand
-        return choose_action(cards, dealer_upcard)
+        state = hand_state(player_hand)
+        upcard = rank_code(dealer_upcard)
+        key = (state << 4) | (upcard & 15)
+        if self.surrender_deviations:
+            dev = self.surrender_deviations.get(key)
+            if dev is not None and self.true_count() >= dev[0]:
+                return ACTIONS[dev[1]]
+        if self.deviations:
+            dev = self.deviations.get(key)
+            if dev is not None:
+                return ACTIONS[dev[1] if self.true_count() >= dev[0] else dev[2]]
+        return ACTIONS[choose_action_code(state, upcard, self.strategy)]
 
 # Gemaakt door Joshua Meuleman
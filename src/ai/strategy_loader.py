@@ -0,0 +1,192 @@
+# Gemaakt door Joshua Meuleman
+"""Strategy CSV loader: leest hard/soft/pair charts en compileert ze naar een tabel.
+
+Formaat (zoals `tests/BasicStrategy.csv` en `tests/StrategyImporter.py`):
+puntkomma-gescheiden, eerste rij `Player;Two;Three;...;Ace`, daarna één rij
+per hand. Rijlabels: `21`..`5` (hard), `A10`..`A2` (soft), `AA`, `1010`..`22`
+(pairs). Acties: H (hit), S (stand), D (double), P (split), Sr (surrender).
+
+Zonder herkenbare labels wordt de volgorde van StrategyImporter gebruikt:
+hard 21..5, soft 21..13, de AA-rij (die StrategyImporter als soft 12 opslaat)
+en pairs 20..4.
+
+Het resultaat is een tabel met dezelfde vorm als `basic_strategy.BASIC_TABLE`
+en dus bruikbaar met `choose_action_code`, `NPC(strategy=...)` en
+`BaselinePlayer(strategy=...)`. Gecompileerde tabellen worden op schijf
+gecached onder de SHA-256 van het CSV-bestand en de compilerversie.
+"""
+import csv
+import hashlib
+import os
+from typing import Dict, List, Optional, Tuple
+
+from ..hand import rank_code, ACE
+from .basic_strategy import (
+    ACTIONS, HIT, STAND, DOUBLE, SPLIT, SURRENDER,
+    HARD_STATES, SOFT_BASE, PAIR_BASE, NUM_STATES, UPCARD_COLUMNS,
+    hard_state, soft_state, pair_state,
+)
+
+ACTION_CODES = {"H": HIT, "S": STAND, "D": DOUBLE, "P": SPLIT, "SR": SURRENDER}
+
+HARD_ROWS = range(5, 22)
+SOFT_ROWS = range(13, 22)
+
+_CACHE_MAGIC = b"BJST1"
+# bump when compile_chart changes its output for the same CSV
+_COMPILER_VERSION = 1
+# hashed into the cache key: a new compiler or table layout never reads an old table
+_CACHE_SALT = (f"compiler={_COMPILER_VERSION};states={HARD_STATES},{SOFT_BASE},{PAIR_BASE},"
+               f"{NUM_STATES},{UPCARD_COLUMNS};actions={','.join(ACTIONS)}\n").encode("ascii")
+_TABLE_SIZE = NUM_STATES * UPCARD_COLUMNS
+_loaded: Dict[str, bytes] = {}
+
+
+def default_cache_dir() -> str:
+    """Cachemap voor gecompileerde strategieën (`BLACKJACK_CACHE_DIR` of ~/.cache)."""
+    return os.environ.get("BLACKJACK_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "blackjack_ai")
+
+
+def _parse_label(label: str) -> Optional[Tuple[str, int]]:
+    """Rijlabel -> ('hard', total), ('soft', total) of ('pair', rank code)."""
+    label = label.strip().upper()
+    if label == "AA":
+        return ("pair", ACE)
+    if label.startswith("A") and label[1:].isdigit():
+        return ("soft", 11 + int(label[1:]))
+    if not label.isdigit():
+        return None
+    half = len(label) // 2
+    if len(label) % 2 == 0 and label[:half] == label[half:] and 2 <= int(label[:half]) <= 10:
+        return ("pair", rank_code(label[:half]))
+    return ("hard", int(label))
+
+
+def _positional_labels() -> List[Tuple[str, int]]:
+    """Rijvolgorde die StrategyImporter verwacht."""
+    labels = [("hard", t) for t in range(21, 4, -1)]
+    labels += [("soft", t) for t in range(21, 12, -1)]
+    # StrategyImporter stores the AA row as soft 12
+    labels.append(("pair", ACE))
+    labels += [("pair", rank_code(str(v))) for v in range(10, 1, -1)]
+    return labels
+
+
+def read_strategy_csv(path: str) -> Dict[Tuple[str, int], List[int]]:
+    """Lees en valideer een strategy CSV.
+
+    Retourneert {(kind, key): [action code per upcard rank code 0..12]}.
+    Gooit ValueError bij een ontbrekende kolom/rij of een onbekende actie.
+    """
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        rows = [r for r in csv.reader(f, delimiter=";") if any(c.strip() for c in r)]
+    if not rows:
+        raise ValueError(f"{path}: empty strategy file")
+
+    header = rows[0]
+    columns = [rank_code(name.strip()) for name in header[1:]]
+    missing = set(range(13)) - set(columns)
+    if missing:
+        raise ValueError(f"{path}: header must name every dealer upcard 2..Ace (got {header!r})")
+
+    body = rows[1:]
+    labels = [_parse_label(r[0]) for r in body]
+    if any(lbl is None for lbl in labels):
+        labels = _positional_labels()
+        if len(body) != len(labels):
+            raise ValueError(f"{path}: expected {len(labels)} rows in StrategyImporter order, got {len(body)}")
+
+    chart: Dict[Tuple[str, int], List[int]] = {}
+    for lineno, (row, key) in enumerate(zip(body, labels), start=2):
+        if len(row) != len(header):
+            raise ValueError(f"{path}:{lineno}: expected {len(header)} fields, got {len(row)}")
+        kind, total = key
+        if (kind == "hard" and not 4 <= total <= 21) or (kind == "soft" and not 12 <= total <= 21):
+            raise ValueError(f"{path}:{lineno}: no such {kind} total {total}")
+        actions = [HIT] * 13
+        for col, cell in zip(columns, row[1:]):
+            code = ACTION_CODES.get(cell.strip().upper())
+            if code is None or col < 0:
+                raise ValueError(f"{path}:{lineno}: unknown action {cell!r}")
+            if code == SPLIT and key[0] != "pair":
+                raise ValueError(f"{path}:{lineno}: split in a non-pair row")
+            actions[col] = code
+        chart[key] = actions
+
+    required = [("hard", t) for t in HARD_ROWS] + [("soft", t) for t in SOFT_ROWS]
+    required += [("pair", c) for c in range(9)] + [("pair", ACE)]
+    absent = [k for k in required if k not in chart]
+    if absent:
+        raise ValueError(f"{path}: missing rows {absent}")
+    return chart
+
+
+def compile_chart(chart: Dict[Tuple[str, int], List[int]]) -> bytes:
+    """Compileer een chart van `read_strategy_csv` naar een beslissingstabel.
+
+    Hard totals buiten de chart: hit onder 5, stand boven 21. Soft 11/12
+    (losse Ace, A-A zonder split): hit. Paren J/Q/K volgen de 10-10 rij.
+    """
+    table = bytearray(_TABLE_SIZE)
+    for col in range(UPCARD_COLUMNS):
+        for total in range(HARD_STATES):
+            if total in HARD_ROWS:
+                continue
+            table[(hard_state(total) << 4) | col] = HIT if total < 5 else STAND
+    for (kind, key), actions in chart.items():
+        if kind == "hard":
+            state = hard_state(key)
+        elif kind == "soft":
+            state = soft_state(key)
+        else:
+            state = pair_state(key)
+        for col, code in enumerate(actions):
+            table[(state << 4) | col] = code
+    ten_row = pair_state(rank_code("10")) << 4
+    for code in range(9, 12):
+        row = pair_state(code) << 4
+        if ("pair", code) not in chart:
+            table[row:row + 13] = table[ten_row:ten_row + 13]
+    return bytes(table)
+
+
+def load_strategy(path: str, cache_dir: Optional[str] = None) -> bytes:
+    """Lees een strategy CSV als gecompileerde tabel, via de schijfcache.
+
+    De cache key is de SHA-256 van de bestandsinhoud, samen met de versie van
+    de compiler en de indeling van de tabel; een gewijzigd bestand of een
+    nieuwe compiler geeft dus automatisch een nieuwe compilatie. `cache_dir=""` schakelt de
+    schijfcache uit.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(_CACHE_SALT + f.read()).hexdigest()
+    table = _loaded.get(digest)
+    if table is not None:
+        return table
+
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    cache_path = os.path.join(cache_dir, digest + ".bjs") if cache_dir else None
+    if cache_path and os.path.isfile(cache_path):
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        if data[:len(_CACHE_MAGIC)] == _CACHE_MAGIC and len(data) == len(_CACHE_MAGIC) + _TABLE_SIZE:
+            table = data[len(_CACHE_MAGIC):]
+
+    if table is None:
+        table = compile_chart(read_strategy_csv(path))
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(_CACHE_MAGIC + table)
+                os.replace(tmp, cache_path)
+            except OSError:
+                # a read-only cache should not stop loading the strategy
+                pass
+
+    _loaded[digest] = table
+    return table
+# Gemaakt door Joshua Meuleman
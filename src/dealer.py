@@ -6,15 +6,35 @@ Dealer implementation with standard policy: hit until 17.
 This dealer stores cards in a `Hand` and uses `game.deal_card()` for draws so
 draw-observers (NPC) are notified.
 """
-from typing import Any
+from typing import Any, Optional
 
 from .hand import Hand, parse_card
+from .rules import Rules
+
+
+def stands_on_soft_17(hand: Hand) -> bool:
+    """True while an S17 dealer must draw."""
+    return hand.best_value() < 17
+
+
+def hits_soft_17(hand: Hand) -> bool:
+    """True while an H17 dealer must draw."""
+    total = hand.best_value()
+    return total < 17 or (total == 17 and hand.is_soft())
 
 
 class Dealer:
-    def __init__(self, stand_on_soft_17: bool = True):
+    def __init__(self, stand_on_soft_17: bool = True, rules: Optional[Rules] = None):
         self.hand = Hand()
+        if rules is not None:
+            stand_on_soft_17 = rules.stand_on_soft_17
         self.stand_on_soft_17 = stand_on_soft_17
+        # drawing rule picked once: must_hit(hand) -> True while the dealer draws
+        self.must_hit = stands_on_soft_17 if stand_on_soft_17 else hits_soft_17
+
+    def reset(self):
+        """Clear the hand for a new round."""
+        self.hand = Hand()
 
     def receive_card(self, card: Any):
         # normalize and add rank
@@ -33,22 +53,22 @@ class Dealer:
 
     def play(self, game: Any):
         # Dealer draws using game.deal_card() so observers are notified.
-        # Hit until 17; soft 17 handling based on `stand_on_soft_17`.
-        while True:
-            total, usable = self.hand.values(), False
-            # reuse Hand.value helper: compute total and usable
-            from .hand import value as hand_value
-            total_val, usable = hand_value(self.hand.cards)
-            if total_val < 17:
-                card = game.deal_card()
-                self.receive_card(card)
-                continue
-            if total_val == 17 and not self.stand_on_soft_17 and usable:
-                # hit on soft 17
+        # Hit until 17; the soft 17 rule was picked in __init__ (`must_hit`).
+        # When the game supports it, the run-out is drawn without per-card
+        # notification and reported to the observers as one batch at the end.
+        batched = hasattr(game, "notify_cards")
+        drawn = []
+        hand = self.hand
+        must_hit = self.must_hit
+        while must_hit(hand):
+            if batched:
+                card = game.deal_card(notify=False)
+                drawn.append(card)
+            else:
                 card = game.deal_card()
-                self.receive_card(card)
-                continue
-            break
+            self.receive_card(card)
+        if drawn:
+            game.notify_cards(drawn)
 
 
 # Gemaakt door Joshua Meuleman
@@ -1,66 +1,223 @@
 # Gemaakt door Joshua Meuleman
 
-"""Deck utilities voor Blackjack."""
+"""Deck utilities voor Blackjack.
+
+Er zijn twee shoe-representaties:
+- `create_deck`: lijst van kaart-dicts {'suit', 'rank'} (GUI en CLI).
+- `create_shoe`: compacte `array('B')` met één byte per kaart (simulaties).
+
+Een kaartcode bestaat uit de rank-index (0..12, volgorde van `RANKS`) in de
+lage 4 bits en de suit-index (volgorde van `SUITS`) in de bits daarboven.
+"""
+from array import array
 from typing import List, Dict
 import random
 
 
+SUITS = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace')
+
+RANK_MASK = 0x0F
+SUIT_SHIFT = 4
+
+# Eén 52-kaarten deck als codes, in dezelfde volgorde als `create_deck`.
+_DECK_CODES = array('B', [(s << SUIT_SHIFT) | r for s in range(len(SUITS)) for r in range(len(RANKS))])
+
+
 def create_deck(num_decks: int = 1) -> List[Dict[str, str]]:
     """Maakt een lijst van kaarten als dicts met keys 'suit' en 'rank'.
 
     num_decks: aantal 52-kaarten decks om samen te voegen (minimaal 1).
     Retourneert een lijst met kaart-dicts.
     """
-    suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-    ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
     deck: List[Dict[str, str]] = []
     count = max(1, int(num_decks))
     for _ in range(count):
-        for suit in suits:
-            for rank in ranks:
+        for suit in SUITS:
+            for rank in RANKS:
                 deck.append({'suit': suit, 'rank': rank})
     return deck
 
 
-def shuffle(deck: List[Dict[str, str]]) -> None:
-    """Schudt het deck in-place."""
-    random.shuffle(deck)
+def create_shoe(num_decks: int = 1) -> array:
+    """Maakt een compacte shoe: `array('B')` met één kaartcode per kaart.
+
+    Dezelfde kaartvolgorde als `create_deck`, maar zonder dict per kaart.
+    `shuffle` en `draw` werken er rechtstreeks op; `draw` geeft dan een int.
+    """
+    return _DECK_CODES * max(1, int(num_decks))
+
+
+def card_code(card: Dict[str, str]) -> int:
+    """Zet een kaart-dict om naar zijn kaartcode."""
+    return (SUITS.index(card['suit']) << SUIT_SHIFT) | RANKS.index(card['rank'])
+
 
+def card_from_code(code: int) -> Dict[str, str]:
+    """Zet een kaartcode om naar de gewone kaart-dict (bv. voor de GUI)."""
+    return {'suit': SUITS[code >> SUIT_SHIFT], 'rank': RANKS[code & RANK_MASK]}
 
-# Draw observers: functies die worden aangeroepen met de kaart wanneer `draw` wordt gebruikt.
-_draw_observers = []
+
+def shuffle(deck: List[Dict[str, str]], rng: random.Random = None) -> None:
+    """Schudt het deck in-place (lijst van dicts of compacte shoe).
+
+    `rng`: eigen `random.Random` voor reproduceerbare shoes; standaard de
+    globale `random` state.
+    """
+    (rng or random).shuffle(deck)
 
 
-def draw(deck: List[Dict[str, str]]):
+class DrawObservers:
+    """Observer registry voor één shoe (of één `Game`).
+
+    Bevat gewone observers (één kaart per oproep), batch observers (een
+    reeks kaarten per oproep) en shoe observers (één oproep met het aantal
+    decks wanneer een nieuwe shoe begint). De lijsten worden als tuples
+    bijgehouden zodat een trekking niets hoeft te kopiëren; `active` is False
+    zolang niemand kaarten volgt, zodat `draw` dan enkel één attribuut test.
+    """
+
+    __slots__ = ('_card', '_batch', '_shoe', 'active')
+
+    def __init__(self):
+        self._card = ()
+        self._batch = ()
+        self._shoe = ()
+        self.active = False
+
+    def _changed(self):
+        self.active = bool(self._card or self._batch)
+
+    def register(self, func):
+        """Registreer een observer die met elke getrokken kaart wordt aangeroepen."""
+        if func not in self._card:
+            self._card = self._card + (func,)
+            self._changed()
+
+    def unregister(self, func):
+        """Verwijder een eerder geregistreerde observer."""
+        self._card = tuple(f for f in self._card if f != func)
+        self._changed()
+
+    def register_batch(self, func):
+        """Registreer een batch observer die een reeks getrokken kaarten krijgt."""
+        if func not in self._batch:
+            self._batch = self._batch + (func,)
+            self._changed()
+
+    def unregister_batch(self, func):
+        """Verwijder een eerder geregistreerde batch observer."""
+        self._batch = tuple(f for f in self._batch if f != func)
+        self._changed()
+
+    def register_shoe(self, func):
+        """Registreer een shoe observer, bv. `NPC.start_shoe(num_decks)`."""
+        if func not in self._shoe:
+            self._shoe = self._shoe + (func,)
+
+    def unregister_shoe(self, func):
+        """Verwijder een eerder geregistreerde shoe observer."""
+        self._shoe = tuple(f for f in self._shoe if f != func)
+
+    def start_shoe(self, num_decks: int) -> None:
+        """Verwittig de shoe observers dat een nieuwe shoe van `num_decks` decks begint."""
+        for obs in self._shoe:
+            try:
+                obs(num_decks)
+            except Exception:
+                continue
+
+    def notify(self, cards) -> None:
+        """Verwittig observers over reeds getrokken kaarten (in trekvolgorde)."""
+        for obs in self._card:
+            for card in cards:
+                try:
+                    obs(card)
+                except Exception:
+                    # Observer exceptions should not break drawing.
+                    continue
+        for obs in self._batch:
+            try:
+                obs(cards)
+            except Exception:
+                continue
+
+
+# Globale registry voor code die rechtstreeks `draw(deck)` gebruikt (GUI, demo's).
+# `Game` heeft zijn eigen registry zodat tafels elkaars kaarten niet zien.
+_observers = DrawObservers()
+
+
+def draw(deck: List[Dict[str, str]], notify: bool = True, observers: DrawObservers = None):
     """Trek één kaart uit het deck (laatste element) en notify observers.
 
-    Observers worden aangeroepen met één argument: de kaart-dict.
+    Observers worden aangeroepen met één argument: de kaart-dict, of de
+    kaartcode (int) wanneer het een compacte shoe is. Batch observers krijgen
+    een reeks met die ene kaart. Met `notify=False` wordt niemand verwittigd;
+    geef de kaarten dan later door aan `notify_draws`.
+    `observers`: registry van de shoe; standaard de globale registry.
     """
     card = deck.pop()
-    # Notify observers (if any). Observers must accept one argument: the card.
-    for obs in list(_draw_observers):
-        try:
-            obs(card)
-        except Exception:
-            # Observer exceptions should not break drawing.
-            continue
+    if observers is None:
+        observers = _observers
+    if notify and observers.active:
+        observers.notify((card,))
     return card
 
 
+def draw_many(deck: List[Dict[str, str]], n: int, notify: bool = True, observers: DrawObservers = None):
+    """Trek `n` kaarten in één keer en notify observers één keer.
+
+    De kaarten komen in dezelfde volgorde terug als bij `n` keer `draw`
+    (een lijst voor een gewoon deck, een array voor een compacte shoe).
+    Batch observers krijgen de volledige reeks in één oproep; gewone observers
+    worden voor compatibiliteit nog per kaart aangeroepen.
+    """
+    if n <= 0:
+        return deck[:0]
+    if n > len(deck):
+        raise IndexError("draw_many from a deck with too few cards")
+    cards = deck[-n:]
+    del deck[-n:]
+    cards.reverse()
+    if observers is None:
+        observers = _observers
+    if notify and observers.active:
+        observers.notify(cards)
+    return cards
+
+
+def notify_draws(cards, observers: DrawObservers = None) -> None:
+    """Verwittig observers over reeds getrokken kaarten (in trekvolgorde)."""
+    if observers is None:
+        observers = _observers
+    if observers.active:
+        observers.notify(cards)
+
+
 def register_draw_observer(func):
-    """Registreer een observer (callable) die wordt aangeroepen met elke getrokken kaart.
+    """Registreer een globale observer (callable) die wordt aangeroepen met elke getrokken kaart.
 
     Example: `register_draw_observer(npc.observe_card)`
+    Geldt enkel voor `draw` zonder eigen registry; voor een `Game` gebruik
+    je `game.register_draw_observer`.
     """
-    if func not in _draw_observers:
-        _draw_observers.append(func)
+    _observers.register(func)
 
 
 def unregister_draw_observer(func):
     """Verwijder een eerder geregistreerde observer."""
-    try:
-        _draw_observers.remove(func)
-    except ValueError:
-        pass
+    _observers.unregister(func)
 
-# Gemaakt door Joshua Meuleman
+
+def register_batch_observer(func):
+    """Registreer een globale batch observer die een reeks getrokken kaarten krijgt.
+
+    Example: `register_batch_observer(npc.observe_cards)`
+    """
+    _observers.register_batch(func)
+
+
+def unregister_batch_observer(func):
+    """Verwijder een eerder geregistreerde batch observer."""
+    _observers.unregister_batch(func)
@@ -4,50 +4,192 @@
 Core game loop and orchestration for Blackjack.
 
 This module exposes a simple `Game` class that manages a shoe, players and the dealer.
-Designed to be testable and to emit card draws via the existing `src.deck` draw-observer API.
+Designed to be testable and to emit card draws via the `src.deck` draw-observer API.
+Every `Game` owns its own observer registry, so several tables can run in one
+process without seeing each other's cards.
+
+The shoe follows a cut-card model: `shoe` is one buffer per game and `pos` the
+number of cards not yet dealt. The cut card sits at a position placed by
+`Rules.cut_card` (at random when the rules give it a spread); the round in
+which it comes out is finished and the next round starts a new shoe, shuffled
+in the same buffer. Shoe observers hear about every new shoe.
 
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable
+import random
+from time import perf_counter_ns
 from src import deck as _deck
 from src.dealer import Dealer
 from src.hand import parse_card
+from src.rules import Rules, round_reserve
+from src.ai.basic_strategy import rules_table
+from src.profiling import SHUFFLE, BETS, DEAL, PLAY, DEALER, SETTLE
+from src.settlement import NUM_STATES, OUTCOMES, outcome_table, settle_state
 
 
 class Game:
-    def __init__(self, num_decks: int = 6, min_bet: int = 1, reshuffle_at_percent: float = 0.25):
-        self.num_decks = num_decks
+    def __init__(self, num_decks: int = 6, min_bet: int = 1, reshuffle_at_percent: float = 0.25,
+                 compact: bool = False, rng: Optional[random.Random] = None,
+                 shoe_source: Optional[Callable[[], Any]] = None, corpus: Any = None,
+                 corpus_start: int = 0, event_log: Any = None, profiler: Any = None,
+                 rules: Optional[Rules] = None):
+        # table rules (src.rules); without them num_decks and
+        # reshuffle_at_percent give the rule set
+        if rules is None:
+            rules = Rules(num_decks=num_decks, penetration=round(1.0 - reshuffle_at_percent, 12))
         self.min_bet = min_bet
-        self.reshuffle_at_percent = reshuffle_at_percent
+        # compact=True deals int card codes from an array('B') shoe instead of dicts
+        self.compact = compact
+        # own random.Random for reproducible shoes; None uses the global state
+        self.rng = rng
+        # callable returning the next ready-shuffled shoe (e.g. replayed shoe
+        # orders for common-random-numbers comparisons); replaces shuffling
+        self.shoe_source = shoe_source
+        if corpus is not None:
+            # deal the recorded shoes of a corpus file (src.sim.corpus) in order
+            from src.sim.corpus import ShoeCorpus
+            if not isinstance(corpus, ShoeCorpus):
+                corpus = ShoeCorpus(corpus)
+            rules = rules._replace(num_decks=corpus.num_decks)
+            self.shoe_source = corpus.feed(corpus_start, compact)
+        self.set_rules(rules)
+        # structured event stream (src.sim.eventlog.EventLog); None logs nothing
+        self.event_log = event_log
+        # phase timers (src.profiling.PhaseProfiler); None times nothing
+        self.profiler = profiler
+        # the shoe buffer, reused across shoes; the cards not yet dealt are
+        # shoe[:pos] and the next card is shoe[pos - 1]
         self.shoe = None
-        self.dealer = None
+        self.pos = 0
+        # cards left when the cut card comes out, placed by start_shoe; a
+        # change of rules moves it from the next shoe on
+        self._cut = 0
+        # seats the cut card leaves room for (the seats of the last round)
+        self._seats = 1
+        self.observers = _deck.DrawObservers()
+
+    def set_rules(self, rules: Rules) -> None:
+        """Use `rules` from the next round on; picks the per-rule-set paths once."""
+        self.rules = rules
+        self.num_decks = rules.num_decks
+        self.reshuffle_at_percent = rules.reshuffle_at_percent
+        self.dealer = Dealer(rules=rules)
+        # strategy table of these rules, played by players without their own table
+        self.strategy_table = rules_table(rules)
+        self._outcomes, self._payouts = outcome_table(rules.blackjack_payout)
+        # with peek the round ends after the deal when the dealer has blackjack;
+        # only an Ace or ten-valued upcard can hide one
+        self._peek = rules.peek
+
+    def register_draw_observer(self, func):
+        """Register a callable that receives every card drawn at this table."""
+        self.observers.register(func)
+
+    def unregister_draw_observer(self, func):
+        self.observers.unregister(func)
+
+    def register_batch_observer(self, func):
+        """Register a callable that receives each draw as a sequence of cards."""
+        self.observers.register_batch(func)
+
+    def unregister_batch_observer(self, func):
+        self.observers.unregister_batch(func)
+
+    def register_shoe_observer(self, func):
+        """Register a callable that is called with `num_decks` when a new shoe starts."""
+        self.observers.register_shoe(func)
+
+    def unregister_shoe_observer(self, func):
+        self.observers.unregister_shoe(func)
 
     def start_shoe(self):
-        """Initialize and shuffle the shoe. Notify AI/NPC to start shoe."""
-        self.shoe = _deck.create_deck(self.num_decks)
-        _deck.shuffle(self.shoe)
+        """Shuffle a new shoe, place the cut card and notify the shoe observers.
+
+        The shoe buffer is reused: all its cards are shuffled again in place
+        and `pos` goes back to the top, so a reshuffle allocates nothing.
+        A `shoe_source` hands over a ready-shuffled shoe instead.
+        """
+        if self.shoe_source is not None:
+            self.shoe = self.shoe_source()
+        else:
+            if self.shoe is None or len(self.shoe) != self.rules.cards:
+                if self.compact:
+                    self.shoe = _deck.create_shoe(self.num_decks)
+                else:
+                    self.shoe = _deck.create_deck(self.num_decks)
+            _deck.shuffle(self.shoe, self.rng)
+        self.pos = len(self.shoe)
+        self._cut = self.rules.cut_card(self.rng, self._seats)
+        if self.event_log is not None:
+            self.event_log.reshuffle(self.shoe, self.num_decks)
+        self.observers.start_shoe(self.num_decks)
+
+    def deal_card(self, notify: bool = True):
+        """Draw the next card of the shoe (the one below `pos`).
 
-    def deal_card(self):
-        """Draw a card from the shoe using src.deck.draw()."""
-        return _deck.draw(self.shoe)
+        With `notify=False` observers are not told; pass the cards to
+        `notify_cards` afterwards.
+        """
+        pos = self.pos - 1
+        if pos < 0:
+            raise IndexError("draw from an empty shoe")
+        self.pos = pos
+        card = self.shoe[pos]
+        observers = self.observers
+        if notify and observers.active:
+            observers.notify((card,))
+        return card
+
+    def deal_cards(self, n: int):
+        """Draw `n` cards at once (in draw order); observers are notified with one batch."""
+        if n <= 0:
+            return self.shoe[:0]
+        end = self.pos
+        pos = end - n
+        if pos < 0:
+            raise IndexError("draw_many from a deck with too few cards")
+        cards = self.shoe[pos:end]
+        cards.reverse()
+        self.pos = pos
+        _deck.notify_draws(cards, self.observers)
+        return cards
+
+    def notify_cards(self, cards) -> None:
+        """Report cards drawn with `notify=False` to the draw observers."""
+        _deck.notify_draws(cards, self.observers)
 
     def should_reshuffle(self) -> bool:
-        """Simple placeholder: reshuffle when remaining cards percentage below threshold."""
-        if not self.shoe:
-            return True
-        remaining = len(self.shoe)
-        initial = 52 * self.num_decks
-        pct = remaining / float(initial)
-        return pct <= self.reshuffle_at_percent
+        """True once the cut card came out: the next round starts a new shoe.
+
+        The cut card is a position in the shoe, so this is one comparison; a
+        round in which it comes out is still played to the end.
+        """
+        return self.pos <= self._cut
 
     def play_round(self, players: List[Any]) -> Dict[str, Any]:
         """Play a single round: deal, let players act, dealer acts, settle.
 
         This is a minimal, synchronous loop intended for unit testing and CLI demos.
         """
+        prof = self.profiler
+        if prof is not None:
+            t = perf_counter_ns()
+        if len(players) != self._seats:
+            self._seats = len(players)
+            if self.rules.cut_card_spread:
+                # placed for another table size: keep room for this table's last round
+                self._cut = min(max(self._cut, round_reserve(self._seats)), self.rules.cards)
         if self.should_reshuffle():
             self.start_shoe()
+            if prof is not None:
+                t = prof.lap(SHUFFLE, t)
 
         summary = {p.id: None for p in players}
+        # the event log only needs the shoe position after every phase; it
+        # derives the cards of every event from its copy of the shoe
+        log = self.event_log
+        if log is not None:
+            start, ends = self.pos, []
 
         # Start round and ask bets first
         for p in players:
@@ -64,28 +206,47 @@ class Game:
             except Exception:
                 p.current_bets = [int(bet)]
 
-        # Deal two cards to each player and dealer
-        for _ in range(2):
-            for p in players:
-                p.receive_card(self.deal_card())
-            # dealer card
-            if not self.dealer:
-                self.dealer = Dealer()
-            self.dealer.receive_card(self.deal_card())
+        self.dealer.reset()
+        if prof is not None:
+            t = prof.lap(BETS, t)
+
+        # Deal two cards to each player and dealer, drawn as one batch in the
+        # usual order: one card per player then the dealer, twice.
+        seats = len(players) + 1
+        cards = self.deal_cards(2 * seats)
+        for base in (0, seats):
+            for i, p in enumerate(players):
+                p.receive_card(cards[base + i])
+            self.dealer.receive_card(cards[base + seats - 1])
 
         dealer_upcard = self.dealer.upcard()
+        # with peek a dealer blackjack ends the round before anyone acts
+        peeked = self._peek and self.dealer.is_blackjack()
+        if prof is not None:
+            t = prof.lap(DEAL, t)
 
         # Players act
         for p in players:
-            action = p.play_hand(dealer_upcard, self)
+            action = "" if peeked else p.play_hand(dealer_upcard, self)
             summary[p.id] = {"action": action}
+            if log is not None:
+                ends.append(self.pos)
+
+        if prof is not None:
+            t = prof.lap(PLAY, t)
 
         # Dealer plays
-        self.dealer.play(self)
+        if not peeked:
+            self.dealer.play(self)
+        if log is not None:
+            ends.append(self.pos)
+        if prof is not None:
+            t = prof.lap(DEALER, t)
 
-        # Settlement
-        dealer_blackjack = self.dealer.is_blackjack()
+        # Settlement: one lookup per hand in the outcome table (src.settlement)
         dealer_value = self.dealer.best_value()
+        dealer_state = settle_state(self.dealer.hand)
+        outcome_codes, payouts = self._outcomes, self._payouts
 
         results = {}
         for p in players:
@@ -94,55 +255,26 @@ class Game:
             per_hand = []
             hands = getattr(p, 'hands', [])
             bets = getattr(p, 'current_bets', [])
+            # the hands of a split never count as blackjack
+            natural = len(hands) == 1
             for idx, hand in enumerate(hands):
                 bet = bets[idx] if idx < len(bets) else (bets[0] if bets else 1)
-                hand_blackjack = hand.is_blackjack()
-                hand_bust = hand.is_bust()
-                if hand_blackjack and not dealer_blackjack:
-                    net = 1.5 * bet
-                    outcome = 'blackjack'
-                elif hand_bust:
-                    net = -bet
-                    outcome = 'bust'
-                elif dealer_blackjack and hand_blackjack:
-                    net = 0.0
-                    outcome = 'push'
-                elif dealer_blackjack and not hand_blackjack:
-                    net = -bet
-                    outcome = 'dealer_blackjack'
-                else:
-                    # normal compare
-                    if dealer_value > 21:
-                        net = bet
-                        outcome = 'dealer_bust_win'
-                    else:
-                        player_total = hand.best_value()
-                        if player_total > dealer_value:
-                            net = bet
-                            outcome = 'win'
-                        elif player_total == dealer_value:
-                            net = 0.0
-                            outcome = 'push'
-                        else:
-                            net = -bet
-                            outcome = 'lose'
+                i = settle_state(hand, natural) * NUM_STATES + dealer_state
+                net = payouts[i] * bet
                 net_total += net
-                per_hand.append({"bet": bet, "outcome": outcome, "net": net})
-
-            # apply net to player's bankroll if present
-            try:
-                if hasattr(p, 'bankroll'):
-                    p.bankroll += float(net_total)
-            except Exception:
-                pass
+                per_hand.append({"bet": bet, "outcome": OUTCOMES[outcome_codes[i]], "net": net})
 
-            # notify player
+            # notify player; the player applies the net to its own bankroll
             try:
                 p.settle({"per_hand": per_hand, "net": net_total, "dealer_value": dealer_value})
             except Exception:
                 pass
             results[p.id] = {"per_hand": per_hand, "net": net_total}
 
+        if log is not None:
+            log.record(start, ends, summary, results, dealer_value)
+        if prof is not None:
+            prof.lap(SETTLE, t)
         return results
 
 
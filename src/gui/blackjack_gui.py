@@ -7,9 +7,22 @@ import os
 from src.game import Game
 from src.dealer import Dealer
 from src.hand import Hand, parse_card
+from src.rules import Rules
+from src.settlement import NUM_STATES, OUTCOMES, settle_state, outcome_table
 from src.ai.npc import NPC
 from src.gui.card import CardWidget
-from src import deck
+
+# banner label per settlement outcome (src.settlement.OUTCOMES)
+_RESULT_LABELS = {
+    "blackjack": "WIN (Gewonnen)",
+    "win": "WIN (Gewonnen)",
+    "dealer_bust_win": "WIN (Gewonnen)",
+    "push": "PUSH (Gelijkspel)",
+    "bust": "LOSS (Verloren)",
+    "lose": "LOSS (Verloren)",
+    "dealer_blackjack": "LOSS (Verloren)",
+    "surrender": "LOSS (Verloren)",
+}
 
 
 class BlackjackGUI:
@@ -19,8 +32,8 @@ class BlackjackGUI:
         self.root.state("zoomed")  # fullscreen-like on Windows
         self.root.configure(bg="#1a1a1a")
         
-        # Game state
-        self.game = Game()
+        # Game state: one rule set for the whole session
+        self.rules = Rules()
         # Ask once for number of decks before first play
         try:
             decks = simpledialog.askinteger(
@@ -29,20 +42,21 @@ class BlackjackGUI:
                 parent=self.root,
                 minvalue=1,
                 maxvalue=12,
-                initialvalue=self.game.num_decks,
+                initialvalue=self.rules.num_decks,
             )
-            if decks is None:
-                decks = self.game.num_decks
-            self.game.num_decks = int(decks)
+            if decks is not None:
+                self.rules = self.rules._replace(num_decks=int(decks))
         except Exception:
             # fallback to default if dialog fails
             pass
 
+        self.game = Game(rules=self.rules)
+        self.dealer = Dealer(rules=self.rules)
+        self._outcomes, self._payouts = outcome_table(self.rules.blackjack_payout)
+        self.npc = NPC(rules=self.rules)
+        self.game.register_shoe_observer(self.npc.start_shoe)
+        self.game.register_draw_observer(self.npc.observe_card)
         self.game.start_shoe()
-        self.dealer = Dealer()
-        self.npc = NPC()
-        self.npc.start_shoe(self.game.num_decks)
-        deck.register_draw_observer(self.npc.observe_card)
         
         # Player state
         self.human_hand = None
@@ -475,10 +489,10 @@ class BlackjackGUI:
         
         # Reset game state
         self.game_over = False
-        self.game = Game()
+        self.game = Game(rules=self.rules)
+        self.game.register_shoe_observer(self.npc.start_shoe)
+        self.game.register_draw_observer(self.npc.observe_card)
         self.game.start_shoe()
-        self.npc.start_shoe(self.game.num_decks)
-        deck.register_draw_observer(self.npc.observe_card)
         
         # Deduct bets
         self.human_money -= self.human_bet
@@ -492,9 +506,9 @@ class BlackjackGUI:
         self.npc_hand = Hand()
         
         for _ in range(2):
-            c1 = deck.draw(self.game.shoe)
-            c2 = deck.draw(self.game.shoe)
-            c3 = deck.draw(self.game.shoe)
+            c1 = self.game.deal_card()
+            c2 = self.game.deal_card()
+            c3 = self.game.deal_card()
             self.human_hand.add(c1)
             self.dealer_hand.add(c2)
             self.npc_hand.add(c3)
@@ -518,7 +532,7 @@ class BlackjackGUI:
     def on_hit(self):
         """Player hits"""
         if not self.game_over:
-            c = deck.draw(self.game.shoe)
+            c = self.game.deal_card()
             self.human_hand.add(c)
             self._refresh_board()
             
@@ -541,7 +555,7 @@ class BlackjackGUI:
             self._update_bet_display()
             self._update_money_display()
             
-            c = deck.draw(self.game.shoe)
+            c = self.game.deal_card()
             self.human_hand.add(c)
             self._refresh_board()
             
@@ -562,38 +576,24 @@ class BlackjackGUI:
     
     def _finish_round(self):
         """Finish the round: dealer plays, settle bets"""
-        # Dealer plays out their hand
-        while self.dealer_hand.best_value() < 17:
-            c = deck.draw(self.game.shoe)
+        # Dealer plays out their hand (soft 17 rule of the rule set)
+        while self.dealer.must_hit(self.dealer_hand):
+            c = self.game.deal_card()
             self.dealer_hand.add(c)
         
         # NPC plays out their hand (simplified)
         while self.npc_hand.best_value() < 17:
-            c = deck.draw(self.game.shoe)
+            c = self.game.deal_card()
             self.npc_hand.add(c)
         
         # Settle bets
-        self._settle()
+        human_outcome, npc_outcome = self._settle()
 
         # Show result pop-up summarizing human and AI outcome
         try:
-            player_value = self.human_hand.best_value()
-            dealer_value = self.dealer_hand.best_value()
-            npc_value = self.npc_hand.best_value()
-
-            def _result_label(value, dealer_value):
-                if value > 21:
-                    return "LOSS (Verloren)"
-                if dealer_value > 21:
-                    return "WIN (Gewonnen)"
-                if value > dealer_value:
-                    return "WIN (Gewonnen)"
-                if value == dealer_value:
-                    return "PUSH (Gelijkspel)"
-                return "LOSS (Verloren)"
-
-            human_result = _result_label(player_value, dealer_value)
-            npc_result = _result_label(npc_value, dealer_value)
+            # labels from the same outcome table lookup that settled the money
+            human_result = _RESULT_LABELS[human_outcome]
+            npc_result = _RESULT_LABELS[npc_outcome]
 
             # Show result in the banner instead of a modal popup
             msg = f"Jij: {human_result} | AI: {npc_result} — Jouw geld: €{self.human_money} | AI geld: €{self.npc_money}"
@@ -618,50 +618,20 @@ class BlackjackGUI:
         self._refresh_board()
     
     def _settle(self):
-        """Settle all bets"""
-        # Player vs Dealer
-        player_value = self.human_hand.best_value()
-        dealer_value = self.dealer_hand.best_value()
-        
-        if player_value > 21:
-            # Player bust - loses bet (already deducted)
-            pass
-        elif dealer_value > 21:
-            # Dealer bust - player wins
-            if self.human_hand.is_blackjack():
-                self.human_money += int(self.human_bet * 2.5)  # 3:2 payout (1 + 1.5)
-            else:
-                self.human_money += self.human_bet * 2
-        elif player_value > dealer_value:
-            # Player wins
-            if self.human_hand.is_blackjack():
-                self.human_money += int(self.human_bet * 2.5)  # 3:2 payout
-            else:
-                self.human_money += self.human_bet * 2
-        elif player_value == dealer_value:
-            # Push (tie)
-            self.human_money += self.human_bet
-        # else: dealer_value > player_value - player loses (already deducted)
-        
-        # NPC vs Dealer (simplified)
-        npc_value = self.npc_hand.best_value()
-        
-        if npc_value > 21:
-            pass
-        elif dealer_value > 21:
-            if self.npc_hand.is_blackjack():
-                self.npc_money += int(self.npc_bet * 2.5)
-            else:
-                self.npc_money += self.npc_bet * 2
-        elif npc_value > dealer_value:
-            if self.npc_hand.is_blackjack():
-                self.npc_money += int(self.npc_bet * 2.5)
-            else:
-                self.npc_money += self.npc_bet * 2
-        elif npc_value == dealer_value:
-            self.npc_money += self.npc_bet
-        
+        """Settle all bets through the outcome table of the rule set (as `Game` does).
+
+        Returns the outcome names (`src.settlement.OUTCOMES`) of the human and
+        the NPC hand.
+        """
+        # bets were already deducted: a hand gets its bet back plus the net result
+        dealer_state = settle_state(self.dealer_hand)
+        human = settle_state(self.human_hand) * NUM_STATES + dealer_state
+        self.human_money += int(self.human_bet * (1 + self._payouts[human]))
+        npc = settle_state(self.npc_hand) * NUM_STATES + dealer_state
+        self.npc_money += int(self.npc_bet * (1 + self._payouts[npc]))
+
         self._update_money_display()
+        return OUTCOMES[self._outcomes[human]], OUTCOMES[self._outcomes[npc]]
 
     def _show_round_banner(self, human_result, npc_result, text):
         """Display the round result in the in-UI banner with color coding and auto-hide."""
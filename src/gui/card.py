@@ -6,6 +6,8 @@ from typing import Optional
 
 import tkinter as tk
 
+from src.hand import rank_code, RANK_NAMES
+
 try:
     from PIL import Image, ImageTk
     _HAS_PIL = True
@@ -28,23 +30,10 @@ class CardImageLoader:
         self._cache = {}
 
     def _normalize_rank(self, rank: str) -> str:
-        r = str(rank).strip()
-        mapping = {
-            'A': 'Ace', 'Ace': 'Ace',
-            'K': 'King', 'King': 'King',
-            'Q': 'Queen', 'Queen': 'Queen',
-            'J': 'Jack', 'Jack': 'Jack',
-            '10': 'Ten', 'T': 'Ten', 'Ten': 'Ten',
-            '9': 'Nine', 'Nine': 'Nine',
-            '8': 'Eight', 'Eight': 'Eight',
-            '7': 'Seven', 'Seven': 'Seven',
-            '6': 'Six', 'Six': 'Six',
-            '5': 'Five', 'Five': 'Five',
-            '4': 'Four', 'Four': 'Four',
-            '3': 'Three', 'Three': 'Three',
-            '2': 'Two', 'Two': 'Two',
-        }
-        return mapping.get(r, r.title())
+        code = rank_code(rank)
+        if code >= 0:
+            return RANK_NAMES[code]
+        return str(rank).strip().title()
 
     def _normalize_suit(self, suit: str) -> str:
         return str(suit).replace(' ', '_').lower()
@@ -6,45 +6,110 @@ Minimal `Hand` representation for Blackjack. Provides value calculation with Ace
 """
 from typing import List, Tuple
 
+from .deck import RANKS, RANK_MASK
+
+
+# Interned rank tables. A rank code is the rank index of `src.deck.RANKS`
+# (0 = '2' ... 8 = '10', 9 = Jack, 10 = Queen, 11 = King, 12 = Ace), which is
+# also the low nibble of a compact card code.
+RANK_SHORT = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+RANK_NAMES = ('Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten',
+              'Jack', 'Queen', 'King', 'Ace')
+HARD_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1)
+HI_LO_TAGS = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1)
+ACE = 12
+
+# every accepted spelling of a rank -> rank code
+_RANK_CODES = {}
+for _code, _names in enumerate(zip(RANKS, RANK_SHORT, RANK_NAMES)):
+    for _name in _names:
+        _RANK_CODES[_name] = _code
+_RANK_CODES['T'] = RANK_SHORT.index('10')
+del _code, _names, _name
+
+
+def rank_code(card) -> int:
+    """Return the rank code (0..12) of a card, or -1 when it is not a rank.
+
+    Accepts the same inputs as `parse_card`: a card dict, a rank string in
+    short or long form, or a compact card code.
+
+    Every int is a card code (`src.deck.card_code`), never a numeric rank:
+    only its low nibble is read, so 10 is the Queen of Hearts and 2 is a
+    '4'. Pass numeric ranks as strings ('10'); before card codes existed an
+    int went through `str()` and `parse_card(10)` gave '10'.
+    """
+    if isinstance(card, int):
+        return card & RANK_MASK
+    rank = card.get("rank") if isinstance(card, dict) else card
+    code = _RANK_CODES.get(rank)
+    if code is None:
+        code = _RANK_CODES.get(str(rank).strip(), -1)
+    return code
+
 
 class Hand:
+    """Cards of one hand with a running hard total and ace count.
+
+    `add()` keeps the hard total (aces counted as 1) and the number of aces
+    up to date, so value, softness, bust and blackjack checks are O(1).
+    Add cards through `add()`; `cards` is kept for display and inspection.
+    """
+
+    __slots__ = ("cards", "_hard", "_aces", "surrendered")
+
     def __init__(self):
         self.cards: List[str] = []
+        self._hard = 0
+        self._aces = 0
+        # set by a player who gave the hand up (late surrender)
+        self.surrendered = False
 
     def add(self, card: str):
         self.cards.append(card)
+        code = rank_code(card)
+        if code == ACE:
+            self._aces += 1
+            self._hard += 1
+        elif code >= 0:
+            self._hard += HARD_VALUES[code]
+        else:
+            self._hard += _numeric_value(card)
+
+    def reset(self):
+        """Remove all cards so the hand can be reused."""
+        self.cards.clear()
+        self._hard = 0
+        self._aces = 0
+        self.surrendered = False
+
+    @property
+    def hard_total(self) -> int:
+        """Total with every Ace counted as 1."""
+        return self._hard
+
+    @property
+    def aces(self) -> int:
+        return self._aces
 
     def values(self) -> List[int]:
         """Return all possible hand values considering Aces as 1 or 11."""
-        values = [0]
-        for c in self.cards:
-            r = parse_card(c)
-            if r in ("J", "Q", "K"):
-                add = 10
-            elif r == "A":
-                # Ace as 1 or 11
-                new = []
-                for v in values:
-                    new.append(v + 1)
-                    new.append(v + 11)
-                values = new
-                continue
-            else:
-                add = int(r)
-            values = [v + add for v in values]
-        return sorted(set(values))
+        return [self._hard + 10 * k for k in range(self._aces + 1)]
 
     def best_value(self) -> int:
-        vals = [v for v in self.values() if v <= 21]
-        if vals:
-            return max(vals)
-        return min(self.values()) if self.values() else 0
+        if self._aces and self._hard <= 11:
+            return self._hard + 10
+        return self._hard
+
+    def is_soft(self) -> bool:
+        """True when an Ace can count as 11 without busting."""
+        return self._aces > 0 and self._hard <= 11
 
     def is_blackjack(self) -> bool:
-        return len(self.cards) == 2 and self.best_value() == 21
+        return len(self.cards) == 2 and self._aces > 0 and self._hard == 11
 
     def is_bust(self) -> bool:
-        return all(v > 21 for v in self.values())
+        return self._hard > 21
 
 
 # Utility: parse card dict or string into normalized rank
@@ -56,42 +121,39 @@ def parse_card(card) -> str:
     - {'rank':'10'} -> '10'
     - 'Ace' -> 'A'
     - 'K' -> 'K'
+    - 0x2B (card code from `src.deck.create_shoe`) -> 'K'
+    - 10 (an int is always a card code, see `rank_code`) -> 'Q'
     """
-    if isinstance(card, dict):
-        rank = card.get("rank")
-    else:
-        rank = card
-    if not isinstance(rank, str):
-        rank = str(rank)
-    rank = rank.strip()
-    mapping = {
-        "Jack": "J",
-        "Queen": "Q",
-        "King": "K",
-        "Ace": "A",
-        "J": "J",
-        "Q": "Q",
-        "K": "K",
-        "A": "A",
-    }
-    # numeric ranks like '2','10' should pass through
-    return mapping.get(rank, rank)
+    code = rank_code(card)
+    if code >= 0:
+        return RANK_SHORT[code]
+    # unknown ranks pass through as a stripped string
+    rank = card.get("rank") if isinstance(card, dict) else card
+    return str(rank).strip()
+
+
+def _numeric_value(card) -> int:
+    """Value of a card whose rank is not in the rank table (0 if not numeric)."""
+    try:
+        return int(parse_card(card))
+    except Exception:
+        return 0
 
 
 # Gemaakt door Joshua Meuleman
 
 
 def card_value(rank: str) -> int:
-    """Return numeric card value for comparisons (Ace counted as 11)."""
-    r = parse_card(rank)
-    if r == "A":
+    """Return numeric card value for comparisons (Ace counted as 11).
+
+    An int is a card code (see `rank_code`): `card_value(2)` is 4.
+    """
+    code = rank_code(rank)
+    if code == ACE:
         return 11
-    if r in ("J", "Q", "K"):
-        return 10
-    try:
-        return int(r)
-    except Exception:
-        return 0
+    if code >= 0:
+        return HARD_VALUES[code]
+    return _numeric_value(rank)
 
 
 def value(cards) -> Tuple[int, bool]:
@@ -100,20 +162,17 @@ def value(cards) -> Tuple[int, bool]:
     cards: list of card dicts or strings
     Returns: (total, usable_ace)
     """
-    ranks = [parse_card(c) for c in cards]
     total = 0
     aces = 0
-    for r in ranks:
-        if r == "A":
+    for c in cards:
+        code = rank_code(c)
+        if code == ACE:
             aces += 1
             total += 1
-        elif r in ("J", "Q", "K"):
-            total += 10
+        elif code >= 0:
+            total += HARD_VALUES[code]
         else:
-            try:
-                total += int(r)
-            except Exception:
-                total += 0
+            total += _numeric_value(c)
     usable = False
     # upgrade one ace from 1 to 11 if it doesn't bust
     if aces and total + 10 <= 21:
@@ -122,7 +181,23 @@ def value(cards) -> Tuple[int, bool]:
     return total, usable
 
 
+def is_soft(cards) -> bool:
+    """True when the cards hold an Ace that counts as 11."""
+    return value(cards)[1]
+
+
+def is_blackjack(cards) -> bool:
+    return len(cards) == 2 and value(cards)[0] == 21
+
+
+def is_bust(cards) -> bool:
+    return value(cards)[0] > 21
+
+
 def is_pair(cards) -> bool:
     if not cards or len(cards) < 2:
         return False
-    return parse_card(cards[0]) == parse_card(cards[1])
+    a = rank_code(cards[0])
+    if a < 0:
+        return parse_card(cards[0]) == parse_card(cards[1])
+    return a == rank_code(cards[1])
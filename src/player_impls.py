@@ -4,13 +4,24 @@
 Concrete player implementations used by the CLI demo:
 - HumanPlayer: interactive on CLI (bet, hit, stand, double, split (single)).
 - NPCPlayer: adapter for existing `src.ai.npc.NPC`.
+- BaselinePlayer: fixed bets and a strategy table.
+
+NPCPlayer and BaselinePlayer split (with resplits up to `Rules.max_splits`),
+double (after a split only with `Rules.double_after_split`) and surrender
+(late, on the dealt hand, when `Rules.surrender`) under the rules of the game.
+Their `Hand` objects and bet list are reused across rounds and splits.
 
 """
 from typing import Any, List, Optional
-from .hand import Hand, parse_card
+from .hand import ACE, Hand, parse_card, rank_code
 from .player import Player
+from .rules import DEFAULT_RULES
 from .ai.npc import NPC
-from .ai.basic_strategy import choose_action
+from .ai.basic_strategy import (
+    ACTIONS, BASIC_TABLE, HIT, DOUBLE, SPLIT, SURRENDER, hand_state, total_state, without_surrender,
+)
+
+_ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
 
 
 class HumanPlayer(Player):
@@ -111,6 +122,103 @@ class HumanPlayer(Player):
             pass
 
 
+def _start_hands(player, bet: int) -> None:
+    """Begin a round on the player's first pooled `Hand`, reusing the lists."""
+    pool = player._pool
+    if not pool:
+        pool.append(Hand())
+    hand = pool[0]
+    hand.reset()
+    hands, bets = player.hands, player.current_bets
+    del hands[1:], bets[1:]
+    if hands:
+        hands[0] = hand
+        bets[0] = bet
+    else:
+        hands.append(hand)
+        bets.append(bet)
+
+
+def _split_hand(player, idx: int, game: Any) -> None:
+    """Split hand `idx` into the next pooled `Hand`; each half draws its second card."""
+    hands, bets, pool = player.hands, player.current_bets, player._pool
+    n = len(hands)
+    if n == len(pool):
+        # the pool only grows up to the largest number of hands seen
+        pool.append(Hand())
+    hand, new = hands[idx], pool[n]
+    first, second = hand.cards
+    hand.reset()
+    hand.add(first)
+    new.reset()
+    new.add(second)
+    hands.append(new)
+    bets.append(bets[idx])
+    hand.add(parse_card(game.deal_card()))
+    new.add(parse_card(game.deal_card()))
+
+
+def _play_hands(player, game: Any, decide, table: bytes, upcard: int) -> str:
+    """Play every hand of `player` under `game.rules`, splitting where allowed.
+
+    decide(hand) -> action code. `table` is the player's strategy table: a
+    pair that may not be split any more plays the table's action for its
+    total, and a surrender that is not allowed plays the cell's action
+    without surrender (`without_surrender`), e.g. stand on a three-card 17.
+    Returns the actions per hand: "," between actions, ";" between hands.
+    """
+    rules = getattr(game, "rules", DEFAULT_RULES)
+    column = upcard & 15
+    plain = without_surrender(table)
+    hands, bets = player.hands, player.current_bets
+    played = []
+    one_card = False
+    idx = 0
+    while idx < len(hands):
+        hand = hands[idx]
+        actions = []
+        # split Aces take one card each, unless the rules let them be hit
+        while not one_card:
+            action = decide(hand)
+            state = -1
+            if action == SPLIT:
+                cards = hand.cards
+                if (len(cards) == 2 and len(hands) <= rules.max_splits
+                        and rank_code(cards[0]) == rank_code(cards[1])):
+                    actions.append("split")
+                    _split_hand(player, idx, game)
+                    if rank_code(cards[0]) == ACE and not rules.hit_split_aces:
+                        one_card = True
+                    continue
+                state = total_state(hand)
+                action = table[(state << 4) | column]
+            if action == SURRENDER:
+                # late surrender: only as the first decision on the dealt hand
+                if rules.surrender and len(hands) == 1 and len(hand.cards) == 2:
+                    actions.append("surrender")
+                    hand.surrendered = True
+                    break
+                if state < 0:
+                    state = hand_state(hand)
+                action = plain[(state << 4) | column]
+            if action == DOUBLE and len(hands) > 1 and not rules.double_after_split:
+                action = HIT
+            actions.append(ACTIONS[action])
+            if action == HIT:
+                hand.add(parse_card(game.deal_card()))
+                if hand.is_bust():
+                    break
+                continue
+            if action == DOUBLE:
+                # double this hand's bet
+                bets[idx] = int(bets[idx] * 2)
+                hand.add(parse_card(game.deal_card()))
+            break
+        played.append(",".join(actions))
+        idx += 1
+    return ";".join(played)
+
+
 class NPCPlayer(Player):
     def __init__(self, id: str, npc_agent: Optional[NPC] = None):
         super().__init__(id)
@@ -118,10 +226,15 @@ class NPCPlayer(Player):
         self.hands: List[Hand] = []
         self.current_bets: List[int] = []
         self.bankroll: float = 100.0
+        # Hand objects reused across rounds and splits
+        self._pool: List[Hand] = []
 
     def start_round(self):
-        self.hands = [Hand()]
-        self.current_bets = [0]
+        _start_hands(self, 0)
+
+    def start_shoe(self, num_decks: int):
+        """A fresh shoe begins: reset the NPC's card memory."""
+        self.npc.start_shoe(num_decks)
 
     def get_bet(self) -> int:
         b = self.npc.recommended_bet()
@@ -132,40 +245,18 @@ class NPCPlayer(Player):
         return int(b)
 
     def receive_card(self, card: Any):
-        rank = parse_card(card)
         if not self.hands:
-            self.hands = [Hand()]
-        self.hands[0].add(rank)
+            _start_hands(self, 0)
+        self.hands[0].add(parse_card(card))
 
     def play_hand(self, dealer_upcard: Any, game: Any) -> str:
-        # use NPC.choose_action repeatedly until stand/bust/double
-        actions = []
-        # play each hand and track actions
-        for idx, hand in enumerate(self.hands):
-            while True:
-                action = self.npc.choose_action(hand, dealer_upcard)
-                actions.append(action)
-                if action == "hit":
-                    card = game.deal_card()
-                    rank = parse_card(card)
-                    hand.add(rank)
-                    if hand.is_bust():
-                        break
-                    continue
-                if action == "double":
-                    # double this hand's bet
-                    try:
-                        self.current_bets[idx] = int(self.current_bets[idx] * 2)
-                    except Exception:
-                        pass
-                    card = game.deal_card()
-                    rank = parse_card(card)
-                    hand.add(rank)
-                    break
-                if action == "stand":
-                    break
-                break
-        return ",".join(actions)
+        # use NPC.choose_action for every decision of every (split) hand
+        npc = self.npc
+        upcard = rank_code(dealer_upcard)
+        return _play_hands(
+            self, game,
+            lambda hand: _ACTION_CODES[npc.choose_action(hand, dealer_upcard, len(self.hands))],
+            npc.strategy, upcard)
 
     def settle(self, result: Any):
         # result expected to be a dict that includes 'net'
@@ -180,56 +271,41 @@ class BaselinePlayer(Player):
     """A non-counting baseline that uses basic strategy only and fixed bets.
 
     Useful for headless simulation and comparison against the counting NPC.
+    Without a strategy table it plays the table of the game's rules
+    (`basic_strategy.rules_table`).
     """
-    def __init__(self, id: str, fixed_bet: int = 1):
+    def __init__(self, id: str, fixed_bet: int = 1, strategy: Optional[bytes] = None):
         super().__init__(id)
         self.hands: List[Hand] = []
         self.current_bets: List[int] = []
         self.bankroll: float = 100.0
         self.fixed_bet = int(fixed_bet)
+        # compiled strategy table (see src.ai.strategy_loader); None: the game's rules
+        self.strategy = strategy
+        # Hand objects reused across rounds and splits
+        self._pool: List[Hand] = []
 
     def start_round(self):
-        self.hands = [Hand()]
-        self.current_bets = [self.fixed_bet]
+        _start_hands(self, self.fixed_bet)
 
     def get_bet(self) -> int:
         # always bet fixed amount (or remaining bankroll)
         bet = min(int(self.fixed_bet), int(self.bankroll))
-        self.current_bets = [bet]
+        self.current_bets[0] = bet
         return bet
 
     def receive_card(self, card: Any):
-        rank = parse_card(card)
         if not self.hands:
-            self.hands = [Hand()]
-        self.hands[0].add(rank)
+            _start_hands(self, self.fixed_bet)
+        self.hands[0].add(parse_card(card))
 
     def play_hand(self, dealer_upcard: Any, game: Any) -> str:
-        actions = []
-        for idx, hand in enumerate(self.hands):
-            while True:
-                action = choose_action(hand.cards, dealer_upcard)
-                actions.append(action)
-                if action == "hit":
-                    card = game.deal_card()
-                    rank = parse_card(card)
-                    hand.add(rank)
-                    if hand.is_bust():
-                        break
-                    continue
-                if action == "double":
-                    try:
-                        self.current_bets[idx] = int(self.current_bets[idx] * 2)
-                    except Exception:
-                        pass
-                    card = game.deal_card()
-                    rank = parse_card(card)
-                    hand.add(rank)
-                    break
-                if action == "stand":
-                    break
-                break
-        return ",".join(actions)
+        upcard = rank_code(dealer_upcard)
+        table = self.strategy or getattr(game, "strategy_table", BASIC_TABLE)
+        return _play_hands(
+            self, game,
+            lambda hand: table[(hand_state(hand) << 4) | (upcard & 15)],
+            table, upcard)
 
     def settle(self, result: Any):
         net = result.get("net", 0) if isinstance(result, dict) else 0
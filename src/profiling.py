@@ -0,0 +1,122 @@
+"""
+# Gemaakt door Joshua Meuleman
+
+Opt-in phase timers for the game loop and the simulators.
+
+A `PhaseProfiler` keeps, per phase, a call counter, the total and maximum
+time in nanoseconds (`time.perf_counter_ns`) and a histogram of the
+durations with four buckets per power of two, so long runs can watch latency
+distributions without cProfile.
+`Game(profiler=PhaseProfiler())` times the phases of `play_round`; without a
+profiler `Game` only tests `profiler is not None` once per phase.
+
+Profilers are plain picklable objects: simulator tasks return them with their
+statistics and `+` merges them (see `src.sim.runner`). `snapshot()` gives a
+JSON-friendly dict and `format_snapshot` a small text table.
+"""
+import time
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# phases of Game.play_round, in order
+SHUFFLE, BETS, DEAL, PLAY, DEALER, SETTLE = range(6)
+GAME_PHASES = ("shuffle", "bets", "deal", "play", "dealer", "settle")
+
+# durations with bit length L >= 3 go to bucket 4 * L + (top three bits - 4);
+# shorter ones to 4 * L
+_BUCKETS = 4 * 65
+
+
+class PhaseProfiler:
+    """Counters, timers and latency histograms for a fixed list of phases."""
+
+    def __init__(self, phases: Sequence[str] = GAME_PHASES):
+        self.phases = tuple(phases)
+        n = len(self.phases)
+        self.calls = [0] * n
+        self.total_ns = [0] * n
+        self.max_ns = [0] * n
+        self.hist = [[0] * _BUCKETS for _ in range(n)]
+
+    def lap(self, phase: int, start: int) -> int:
+        """Book the time since `start` on `phase`; returns now (the next start)."""
+        now = perf_counter_ns()
+        ns = now - start
+        self.calls[phase] += 1
+        self.total_ns[phase] += ns
+        if ns > self.max_ns[phase]:
+            self.max_ns[phase] = ns
+        bits = ns.bit_length()
+        self.hist[phase][4 * bits + ((ns >> (bits - 3)) - 4 if bits >= 3 else 0)] += 1
+        return now
+
+    def reset(self) -> None:
+        self.__init__(self.phases)
+
+    def merge(self, other: "PhaseProfiler") -> None:
+        """Add the counts of another profiler with the same phases (in-place)."""
+        if other.phases != self.phases:
+            raise ValueError("cannot merge profilers with different phases")
+        for i in range(len(self.phases)):
+            self.calls[i] += other.calls[i]
+            self.total_ns[i] += other.total_ns[i]
+            self.max_ns[i] = max(self.max_ns[i], other.max_ns[i])
+            self.hist[i] = [a + b for a, b in zip(self.hist[i], other.hist[i])]
+
+    def __add__(self, other: "PhaseProfiler") -> "PhaseProfiler":
+        out = PhaseProfiler(self.phases)
+        out.merge(self)
+        out.merge(other)
+        return out
+
+    def percentile(self, phase: int, q: float) -> float:
+        """Upper bound (ns) of the histogram bucket holding the `q` quantile."""
+        target = q * self.calls[phase]
+        seen = 0
+        for b, count in enumerate(self.hist[phase]):
+            seen += count
+            if count and seen >= target:
+                bits, sub = divmod(b, 4)
+                return float((5 + sub) << (bits - 3) if bits >= 3 else 1 << bits)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per phase: calls, total_ms, mean_us, max_us and p50/p90/p99_us (bucket bounds)."""
+        out = {}
+        for i, name in enumerate(self.phases):
+            calls = self.calls[i]
+            out[name] = {"calls": calls, "total_ms": self.total_ns[i] / 1e6,
+                         "mean_us": self.total_ns[i] / calls / 1e3 if calls else 0.0,
+                         "max_us": self.max_ns[i] / 1e3,
+                         "p50_us": self.percentile(i, 0.50) / 1e3,
+                         "p90_us": self.percentile(i, 0.90) / 1e3,
+                         "p99_us": self.percentile(i, 0.99) / 1e3}
+        return out
+
+
+def format_snapshot(snapshot: Dict[str, Dict[str, float]]) -> str:
+    """Text table of a `PhaseProfiler.snapshot()`."""
+    total = sum(s["total_ms"] for s in snapshot.values()) or 1.0
+    lines = [f"{'phase':<10}{'calls':>12}{'share':>8}{'mean us':>10}{'p50 us':>10}"
+             f"{'p99 us':>10}{'max us':>10}"]
+    for name, s in snapshot.items():
+        lines.append(f"{name:<10}{s['calls']:>12,}{s['total_ms'] / total:>8.1%}{s['mean_us']:>10.2f}"
+                     f"{s['p50_us']:>10.2f}{s['p99_us']:>10.2f}{s['max_us']:>10.1f}")
+    return "\n".join(lines)
+
+
+def periodic_dump(interval: float, key: str = "profile",
+                  write: Optional[Callable[[str], Any]] = None) -> Callable[[Dict[str, Any]], None]:
+    """Progress callback for the simulators: print `merged[key]` every `interval` seconds."""
+    write = write or print
+    last = [time.monotonic()]
+
+    def dump(merged: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        if key in merged and now - last[0] >= interval:
+            last[0] = now
+            write(format_snapshot(merged[key].snapshot()))
+    return dump
+
+
+# Gemaakt door Joshua Meuleman
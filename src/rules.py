@@ -0,0 +1,100 @@
+"""
+# Gemaakt door Joshua Meuleman
+
+Table rules in one immutable object.
+
+`Rules` is a NamedTuple: hashable (so per-rule-set tables can be cached on
+it), picklable for the simulator workers and changed only through
+`_replace`. Components read it once when they are built and pick their code
+path or compiled table then:
+
+- `Game` takes the shoe size, cut-card placement, peek and the payout table;
+- `Dealer` picks its soft-17 drawing rule;
+- `basic_strategy.rules_table` compiles the strategy chart for the rule set;
+- `NPC` passes `ev_rules()` on to `src.ai.ev`;
+- the GUI settles through the same payout table as `Game`.
+
+`DEFAULT_RULES` are the rules the engine used before they were configurable:
+6 decks, dealer stands on soft 17, 3:2 blackjack, no hole-card peek and a
+reshuffle once 75% of the shoe is dealt.
+"""
+import random
+from typing import Any, Dict, NamedTuple
+
+
+class Rules(NamedTuple):
+    num_decks: int = 6
+    stand_on_soft_17: bool = True
+    # multiplier of the bet for a player blackjack (1.5 = 3:2, 1.2 = 6:5)
+    blackjack_payout: float = 1.5
+    double_after_split: bool = True
+    # how often a hand may be split (1 = no resplit, 3 = up to four hands)
+    max_splits: int = 3
+    hit_split_aces: bool = False
+    # late surrender: give up half the bet after the dealer checked for blackjack
+    surrender: bool = False
+    # the dealer checks the hole card for blackjack before the players act
+    peek: bool = False
+    # share of the shoe dealt before the next round starts with a reshuffle
+    penetration: float = 0.75
+    # the cut card is placed at random within penetration +- this share of
+    # the shoe (0 = always exactly at the penetration)
+    cut_card_spread: float = 0.0
+
+    @property
+    def cards(self) -> int:
+        """Number of cards in a full shoe."""
+        return 52 * self.num_decks
+
+    @property
+    def reshuffle_at_percent(self) -> float:
+        """Remaining share of the shoe at which `Game` reshuffles."""
+        return round(1.0 - self.penetration, 12)
+
+    def cut_card(self, rng: Any = None, seats: int = 1) -> int:
+        """Cards left in a full shoe when the cut card comes out.
+
+        Without a spread this is fixed and no random number is drawn; with one
+        the position is drawn from `rng` (default the global `random` state)
+        and never lands so deep that the last round of `seats` players could
+        run out of cards (`round_reserve`).
+        """
+        cards = self.cards
+        # a round starts while more than reshuffle_at_percent of the shoe is left
+        cut = int(self.reshuffle_at_percent * cards)
+        spread = round(self.cut_card_spread * cards)
+        if spread:
+            cut += (rng or random).randint(-spread, spread)
+            cut = max(cut, round_reserve(seats))
+        return min(max(cut, 0), cards)
+
+    def ev_rules(self) -> Dict[str, Any]:
+        """Keyword arguments for `src.ai.ev.action_evs` under these rules."""
+        return {"stand_on_soft_17": self.stand_on_soft_17, "peek": self.peek,
+                "blackjack_payout": self.blackjack_payout, "max_splits": self.max_splits,
+                "double_after_split": self.double_after_split,
+                "hit_split_aces": self.hit_split_aces, "surrender": self.surrender}
+
+
+DEFAULT_RULES = Rules()
+
+
+def round_reserve(seats: int) -> int:
+    """Cards kept behind a random cut card for one more round of `seats` players.
+
+    Two cards per hand plus three draws each and a margin for splits; in
+    60,000 simulated rounds at seven seats no round needed more than 40.
+    """
+    return 5 * (seats + 1) + 8
+
+
+def as_rules(rules: Any = None) -> Rules:
+    """`Rules` from None (the defaults), a `Rules` or a dict of fields."""
+    if rules is None:
+        return DEFAULT_RULES
+    if isinstance(rules, Rules):
+        return rules
+    return Rules(**rules)
+
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,86 @@
+"""
+# Gemaakt door Joshua Meuleman
+
+Settlement as a table lookup.
+
+A finished hand is summarized by one small integer, its settle state: the best
+total 0..21, `BUST`, `BLACKJACK` (a two-card 21 that was not split) or
+`SURRENDER` (the player gave the hand up for half the bet). The
+dealer is summarized the same way. `outcome_table` precomputes, for every
+(player state, dealer state) pair, the outcome code (index in `OUTCOMES`) and
+the payout multiplier of the bet, so settling a hand is one index:
+
+    i = player_state * NUM_STATES + dealer_state
+    net = payouts[i] * bet
+
+The table encodes the rules of `Game.play_round`: a player blackjack beats
+everything except a dealer blackjack (push), a busted player always loses,
+a dealer blackjack beats every other hand and a busted dealer pays the rest.
+A surrendered hand loses half its bet, except against a dealer blackjack: late
+surrender only gives up half once the dealer is known not to have one. With
+peek the round ends before anyone can surrender; without it a surrendered hand
+that meets a dealer blackjack loses the whole bet.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+# settle states: totals 0..21 are their own state
+BUST = 22
+BLACKJACK = 23
+SURRENDER = 24
+NUM_STATES = 25
+
+OUTCOMES = ("blackjack", "bust", "push", "dealer_blackjack", "dealer_bust_win", "win", "lose",
+            "surrender")
+(OUTCOME_BLACKJACK, OUTCOME_BUST, OUTCOME_PUSH, OUTCOME_DEALER_BLACKJACK,
+ OUTCOME_DEALER_BUST_WIN, OUTCOME_WIN, OUTCOME_LOSE, OUTCOME_SURRENDER) = range(len(OUTCOMES))
+
+
+def settle_state(hand, natural: bool = True) -> int:
+    """Settle state of a `Hand` (or the dealer's hand).
+
+    natural=False for the hands of a split: their two-card 21 is a plain 21.
+    """
+    if hand.surrendered:
+        return SURRENDER
+    if natural and hand.is_blackjack():
+        return BLACKJACK
+    if hand.is_bust():
+        return BUST
+    return hand.best_value()
+
+
+def total_state(total: int, blackjack: bool = False) -> int:
+    """Settle state from a best total (may be over 21) and a blackjack flag."""
+    if blackjack:
+        return BLACKJACK
+    return BUST if total > 21 else total
+
+
+def _outcome(player: int, dealer: int) -> int:
+    if player == SURRENDER:
+        return OUTCOME_DEALER_BLACKJACK if dealer == BLACKJACK else OUTCOME_SURRENDER
+    if player == BLACKJACK:
+        return OUTCOME_PUSH if dealer == BLACKJACK else OUTCOME_BLACKJACK
+    if player == BUST:
+        return OUTCOME_BUST
+    if dealer == BLACKJACK:
+        return OUTCOME_DEALER_BLACKJACK
+    if dealer == BUST:
+        return OUTCOME_DEALER_BUST_WIN
+    if player > dealer:
+        return OUTCOME_WIN
+    return OUTCOME_PUSH if player == dealer else OUTCOME_LOSE
+
+
+@lru_cache(maxsize=None)
+def outcome_table(blackjack_payout: float = 1.5) -> Tuple[bytes, Tuple[float, ...]]:
+    """(outcome codes, payout multipliers), both indexed by player * NUM_STATES + dealer."""
+    multiplier = {OUTCOME_BLACKJACK: blackjack_payout, OUTCOME_BUST: -1.0, OUTCOME_PUSH: 0.0,
+                  OUTCOME_DEALER_BLACKJACK: -1.0, OUTCOME_DEALER_BUST_WIN: 1.0,
+                  OUTCOME_WIN: 1.0, OUTCOME_LOSE: -1.0, OUTCOME_SURRENDER: -0.5}
+    codes = bytes(_outcome(p, d) for p in range(NUM_STATES) for d in range(NUM_STATES))
+    return codes, tuple(float(multiplier[c]) for c in codes)
+
+
+# Gemaakt door Joshua Meuleman
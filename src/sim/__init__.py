@@ -0,0 +1,4 @@
+# Gemaakt door Joshua Meuleman
+"""Simulation subpackage (vectorized engines and tooling)."""
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,38 @@
+# Gemaakt door Joshua Meuleman
+"""Checkpoints voor lange simulaties.
+
+Een checkpoint is één pickle-bestand met de volledige toestand van een run
+(samengevoegde statistiek, volgende taak en eventueel de lopende taak met
+RNG state, shoe, NPC geheugen en bankrolls). Het bestand wordt atomisch
+vervangen: eerst naar een tijdelijk bestand in dezelfde map, dan fsync en
+`os.replace`, zodat een onderbreking nooit een half geschreven checkpoint
+achterlaat.
+"""
+import os
+import pickle
+from typing import Any, Dict
+
+_MAGIC = b"BJCK1"
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Schrijf `state` atomisch naar `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Lees een checkpoint van `save_checkpoint`."""
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a simulation checkpoint")
+        return pickle.load(f)
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,147 @@
+# Gemaakt door Joshua Meuleman
+"""A/B vergelijking van strategieën met common random numbers (CRN).
+
+In plaats van twee spelers aan dezelfde tafel (waar de beslissingen van de
+ene speler bepalen welke kaarten de andere krijgt) speelt elke strategie
+apart, alleen aan tafel, op exact dezelfde vooraf geschudde shoes. De shoes
+van taak i komen uit seed stream i (`runner.task_seeds`) en worden via
+`Game(shoe_source=...)` gedeeld; elke strategie speelt elke shoe van begin
+tot herschudden.
+
+Per shoe wordt het netto resultaat, de totale inzet en het aantal rondes
+bijgehouden. Het verschil per shoe tussen een strategie en de referentie is
+een gepaarde steekproef: de gedeelde kaartvariantie valt weg, zodat hetzelfde
+betrouwbaarheidsinterval met veel minder rondes bereikt wordt.
+"""
+import random
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..deck import create_shoe, shuffle
+from ..game import Game
+from ..player_impls import BaselinePlayer, NPCPlayer
+from ..ai.deviations import DEFAULT_DEVIATIONS, SURRENDER_DEVIATIONS
+from ..ai.npc import NPC
+from ..ai.strategy_loader import load_strategy
+from .runner import _BANKROLL, python_rng, run_tasks, task_seeds, chunk_sizes
+from .corpus import ShoeCorpus
+from .stats import Accumulator
+
+PLAYER_KINDS = ("baseline", "npc", "npc_deviations")
+
+
+def seat_player(kind: str, game: Game, strategy_path: Optional[str] = None):
+    """Maak een speler van het gegeven soort en zet hem aan `game`."""
+    strategy = load_strategy(strategy_path) if strategy_path else None
+    if kind == "baseline":
+        player = BaselinePlayer(kind, fixed_bet=1, strategy=strategy)
+    elif kind in ("npc", "npc_deviations"):
+        use = kind == "npc_deviations"
+        player = NPCPlayer(kind, NPC(strategy=strategy, rules=game.rules,
+                                     deviations=DEFAULT_DEVIATIONS if use else None,
+                                     surrender_deviations=SURRENDER_DEVIATIONS if use else None))
+        game.register_shoe_observer(player.start_shoe)
+        game.register_batch_observer(player.npc.observe_cards)
+    else:
+        raise ValueError(f"unknown player kind {kind!r} (expected one of {PLAYER_KINDS})")
+    player.bankroll = _BANKROLL
+    return player
+
+
+def shoe_feed(num_decks: int, rng: random.Random):
+    """Shoe source voor `Game`: elke oproep geeft de volgende geschudde shoe."""
+    def next_shoe():
+        shoe = create_shoe(num_decks)
+        shuffle(shoe, rng)
+        return shoe
+    return next_shoe
+
+
+def play_shoes_crn(kind: str, strategy_path: Optional[str], n_shoes: int, num_decks: int,
+                   seed: np.random.SeedSequence, corpus: Optional[str] = None,
+                   first: int = 0) -> Dict[str, np.ndarray]:
+    """Eén taak: speel `n_shoes` shoes van seed stream `seed` met één speler.
+
+    Met `corpus` worden records `first`.. van dat shoe corpus gespeeld.
+    Retourneert arrays per shoe: 'net', 'bet' en 'rounds'.
+    """
+    if corpus:
+        game = Game(compact=True, corpus=corpus, corpus_start=first)
+        num_decks = game.num_decks
+    else:
+        game = Game(num_decks=num_decks, compact=True,
+                    shoe_source=shoe_feed(num_decks, python_rng(seed)))
+    player = seat_player(kind, game, strategy_path)
+    out = {k: np.zeros(n_shoes) for k in ("net", "bet", "rounds")}
+    for i in range(n_shoes):
+        game.start_shoe()
+        net = bet = rounds = 0.0
+        while not game.should_reshuffle():
+            res = game.play_round([player])[player.id]
+            net += res["net"]
+            bet += sum(h["bet"] for h in res["per_hand"])
+            rounds += 1
+        out["net"][i], out["bet"][i], out["rounds"][i] = net, bet, rounds
+    return out
+
+
+def compare_strategies(kinds: Sequence[str] = ("baseline", "npc"), n_shoes: int = 1000,
+                       num_decks: int = 6, strategy_path: Optional[str] = None,
+                       seed: Optional[int] = None, workers: int = 1,
+                       chunk_shoes: int = 250, corpus: Optional[str] = None) -> Dict[str, Any]:
+    """Speel elke strategie op dezelfde shoes en vergelijk gepaard met `kinds[0]`.
+
+    Retourneert {'per_strategy': {kind: Accumulator}, 'paired': {kind: Accumulator},
+    'variance_ratio': {kind: float}, 'shoes': n, 'rounds': {kind: n}}.
+    De accumulators tellen per shoe (net, inzet), dus hun `edge` is de EV per
+    ingezette eenheid; de gepaarde accumulator bevat het verschil per shoe met
+    de rondes van de referentie als gewicht (`edge` = verschil per ronde).
+    `variance_ratio`: (var A + var B) / var(A - B) van het netto per shoe,
+    de factor waarmee CRN het aantal benodigde rondes verkleint.
+    `corpus`: pad van een shoe corpus (`src.sim.corpus`) in plaats van seeds.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if corpus:
+        n_shoes = min(n_shoes, len(ShoeCorpus(corpus)))
+    sizes = chunk_sizes(n_shoes, chunk_shoes)
+    seeds = task_seeds(seed, len(sizes))
+    firsts = [i * chunk_shoes for i in range(len(sizes))]
+    # the same seed stream (or corpus records) per chunk for every strategy: identical shoes
+    tasks = [(kind, strategy_path, n, num_decks, s, corpus, first)
+             for kind in kinds for n, s, first in zip(sizes, seeds, firsts)]
+    results = run_tasks(play_shoes_crn, tasks, workers)
+
+    per_shoe: Dict[str, Dict[str, np.ndarray]] = {}
+    for k, kind in enumerate(kinds):
+        parts = results[k * len(sizes):(k + 1) * len(sizes)]
+        per_shoe[kind] = {key: np.concatenate([p[key] for p in parts]) for key in ("net", "bet", "rounds")}
+
+    ref = per_shoe[kinds[0]]
+    summary: Dict[str, Any] = {"shoes": n_shoes, "seed": seed, "per_strategy": {}, "paired": {},
+                               "variance_ratio": {}, "rounds": {}}
+    for kind, data in per_shoe.items():
+        acc = Accumulator()
+        acc.add_many(data["net"], data["bet"])
+        summary["per_strategy"][kind] = acc
+        summary["rounds"][kind] = int(data["rounds"].sum())
+        if kind == kinds[0]:
+            continue
+        diff = data["net"] - ref["net"]
+        paired = Accumulator()
+        paired.add_many(diff, ref["rounds"])
+        summary["paired"][kind] = paired
+        var_diff = diff.var(ddof=1) if n_shoes > 1 else 0.0
+        unpaired = data["net"].var(ddof=1) + ref["net"].var(ddof=1) if n_shoes > 1 else 0.0
+        summary["variance_ratio"][kind] = unpaired / var_diff if var_diff else float("inf")
+    return summary
+
+
+def paired_difference(summary: Dict[str, Any], kind: str, confidence: float = 0.95) -> Tuple[float, float, float]:
+    """(verschil per ronde, ondergrens, bovengrens) van `kind` t.o.v. de referentie."""
+    acc = summary["paired"][kind]
+    low, high = acc.confidence_interval(confidence)
+    return acc.edge, low, high
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,97 @@
+# Gemaakt door Joshua Meuleman
+"""Vaste corpus van geschudde shoes in een plat binair bestand.
+
+Formaat (little endian):
+- header van 32 bytes: magic `b"BJSHOE1\\0"`, uint32 versie, uint32 aantal
+  decks, uint32 kaarten per shoe, uint32 reserved, uint64 aantal shoes;
+- daarna één record van `kaarten per shoe` bytes per shoe: kaartcodes zoals
+  `deck.create_shoe` ((suit << 4) | rank), in trekvolgorde (eerste byte =
+  eerste kaart die gedeeld wordt).
+
+`ShoeCorpus` opent het bestand met `numpy.memmap`: er wordt niets ingelezen
+tot een record gebruikt wordt, en processen die hetzelfde bestand openen delen
+de pagina's via de page cache. Een `ShoeCorpus` pickelt als zijn pad, zodat
+workers het bestand zelf openen in plaats van de data te kopiëren.
+"""
+import os
+import struct
+from array import array
+from typing import Optional
+
+import numpy as np
+
+from .. import deck as _deck
+
+MAGIC = b"BJSHOE1\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIIIQ")
+HEADER_SIZE = _HEADER.size
+
+
+def write_corpus(path: str, n_shoes: int, num_decks: int = 6, seed: Optional[int] = None,
+                 batch: int = 4096) -> str:
+    """Schud `n_shoes` shoes en schrijf ze als corpus naar `path` (atomisch)."""
+    rng = np.random.default_rng(seed)
+    base = np.frombuffer(_deck.create_shoe(num_decks), dtype=np.uint8)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, num_decks, base.size, 0, n_shoes))
+        for start in range(0, n_shoes, batch):
+            rows = np.tile(base, (min(batch, n_shoes - start), 1))
+            f.write(rng.permuted(rows, axis=1, out=rows).tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+class ShoeCorpus:
+    """Read-only, memory-mapped toegang tot een corpus van `write_corpus`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            raise ValueError(f"{path} is not a shoe corpus")
+        magic, version, self.num_decks, self.shoe_size, _, n_shoes = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a shoe corpus (version {VERSION})")
+        self.records = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE,
+                                 shape=(n_shoes, self.shoe_size))
+
+    def __reduce__(self):
+        # reopen by path in other processes instead of pickling the data
+        return (ShoeCorpus, (self.path,))
+
+    def __len__(self) -> int:
+        return self.records.shape[0]
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Records `start:stop` als (n, kaarten) view, in trekvolgorde."""
+        return self.records[start:stop]
+
+    def shoe(self, index: int, compact: bool = True):
+        """Record `index` als shoe voor `Game` (laatste element wordt eerst getrokken)."""
+        shoe = array("B", self.records[index, ::-1].tobytes())
+        if compact:
+            return shoe
+        return [_deck.card_from_code(code) for code in shoe]
+
+    def feed(self, start: int = 0, compact: bool = True) -> "CorpusFeed":
+        """Shoe source voor `Game`: records `start`, `start + 1`, ... (cyclisch)."""
+        return CorpusFeed(self, start, compact)
+
+
+class CorpusFeed:
+    """Callable shoe source over een corpus; pickelt als (pad, positie)."""
+
+    def __init__(self, corpus: ShoeCorpus, start: int = 0, compact: bool = True):
+        self.corpus = corpus
+        self.position = start
+        self.compact = compact
+
+    def __call__(self):
+        index = self.position % len(self.corpus)
+        self.position += 1
+        return self.corpus.shoe(index, self.compact)
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,321 @@
+# Gemaakt door Joshua Meuleman
+"""Gestructureerd event log per ronde, weggeschreven in kolom-chunks.
+
+`Game(event_log=EventLog(pad))` schrijft elke gebeurtenis aan tafel als één
+record met vaste breedte:
+
+    round   uint32  ronde-id vanaf 1 (RESHUFFLE: de laatste ronde ervoor)
+    kind    uint8   RESHUFFLE, DEAL, DECISION, DRAW, DEALER, SETTLE
+    seat    uint8   plaats aan tafel; DEALER_SEAT voor de dealer en de tafel
+    hand    uint8   hand-index van de speler
+    card    uint8   kaartcode (`src.deck`), NO_CARD als er geen kaart is
+    action  uint8   DECISION: index in `ACTIONS`; SETTLE: index in `OUTCOMES`
+    count   int16   Hi-Lo running count van alle getrokken kaarten na dit event
+    dealt   uint16  kaarten getrokken sinds het begin van de shoe
+    amount  float32 DEAL: inzet; SETTLE: netto; DEALER zonder kaart: eindtotaal
+
+Tijdens het spel bewaart het log per ronde enkel wat `Game` al heeft: de
+shoe-posities voor de deal, na elke speler en na de dealer, de acties en de
+afrekening (waaruit ook de inzet volgt), plus een kopie van elke nieuwe shoe. Bij `flush`
+(per `batch` rondes) worden daaruit met NumPy alle events afgeleid: welke
+kaarten wie trok, de beslissingen tussen de trekkingen, en `count`/`dealt` via
+een cumsum over de shoe. Zo kost loggen tijdens het spel een paar list appends
+per seat in plaats van een record per kaart.
+
+Een chunk bestaat uit een header (aantal records, aantal bytes) en de kolommen
+na elkaar, optioneel met zlib gecomprimeerd. `read_events` leest een log terug
+als structured array.
+"""
+import struct
+import zlib
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from ..ai.basic_strategy import ACTIONS
+from ..deck import RANK_MASK, card_code
+from ..hand import HI_LO_TAGS
+from ..settlement import OUTCOMES
+
+MAGIC = b"BJEVT1\0\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sII")    # magic, version, compression level (0 = none)
+_CHUNK = struct.Struct("<II")       # records, payload bytes
+
+RESHUFFLE, DEAL, DECISION, DRAW, DEALER, SETTLE = range(6)
+KINDS = ("reshuffle", "deal", "decision", "draw", "dealer", "settle")
+
+DEALER_SEAT = 255
+NO_CARD = 255
+NO_ACTION = 255
+
+FIELDS = (("round", "<u4"), ("kind", "u1"), ("seat", "u1"), ("hand", "u1"), ("card", "u1"),
+          ("action", "u1"), ("count", "<i2"), ("dealt", "<u2"), ("amount", "<f4"))
+DTYPE = np.dtype(list(FIELDS))
+# events are ordered by shoe serial * _SPAN + position in the shoe
+_SPAN = 1 << 16
+# values per round in EventLog.rounds
+_ROUND_FIELDS = 6
+_DEFAULTS = {"hand": 0, "card": NO_CARD, "action": NO_ACTION, "count": 0, "dealt": 0, "amount": 0.0}
+
+_ACTION_CODES = {name: i for i, name in enumerate(ACTIONS)}
+_OUTCOME_CODES = {name: i for i, name in enumerate(OUTCOMES)}
+# cards drawn by each decision: a split deals the second card of both hands
+_DRAWN_CARDS = np.zeros(256, dtype=np.int64)
+_DRAWN_CARDS[[_ACTION_CODES["hit"], _ACTION_CODES["double"]]] = 1
+_DRAWN_CARDS[_ACTION_CODES["split"]] = 2
+# action code per first two letters of an action name ("hi", "st", ...)
+_TOKENS = np.full(1 << 16, NO_ACTION, dtype=np.uint8)
+for _name, _code in _ACTION_CODES.items():
+    _TOKENS[_name.encode()[0] << 8 | _name.encode()[1]] = _code
+_SEPARATORS = np.array([ord(","), ord(";"), ord("\n")], dtype=np.uint8)
+
+# Hi-Lo tag per card byte (rank in the low bits); NO_CARD counts 0
+_HI_LO = np.zeros(256, dtype=np.int32)
+for _code in range(NO_CARD):
+    if _code & RANK_MASK < len(HI_LO_TAGS):
+        _HI_LO[_code] = HI_LO_TAGS[_code & RANK_MASK]
+
+
+class EventLog:
+    """Buffered writer: rondes in een lijst, per `batch` rondes één kolom-chunk."""
+
+    def __init__(self, path: str, batch: int = 1 << 14, compress: int = 0):
+        self.path = path
+        self.batch = batch
+        # zlib level 1..9, 0 writes the columns uncompressed
+        self.compress = compress
+        # flat: _ROUND_FIELDS values per round (cheaper to append and slice than tuples)
+        self.rounds: List[Any] = []
+        self.round = 0
+        self.records = 0
+        self._shoes: Dict[int, np.ndarray] = {}
+        self._shuffles: List[tuple] = []
+        self._serial = -1
+        self._count = 0
+        self._dealt = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, compress))
+
+    # --- called by Game -----------------------------------------------------
+
+    def reshuffle(self, shoe: Sequence[Any], num_decks: int) -> None:
+        """Een nieuwe shoe (zoals `Game.shoe`: de laatste kaart wordt eerst getrokken)."""
+        self._serial += 1
+        self._shoes[self._serial] = _card_column(shoe)[::-1]
+        self._shuffles.append((self._serial, num_decks, self.round + len(self.rounds) // _ROUND_FIELDS))
+
+    def record(self, start: int, ends: Sequence[int], summary: Dict[Any, dict],
+               results: Dict[Any, dict], dealer_value: int) -> None:
+        """Eén gespeelde ronde.
+
+        `start`: kaarten in de shoe voor de deal; `ends`: kaarten na elke
+        speler en na de dealer; `summary`: {'action': ...} per speler;
+        `results`: het resultaat van `Game.play_round`.
+        """
+        rounds = self.rounds
+        rounds += (self._serial, start, ends, summary, results, dealer_value)
+        if len(rounds) >= self.batch * _ROUND_FIELDS:
+            self.flush()
+
+    # --- writing ------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Leid de events van de wachtende rondes af en schrijf ze als één chunk."""
+        if not self.rounds and not self._shuffles:
+            return
+        parts = []
+        if self._shuffles:
+            serial, decks, rid = (np.array(c) for c in zip(*self._shuffles))
+            parts.append(_part(serial * _SPAN - 0.5, rid, RESHUFFLE, DEALER_SEAT, amount=decks))
+        if self.rounds:
+            parts.extend(self._round_events())
+        # stable: events with equal keys keep the order of `parts`
+        order = np.argsort(np.concatenate([part["key"] for part in parts]), kind="stable")
+        out = {}
+        for name, dt in FIELDS:
+            column = [np.broadcast_to(np.asarray(part[name] if name in part else _DEFAULTS[name],
+                                                 dtype=dt), part["key"].shape) for part in parts]
+            out[name] = np.concatenate(column)[order]
+        self._fill_counts(out)
+        self.rounds = []
+        self._shuffles = []
+        self._shoes = {self._serial: self._shoes[self._serial]}
+
+        payload = b"".join(out[name].tobytes() for name, _ in FIELDS)
+        if self.compress:
+            payload = zlib.compress(payload, self.compress)
+        self._file.write(_CHUNK.pack(len(order), len(payload)))
+        self._file.write(payload)
+        self.records += len(order)
+
+    def _round_events(self) -> List[Dict[str, Any]]:
+        rounds = self.rounds
+        serials, starts, ends, summaries, results, dealer_values = (
+            rounds[i::_ROUND_FIELDS] for i in range(_ROUND_FIELDS))
+        n = len(serials)
+        rid = self.round + 1 + np.arange(n)
+        self.round += n
+        serials = np.array(serials)
+        uniq, inv = np.unique(serials, return_inverse=True)
+        shoes = [self._shoes[u] for u in uniq]
+        shoe_size = np.array([len(c) for c in shoes])
+        sizes = shoe_size[inv]
+        seats = np.fromiter(map(len, ends), dtype=np.int64, count=n) - 1
+
+        # shoe positions (cards drawn) bounding the deal, every seat and the dealer
+        width = seats + 3
+        first = np.cumsum(width) - width
+        bounds = np.empty(width.sum(), dtype=np.int64)
+        bounds[first] = sizes - np.array(starts)
+        bounds[first + 1] = bounds[first] + 2 * (seats + 1)
+        rest = np.ones(len(bounds), dtype=bool)
+        rest[first] = rest[first + 1] = False
+        bounds[rest] = np.repeat(sizes, seats + 1) - np.fromiter(chain.from_iterable(ends), dtype=np.int64)
+        keep = np.ones(len(bounds) - 1, dtype=bool)
+        keep[first[1:] - 1] = False
+        seg_start, seg_stop = bounds[:-1][keep], bounds[1:][keep]
+        seg_first = first - np.arange(n)            # first segment (the deal) of each round
+        seg_round = np.repeat(np.arange(n), seats + 2)
+        slot = np.arange(len(seg_start)) - seg_first[seg_round]
+        round_end = bounds[first + width - 1]
+
+        # card events: the deal, the players' draws and the dealer's draws
+        length = seg_stop - seg_start
+        c_seg = np.repeat(np.arange(len(seg_start)), length)
+        pos = seg_start[c_seg] + np.arange(length.sum()) - (np.cumsum(length) - length)[c_seg]
+        c_round = seg_round[c_seg]
+        c_slot = slot[c_seg]
+        c_seats = seats[c_round]
+        dealt = pos - seg_start[seg_first[c_round]]
+        deal_seat = np.where(dealt % (c_seats + 1) == c_seats, DEALER_SEAT, dealt % (c_seats + 1))
+        seat = np.where(c_slot == 0, deal_seat, np.where(c_slot > c_seats, DEALER_SEAT, c_slot - 1))
+        kind = np.where(c_slot == 0, DEAL, np.where(c_slot > c_seats, DEALER, DRAW))
+        cards = _part(serials[c_round] * _SPAN + pos, rid[c_round], kind, seat)
+        # running count per shoe position: cumsum over all shoes, minus the shoe's start
+        codes = np.concatenate(shoes)
+        shoe_first = np.cumsum(shoe_size) - shoe_size
+        counts = np.cumsum(_HI_LO[codes])
+        counts -= np.repeat(counts[shoe_first] - _HI_LO[codes[shoe_first]], shoe_size)
+        index = shoe_first[inv[c_round]] + pos
+        cards["card"] = codes[index]
+        cards["count"] = counts[index]
+        cards["dealt"] = pos + 1
+        parts = [cards]
+
+        # decisions, placed before the card(s) they drew (hit, double, split)
+        # or after the last one; ";" separates the hands of a seat
+        text = "\n".join([s["action"] for summary in summaries for s in summary.values()]).encode()
+        buf = np.frombuffer(text + b"\0\0", dtype=np.uint8)
+        sep = np.flatnonzero(np.isin(buf, _SEPARATORS))
+        tok = np.concatenate(([0], sep + 1))
+        newline = buf == ord("\n")
+        group = np.concatenate(([0], np.cumsum(newline)[sep]))
+        code = _TOKENS[buf[tok].astype(np.int64) << 8 | buf[tok + 1]]
+        valid = code != NO_ACTION
+        tok, group, code = tok[valid], group[valid], code[valid]
+        hands_before = np.cumsum(buf == ord(";"))
+        line_start = np.concatenate(([0], np.flatnonzero(newline) + 1))
+        d_hand = hands_before[tok] - hands_before[line_start[group]]
+        drawn = _DRAWN_CARDS[code]
+        cum = np.cumsum(drawn)
+        first_tok = np.searchsorted(group, group)
+        # cards the seat drew before this decision
+        k = cum - drawn - (cum[first_tok] - drawn[first_tok])
+        seat_first = np.cumsum(seats) - seats
+        d_round = np.repeat(np.arange(n), seats)[group]
+        d_seat = group - seat_first[d_round]
+        seat_start = seg_start[seg_first[d_round] + 1 + d_seat]
+        offset = np.where(drawn > 0, k - 0.25, k - 0.75)
+        parts.append(_part(serials[d_round] * _SPAN + seat_start + offset, rid[d_round], DECISION,
+                           d_seat, hand=d_hand, action=code))
+
+        # dealer total, then the settlement of every hand
+        end_key = serials * _SPAN + round_end - 0.5
+        parts.append(_part(end_key, rid, DEALER, DEALER_SEAT, amount=np.array(dealer_values)))
+        per_hand = [r["per_hand"] for res in results for r in res.values()]
+        hands = np.fromiter(map(len, per_hand), dtype=np.int64, count=len(per_hand))
+        flat = list(chain.from_iterable(per_hand))
+        h_group = np.repeat(np.arange(len(per_hand)), hands)
+        h_round = np.repeat(np.arange(n), seats)[h_group]
+        parts.append(_part(end_key[h_round], rid[h_round], SETTLE, h_group - seat_first[h_round],
+                           hand=np.arange(len(flat)) - (np.cumsum(hands) - hands)[h_group],
+                           action=np.array([_OUTCOME_CODES[h["outcome"]] for h in flat], dtype=np.uint8),
+                           amount=np.array([h["net"] for h in flat], dtype=np.float64)))
+
+        # the opening bet on the deal cards: the smallest bet of the seat's
+        # hands, halved when every hand was doubled
+        bet = np.array([min(h["bet"] for h in hs) if hs else 0.0 for hs in per_hand], dtype=np.float64)
+        doubles = np.bincount(group[code == _ACTION_CODES["double"]], minlength=len(per_hand))
+        bet[(doubles == hands) & (hands > 0)] /= 2
+        deal = (kind == DEAL) & (seat != DEALER_SEAT)
+        cards["amount"] = np.where(deal, bet[seat_first[c_round] + np.where(deal, seat, 0)], 0.0)
+        return parts
+
+    def _fill_counts(self, out: Dict[str, np.ndarray]) -> None:
+        # events without a card carry the count of the last card before them
+        # (0 after a reshuffle, the previous chunk's state at the start)
+        has = (out["card"] != NO_CARD) | (out["kind"] == RESHUFFLE)
+        src = np.maximum.accumulate(np.where(has, np.arange(len(has)), -1))
+        before = src < 0
+        out["count"] = np.where(before, self._count, out["count"][src])
+        out["dealt"] = np.where(before, self._dealt, out["dealt"][src])
+        self._count = int(out["count"][-1])
+        self._dealt = int(out["dealt"][-1])
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _part(key, rid, kind, seat, **columns) -> Dict[str, Any]:
+    """Kolommen voor een groep events; ontbrekende kolommen krijgen `_DEFAULTS`."""
+    columns.update(key=np.asarray(key, dtype=np.float64), round=rid, kind=kind, seat=seat)
+    return columns
+
+
+def _card_column(cards: Sequence[Any]) -> np.ndarray:
+    try:
+        return np.frombuffer(bytes(cards), dtype=np.uint8)
+    except TypeError:
+        # dict cards (Game(compact=False))
+        return np.fromiter((card_code(c) for c in cards), dtype=np.uint8, count=len(cards))
+
+
+def iter_chunks(path: str) -> Iterator[np.ndarray]:
+    """Lees een event log chunk per chunk als structured arrays (`DTYPE`)."""
+    with open(path, "rb") as f:
+        magic, version, compress = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an event log (version {VERSION})")
+        while True:
+            head = f.read(_CHUNK.size)
+            if len(head) < _CHUNK.size:
+                return
+            n, size = _CHUNK.unpack(head)
+            payload = f.read(size)
+            if compress:
+                payload = zlib.decompress(payload)
+            out = np.empty(n, dtype=DTYPE)
+            offset = 0
+            for name, dt in FIELDS:
+                out[name] = np.frombuffer(payload, dtype=dt, count=n, offset=offset)
+                offset += np.dtype(dt).itemsize * n
+            yield out
+
+
+def read_events(path: str, kind: Optional[int] = None) -> np.ndarray:
+    """Het volledige log als één structured array, optioneel enkel `kind` events."""
+    chunks = [c if kind is None else c[c["kind"] == kind] for c in iter_chunks(path)]
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=DTYPE)
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,370 @@
+# Gemaakt door Joshua Meuleman
+"""Multi-process simulatie runner met deterministische seeding.
+
+Het werk wordt opgedeeld in taken met een vaste grootte (`chunk_rounds`
+rondes of `chunk_shoes` shoes). Elke taak krijgt een eigen kind van
+`numpy.random.SeedSequence(seed)`, afhankelijk van het taaknummer en niet van
+de worker die de taak uitvoert. De statistieken worden in taakvolgorde
+samengevoegd, dus dezelfde seed geeft hetzelfde resultaat voor elk aantal
+workers.
+
+Met `ci_width` stopt een run zodra het betrouwbaarheidsinterval op de edge
+(zie `src.sim.stats.Accumulator`) smal genoeg is; ook dat wordt na elke taak
+in taakvolgorde getest en is dus reproduceerbaar.
+
+Lange runs kunnen periodiek een checkpoint schrijven en met `resume=True`
+bit-exact verdergaan (zie `run_merged`).
+
+- `simulate_rounds`: NPC tegen baseline via `Game.play_round` (zoals
+  `examples/simulate.py`).
+- `simulate_shoes`: baseline spelers via de gevectoriseerde engine.
+"""
+import os
+import random
+from time import perf_counter_ns
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..game import Game
+from ..player_impls import BaselinePlayer, NPCPlayer
+from ..ai.npc import NPC
+from ..ai.strategy_loader import load_strategy
+from ..profiling import PhaseProfiler
+from .checkpoint import load_checkpoint, save_checkpoint
+from .corpus import ShoeCorpus
+from .stats import Accumulator
+from .vector import VectorSimulator
+
+
+def task_seeds(seed: Optional[int], n_tasks: int) -> List[np.random.SeedSequence]:
+    """Onafhankelijke seed streams, één per taak."""
+    return np.random.SeedSequence(seed).spawn(n_tasks)
+
+
+def python_rng(seq: np.random.SeedSequence) -> random.Random:
+    """`random.Random` geseed vanuit een SeedSequence (voor `Game`)."""
+    return random.Random(int.from_bytes(seq.generate_state(4).tobytes(), "little"))
+
+
+def run_tasks(func: Callable, tasks: Sequence[tuple], workers: int = 1) -> List[Any]:
+    """Voer `func(*task)` uit voor elke taak; resultaten in taakvolgorde.
+
+    workers=1 draait in dit proces, anders een `ProcessPoolExecutor`
+    (None = alle cores).
+    """
+    if workers == 1 or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *zip(*tasks)))
+
+
+def merge_stats(parts: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Tel per-taak tellers, sommen en accumulators op (in de gegeven volgorde)."""
+    merged: Dict[str, Any] = {}
+    for part in parts:
+        for key, val in part.items():
+            merged[key] = merged[key] + val if key in merged else val
+    return merged
+
+
+def _run_task(task) -> Dict[str, Any]:
+    """Worker: speel een taak volledig uit."""
+    task.step()
+    return task.result()
+
+
+def run_merged(tasks: Sequence[Any], workers: int = 1,
+               stop: Optional[Callable[[Dict[str, Any]], bool]] = None,
+               checkpoint: Optional[str] = None, resume: bool = False,
+               checkpoint_every: int = 2_000_000, spec: Optional[dict] = None,
+               progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Voer de taken uit en voeg de resultaten samen in taakvolgorde.
+
+    tasks: objecten met `step(max_rounds=None)`, `result()` en `done`
+    (zie `RoundsTask` en `ShoesTask`).
+    stop: `stop(merged)` wordt na elke samengevoegde taak getest; bij True
+    worden de resterende taken niet meer gestart.
+    checkpoint: pad van een checkpointbestand, ongeveer elke
+    `checkpoint_every` rondes atomisch vervangen. Met één worker bevat het ook
+    de lopende taak (RNG, shoe, NPC, bankrolls), anders enkel de afgewerkte
+    taken. Met `resume=True` gaat de run verder vanaf het bestand; `spec`
+    moet dan gelijk zijn aan die van de onderbroken run.
+    progress: `progress(merged)` na elke samengevoegde taak (bv.
+    `src.profiling.periodic_dump`).
+    """
+    merged: Dict[str, Any] = {}
+    start = 0
+    current = None
+    if checkpoint and resume and os.path.isfile(checkpoint):
+        state = load_checkpoint(checkpoint)
+        if state["spec"] != spec:
+            raise ValueError("checkpoint was written by a run with other parameters")
+        merged, start, current = state["merged"], state["next_task"], state["current"]
+        if state["stopped"]:
+            return merged
+    if not checkpoint and stop is None and progress is None:
+        return merge_stats(run_tasks(_run_task, [(t,) for t in tasks], workers))
+
+    saved_at = merged.get("rounds", 0)
+
+    def save(next_task, task=None, stopped=False):
+        save_checkpoint(checkpoint, {"spec": spec, "merged": merged, "next_task": next_task,
+                                     "current": task, "stopped": stopped})
+
+    def finish(index, result):
+        # merge one finished task; True when the run should stop
+        nonlocal merged, saved_at
+        merged = merge_stats([merged, result])
+        if progress is not None:
+            progress(merged)
+        stopped = stop is not None and stop(merged)
+        if checkpoint and (stopped or index + 1 == len(tasks)
+                           or merged["rounds"] - saved_at >= checkpoint_every):
+            save(index + 1, stopped=stopped)
+            saved_at = merged["rounds"]
+        return stopped
+
+    if workers == 1:
+        for index in range(start, len(tasks)):
+            task = current if current is not None else tasks[index]
+            current = None
+            while not task.done:
+                task.step(checkpoint_every if checkpoint else None)
+                if checkpoint and not task.done:
+                    save(index, task)
+            if finish(index, task.result()):
+                break
+        return merged
+
+    wave = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if current is not None:
+            # a checkpoint of a single-worker run: finish its open task first
+            tasks = list(tasks)
+            tasks[start] = current
+        for first in range(start, len(tasks), wave):
+            batch = tasks[first:first + wave]
+            for index, result in enumerate(pool.map(_run_task, batch), first):
+                if finish(index, result):
+                    pool.shutdown(cancel_futures=True)
+                    return merged
+    return merged
+
+
+def ci_stop(key: str, width: float, confidence: float = 0.95) -> Callable[[Dict[str, Any]], bool]:
+    """Stopcriterium: interval op de edge van `merged[key]` is <= `width`."""
+    def stop(merged: Dict[str, Any]) -> bool:
+        low, high = merged[key].confidence_interval(confidence)
+        return high - low <= width
+    return stop
+
+
+# ruim genoeg dat de bankroll een inzet nooit beperkt
+_BANKROLL = 1e12
+
+# phases timed per batch by ShoesTask(profile=True)
+VECTOR_PHASES = ("shuffle", "play", "stats")
+
+
+def chunk_sizes(total: int, size: int) -> List[int]:
+    """Taakgroottes: `total` opgedeeld in stukken van hoogstens `size`."""
+    return [min(size, total - start) for start in range(0, total, size)]
+
+
+class RoundsTask:
+    """Eén taak: `rounds` rondes NPC tegen baseline aan een nieuwe tafel.
+
+    De tafel wordt pas bij de eerste `step` opgebouwd; een taak kan tussen
+    twee stappen gepickeld worden (checkpoints) en gaat daarna bit-exact verder.
+    """
+
+    def __init__(self, rounds: int, num_decks: int, strategy_path: Optional[str],
+                 seed: np.random.SeedSequence, profile: bool = False):
+        self.rounds = rounds
+        self.num_decks = num_decks
+        self.strategy_path = strategy_path
+        self.seed = seed
+        self.table = None
+        self.stats = {"rounds": 0, "baseline_wins": 0, "npc_wins": 0, "pushes": 0,
+                      "baseline_net": 0.0, "npc_net": 0.0,
+                      "baseline": Accumulator(), "npc": Accumulator()}
+        if profile:
+            # phase timers of Game.play_round, merged like the other statistics
+            self.stats["profile"] = PhaseProfiler()
+
+    @property
+    def done(self) -> bool:
+        return self.stats["rounds"] >= self.rounds
+
+    def _setup(self):
+        game = Game(num_decks=self.num_decks, compact=True, rng=python_rng(self.seed),
+                    profiler=self.stats.get("profile"))
+        strategy = load_strategy(self.strategy_path) if self.strategy_path else None
+        baseline = BaselinePlayer("You", fixed_bet=1, strategy=strategy)
+        npc = NPCPlayer("NPC", NPC(strategy=strategy))
+        # every round is played at the strategy's own bet, in every chunk
+        baseline.bankroll = npc.bankroll = _BANKROLL
+        game.register_shoe_observer(npc.start_shoe)
+        game.register_batch_observer(npc.npc.observe_cards)
+        game.start_shoe()
+        self.table = (game, baseline, npc)
+
+    def step(self, max_rounds: Optional[int] = None) -> None:
+        """Speel tot `max_rounds` rondes (standaard: de rest van de taak)."""
+        if self.table is None:
+            self._setup()
+        game, baseline, npc = self.table
+        stats = self.stats
+        base_acc, npc_acc = stats["baseline"], stats["npc"]
+        left = self.rounds - stats["rounds"]
+        for _ in range(left if max_rounds is None else min(left, max_rounds)):
+            res = game.play_round([baseline, npc])
+            stats["rounds"] += 1
+            bnet = float(res[baseline.id]["net"])
+            nnet = float(res[npc.id]["net"])
+            stats["baseline_net"] += bnet
+            stats["npc_net"] += nnet
+            base_acc.add(bnet, sum(h["bet"] for h in res[baseline.id]["per_hand"]))
+            npc_acc.add(nnet, sum(h["bet"] for h in res[npc.id]["per_hand"]))
+            # decide win by net>0; both won counts for both
+            if bnet > 0:
+                stats["baseline_wins"] += 1
+            if nnet > 0:
+                stats["npc_wins"] += 1
+            if bnet <= 0 and nnet <= 0:
+                stats["pushes"] += 1
+
+    def result(self) -> Dict[str, Any]:
+        return self.stats
+
+
+def _spec(kind: str, seed, **params) -> dict:
+    return {"kind": kind, "seed": seed, **params}
+
+
+def _entropy(seed: Optional[int], checkpoint: Optional[str], resume: bool):
+    """Seed van de run; zonder seed de entropy van een eerdere checkpoint."""
+    if seed is not None:
+        return seed
+    if checkpoint and resume and os.path.isfile(checkpoint):
+        return load_checkpoint(checkpoint)["spec"]["seed"]
+    return np.random.SeedSequence().entropy
+
+
+def simulate_rounds(rounds: int = 1000, num_decks: int = 6, strategy_path: Optional[str] = None,
+                    seed: Optional[int] = None, workers: int = 1, chunk_rounds: int = 10000,
+                    ci_width: Optional[float] = None, ci_player: str = "npc",
+                    checkpoint: Optional[str] = None, resume: bool = False,
+                    checkpoint_every: int = 2_000_000, profile: bool = False,
+                    progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """NPC tegen baseline over `rounds` rondes, verdeeld over `workers` processen.
+
+    Met `ci_width` is `rounds` een maximum: de run stopt zodra het 95%
+    interval op de edge van `ci_player` ('npc' of 'baseline') zo smal is.
+    `checkpoint`/`resume`/`progress`: zie `run_merged`.
+    `profile`: time de fasen van `Game.play_round`; het resultaat bevat dan
+    een `src.profiling.PhaseProfiler` onder 'profile'.
+    """
+    seed = _entropy(seed, checkpoint, resume)
+    sizes = chunk_sizes(rounds, chunk_rounds)
+    tasks = [RoundsTask(n, num_decks, strategy_path, s, profile)
+             for n, s in zip(sizes, task_seeds(seed, len(sizes)))]
+    stop = ci_stop(ci_player, ci_width) if ci_width else None
+    spec = _spec("rounds", seed, rounds=rounds, num_decks=num_decks, strategy_path=strategy_path,
+                 chunk_rounds=chunk_rounds, ci_width=ci_width, ci_player=ci_player, profile=profile)
+    return run_merged(tasks, workers, stop, checkpoint, resume, checkpoint_every, spec, progress)
+
+
+class ShoesTask:
+    """Eén taak: `n_shoes` shoes met de gevectoriseerde engine, per `batch` shoes."""
+
+    batch = 512
+
+    def __init__(self, n_shoes: int, num_decks: int, seats: int, strategy_path: Optional[str],
+                 seed: np.random.SeedSequence, corpus: Optional[str] = None, first: int = 0,
+                 profile: bool = False):
+        # with a corpus (src.sim.corpus) the task plays records first..first+n_shoes
+        self.corpus = corpus
+        self.first = first
+        self.n_shoes = n_shoes
+        self.num_decks = num_decks
+        self.seats = seats
+        self.strategy_path = strategy_path
+        self.rng = np.random.default_rng(seed)
+        self.stats = {"shoes": 0, "rounds": 0, "hands": 0, "net": 0.0, "hand_stats": Accumulator()}
+        if profile:
+            self.stats["profile"] = PhaseProfiler(VECTOR_PHASES)
+
+    @property
+    def done(self) -> bool:
+        return self.stats["shoes"] >= self.n_shoes
+
+    def step(self, max_rounds: Optional[int] = None) -> None:
+        """Speel batches tot er minstens `max_rounds` rondes bij zijn (of tot het einde)."""
+        strategy = load_strategy(self.strategy_path) if self.strategy_path else None
+        sim = VectorSimulator(num_decks=self.num_decks, seats=self.seats, strategy=strategy)
+        corpus = ShoeCorpus(self.corpus) if self.corpus else None
+        stats = self.stats
+        prof = stats.get("profile")
+        played = 0
+        while not self.done and (max_rounds is None or played < max_rounds):
+            if prof is not None:
+                t = perf_counter_ns()
+            n = min(self.batch, self.n_shoes - stats["shoes"])
+            if corpus is not None:
+                start = self.first + stats["shoes"]
+                shoes = corpus.rows(start, start + n)
+            else:
+                shoes = sim.shuffle_shoes(n, self.rng)
+            if prof is not None:
+                t = prof.lap(0, t)
+            nets = sim.play_shoes(shoes).played()
+            if prof is not None:
+                t = prof.lap(1, t)
+            stats["shoes"] += n
+            stats["rounds"] += len(nets)
+            stats["hands"] += nets.size
+            stats["net"] += float(nets.sum())
+            stats["hand_stats"].add_many(nets)
+            played += len(nets)
+            if prof is not None:
+                prof.lap(2, t)
+
+    def result(self) -> Dict[str, Any]:
+        return self.stats
+
+
+def simulate_shoes(n_shoes: int, num_decks: int = 6, seats: int = 1,
+                   strategy_path: Optional[str] = None, seed: Optional[int] = None,
+                   workers: int = 1, chunk_shoes: int = 4096,
+                   ci_width: Optional[float] = None, checkpoint: Optional[str] = None,
+                   resume: bool = False, checkpoint_every: int = 2_000_000,
+                   corpus: Optional[str] = None, profile: bool = False,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Baseline resultaten over `n_shoes` shoes, verdeeld over `workers` processen.
+
+    Met `ci_width` is `n_shoes` een maximum (interval op de edge per hand).
+    `checkpoint`/`resume`: zie `run_merged`.
+    `corpus`: pad van een shoe corpus; dan worden de eerste `n_shoes` records
+    gespeeld in plaats van geschudde shoes (de seed doet er niet toe).
+    `profile`: time per batch het schudden, het spelen en de statistiek
+    (`VECTOR_PHASES`); `progress`: zie `run_merged`.
+    """
+    seed = _entropy(seed, checkpoint, resume)
+    if corpus:
+        shoe_corpus = ShoeCorpus(corpus)
+        n_shoes = min(n_shoes, len(shoe_corpus))
+        num_decks = shoe_corpus.num_decks
+    sizes = chunk_sizes(n_shoes, chunk_shoes)
+    firsts = [i * chunk_shoes for i in range(len(sizes))]
+    tasks = [ShoesTask(n, num_decks, seats, strategy_path, s, corpus, first, profile)
+             for n, s, first in zip(sizes, task_seeds(seed, len(sizes)), firsts)]
+    stop = ci_stop("hand_stats", ci_width) if ci_width else None
+    spec = _spec("shoes", seed, n_shoes=n_shoes, num_decks=num_decks, seats=seats,
+                 strategy_path=strategy_path, chunk_shoes=chunk_shoes, ci_width=ci_width,
+                 corpus=corpus, profile=profile)
+    return run_merged(tasks, workers, stop, checkpoint, resume, checkpoint_every, spec, progress)
+
+# Gemaakt door Joshua Meuleman
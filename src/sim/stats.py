@@ -0,0 +1,174 @@
+# Gemaakt door Joshua Meuleman
+"""Streaming statistiek voor simulaties (Welford met parallel merge).
+
+`Accumulator` houdt per ronde het netto resultaat en de inzet bij in vaste
+geheugenruimte: aantallen, gemiddelden, tweede momenten en de co-variantie van
+net en inzet, plus win/loss/push tellers. Twee accumulators van aparte workers
+worden exact samengevoegd met `merge` (Chan et al.), dus de runner hoeft geen
+individuele rondes te bewaren.
+
+Afgeleide grootheden:
+- `edge`: EV per ingezette eenheid (som net / som inzet), met standaardfout
+  via de delta-methode voor een ratio;
+- `std`: standaardafwijking van het netto resultaat per ronde;
+- `n0`: aantal rondes tot de verwachte winst één standaardafwijking is;
+- `score`: 1e6 * (EV / SD)^2 per ronde.
+"""
+import math
+from statistics import NormalDist
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+_FIELDS = ("n", "mean_net", "m2_net", "mean_bet", "m2_bet", "c_net_bet", "wins", "losses", "pushes")
+
+
+class Accumulator:
+    """Online momenten van (net, bet) per ronde."""
+
+    __slots__ = _FIELDS
+
+    def __init__(self):
+        self.n = 0
+        self.mean_net = 0.0
+        self.m2_net = 0.0
+        self.mean_bet = 0.0
+        self.m2_bet = 0.0
+        self.c_net_bet = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+
+    def add(self, net: float, bet: float = 1.0) -> None:
+        """Voeg één ronde toe."""
+        self.n += 1
+        n = self.n
+        dn = net - self.mean_net
+        db = bet - self.mean_bet
+        self.mean_net += dn / n
+        self.mean_bet += db / n
+        self.m2_net += dn * (net - self.mean_net)
+        self.m2_bet += db * (bet - self.mean_bet)
+        self.c_net_bet += dn * (bet - self.mean_bet)
+        if net > 0:
+            self.wins += 1
+        elif net < 0:
+            self.losses += 1
+        else:
+            self.pushes += 1
+
+    def add_many(self, nets, bets=None) -> None:
+        """Voeg een reeks rondes toe (NumPy arrays); één merge per oproep."""
+        nets = np.asarray(nets, dtype=float).ravel()
+        if not nets.size:
+            return
+        bets = np.ones_like(nets) if bets is None else np.asarray(bets, dtype=float).ravel()
+        part = Accumulator()
+        part.n = nets.size
+        part.mean_net = float(nets.mean())
+        part.mean_bet = float(bets.mean())
+        dn = nets - part.mean_net
+        db = bets - part.mean_bet
+        part.m2_net = float(dn @ dn)
+        part.m2_bet = float(db @ db)
+        part.c_net_bet = float(dn @ db)
+        part.wins = int(np.count_nonzero(nets > 0))
+        part.losses = int(np.count_nonzero(nets < 0))
+        part.pushes = part.n - part.wins - part.losses
+        self.merge(part)
+
+    def merge(self, other: "Accumulator") -> None:
+        """Voeg de rondes van een andere accumulator toe (in-place)."""
+        if not other.n:
+            return
+        if not self.n:
+            for f in _FIELDS:
+                setattr(self, f, getattr(other, f))
+            return
+        na, nb = self.n, other.n
+        n = na + nb
+        dn = other.mean_net - self.mean_net
+        db = other.mean_bet - self.mean_bet
+        w = na * nb / n
+        self.m2_net += other.m2_net + dn * dn * w
+        self.m2_bet += other.m2_bet + db * db * w
+        self.c_net_bet += other.c_net_bet + dn * db * w
+        self.mean_net += dn * nb / n
+        self.mean_bet += db * nb / n
+        self.n = n
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+
+    def __add__(self, other: "Accumulator") -> "Accumulator":
+        out = Accumulator()
+        out.merge(self)
+        out.merge(other)
+        return out
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Accumulator) and self.to_dict() == other.to_dict()
+
+    @property
+    def variance(self) -> float:
+        """Steekproefvariantie van het netto resultaat per ronde."""
+        return self.m2_net / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def edge(self) -> float:
+        """EV per ingezette eenheid."""
+        return self.mean_net / self.mean_bet if self.mean_bet else 0.0
+
+    @property
+    def edge_stderr(self) -> float:
+        """Standaardfout van `edge` (delta-methode voor som net / som inzet)."""
+        if self.n < 2 or not self.mean_bet:
+            return math.inf
+        r = self.edge
+        var = (self.m2_net - 2 * r * self.c_net_bet + r * r * self.m2_bet) / (self.n - 1)
+        return math.sqrt(max(var, 0.0) / self.n) / self.mean_bet
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Betrouwbaarheidsinterval voor `edge` (normale benadering)."""
+        half = NormalDist().inv_cdf(0.5 + confidence / 2) * self.edge_stderr
+        return self.edge - half, self.edge + half
+
+    @property
+    def n0(self) -> float:
+        """Rondes tot de verwachte winst gelijk is aan één standaardafwijking."""
+        return self.variance / (self.mean_net ** 2) if self.mean_net else math.inf
+
+    @property
+    def score(self) -> float:
+        """SCORE: 1e6 * (EV / SD)^2 per ronde."""
+        return 1e6 * self.mean_net ** 2 / self.variance if self.variance else 0.0
+
+    def rates(self) -> Tuple[float, float, float]:
+        """(win, loss, push) fracties van de rondes."""
+        if not self.n:
+            return 0.0, 0.0, 0.0
+        return self.wins / self.n, self.losses / self.n, self.pushes / self.n
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f: getattr(self, f) for f in _FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "Accumulator":
+        acc = cls()
+        for f in _FIELDS:
+            setattr(acc, f, type(getattr(acc, f))(data[f]))
+        return acc
+
+    def summary(self, confidence: float = 0.95) -> Dict[str, Optional[float]]:
+        """Alle afgeleide grootheden als dict (voor printen of JSON)."""
+        low, high = self.confidence_interval(confidence)
+        win, loss, push = self.rates()
+        return {"rounds": self.n, "mean_net": self.mean_net, "std": self.std, "edge": self.edge,
+                "ci_low": low, "ci_high": high, "n0": self.n0, "score": self.score,
+                "win_rate": win, "loss_rate": loss, "push_rate": push}
+
+# Gemaakt door Joshua Meuleman
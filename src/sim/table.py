@@ -0,0 +1,255 @@
+# Gemaakt door Joshua Meuleman
+"""Headless tafel: tot 7 seats basic strategy zonder spelerobjecten.
+
+`HeadlessTable` speelt dezelfde rondes als `Game.play_round` met
+`BaselinePlayer` spelers, maar zonder `Hand`, dicts of `try/except` per
+speler. Elke hand is een paar ints (hard totaal, aantal azen); een beslissing
+is één indexering in de strategy table. Splitsen, resplitsen, split Aces,
+double after split en late surrender volgen de `Rules` zoals in
+`player_impls`. Na de ronde wordt elke hand samengevat tot zijn settle state
+(`src.settlement`) en afgerekend met één lookup in de outcome table
+(speler state x dealer state -> multiplier).
+
+Resultaten komen terug als compacte arrays (`TableResults`) in plaats van een
+dict per speler en hand. De shoe is een `array('B')` die tussen shoes
+hergebruikt en in place herschud wordt; trekken is een positie-index die afloopt, net als
+`deck.draw` van achteraan. Ook de opslag voor de handen van een ronde wordt
+één keer gealloceerd.
+
+Met dezelfde `rng` en regels als `Game(compact=True, rng=..., rules=...)` en
+dezelfde seats geeft `play` exact dezelfde netto resultaten per ronde en seat.
+"""
+import random
+from array import array
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from ..deck import create_shoe, shuffle
+from ..hand import HARD_VALUES, ACE
+from ..settlement import BLACKJACK, BUST, NUM_STATES, SURRENDER as SURRENDERED, outcome_table
+from ..rules import Rules
+from ..ai.basic_strategy import (
+    HIT, DOUBLE, SPLIT, SURRENDER, SOFT_BASE, PAIR_BASE, HARD_STATES, rules_table, without_surrender,
+)
+
+MAX_SEATS = 7
+
+
+class TableResults(NamedTuple):
+    """Resultaten van `HeadlessTable.play`.
+
+    nets / bets: netto resultaat en totale inzet (alle handen) per (ronde, seat);
+    dealer: settle state van de dealer per ronde; shoes: aantal geschudde shoes.
+    """
+    nets: np.ndarray
+    bets: np.ndarray
+    dealer: np.ndarray
+    shoes: int
+
+
+class HeadlessTable:
+    """Volledige 1..7-seat tafel met een vaste inzet per seat.
+
+    num_decks / reshuffle_at_percent / rng: zoals bij `Game`
+    strategy: gecompileerde strategy table (standaard die van de regels)
+    rules: `Rules` set; vervangt num_decks, reshuffle_at_percent, de soft 17
+    regel en de blackjack payout
+    """
+
+    def __init__(self, seats: int = MAX_SEATS, num_decks: int = 6, reshuffle_at_percent: float = 0.25,
+                 strategy: Optional[bytes] = None, bet: int = 1, rng: Optional[random.Random] = None,
+                 stand_on_soft_17: bool = True, blackjack_payout: float = 1.5,
+                 rules: Optional[Rules] = None):
+        if not 1 <= seats <= MAX_SEATS:
+            raise ValueError(f"seats must be 1..{MAX_SEATS}, got {seats}")
+        if rules is None:
+            rules = Rules(num_decks=num_decks, stand_on_soft_17=stand_on_soft_17,
+                          blackjack_payout=blackjack_payout,
+                          penetration=round(1.0 - reshuffle_at_percent, 12))
+        self.rules = rules
+        self.seats = int(seats)
+        self.num_decks = rules.num_decks
+        self.reshuffle_at_percent = rules.reshuffle_at_percent
+        self.bet = bet
+        self.rng = rng
+        table = strategy or rules_table(rules)
+        if not rules.surrender:
+            # picked once: without surrender the cell's chart action is played
+            table = without_surrender(table)
+        self._table = table
+        # the action without surrender, for a surrender cell that cannot surrender
+        self._plain = without_surrender(table)
+        self._payouts = outcome_table(rules.blackjack_payout)[1]
+        self.shoe = create_shoe(self.num_decks)
+        # cards left in the shoe; the next card is shoe[pos - 1]
+        self.pos = 0
+        self.shoes = 0
+        # same test as Game.should_reshuffle: reshuffle at pos <= cut, with the
+        # cut card placed again by every start_shoe
+        self._cut = 0
+        # per round: seat, settle state and stake of every hand; per seat the
+        # two cards of every hand, filled when a split creates it
+        per_seat = max(rules.max_splits, 0) + 1
+        self._hand_seat = [0] * (self.seats * per_seat)
+        self._hand_state = [0] * (self.seats * per_seat)
+        self._hand_stake = [0] * (self.seats * per_seat)
+        self._first = [0] * per_seat
+        self._second = [0] * per_seat
+
+    def start_shoe(self) -> None:
+        """Schud een nieuwe shoe in de bestaande buffer en plaats de cut card.
+
+        Zoals `Game.start_shoe`, zodat dezelfde rng dezelfde shoes geeft.
+        """
+        shoe = self.shoe
+        shuffle(shoe, self.rng)
+        self.pos = len(shoe)
+        self._cut = self.rules.cut_card(self.rng, self.seats)
+        self.shoes += 1
+
+    def play(self, rounds: int) -> TableResults:
+        """Speel `rounds` rondes (over shoes heen) en geef de arrays terug."""
+        seats = self.seats
+        rules = self.rules
+        nets = array('d', bytes(8 * rounds * seats))
+        bets = array('d', nets)
+        dealer_states = bytearray(rounds)
+        shoes_before = self.shoes
+        values = HARD_VALUES
+        table = self._table
+        plain = self._plain
+        payouts = self._payouts
+        bet = self.bet
+        h17 = not rules.stand_on_soft_17
+        peek = rules.peek
+        max_splits = rules.max_splits
+        one_card_aces = not rules.hit_split_aces
+        das = rules.double_after_split
+        surrender = rules.surrender
+        hand_seat, hand_state, hand_stake = self._hand_seat, self._hand_state, self._hand_stake
+        first, second = self._first, self._second
+        batch = 2 * (seats + 1)
+        shoe, pos = self.shoe, self.pos
+        out = 0
+        for r in range(rounds):
+            if pos <= self._cut:
+                self.start_shoe()
+                pos = self.pos
+            if pos < batch:
+                raise IndexError("draw_many from a deck with too few cards")
+            # the opening batch in draw order: one card per seat and the
+            # dealer, twice; card k of the batch is shoe[top - k]
+            top = pos - 1
+            pos -= batch
+            up = shoe[top - seats] & 15
+            hole = shoe[top - 2 * seats - 1] & 15
+            peeked = peek and values[up] + values[hole] == 11 and (up == ACE or hole == ACE)
+            n_hands = 0
+            for i in range(seats):
+                first[0] = shoe[top - i] & 15
+                second[0] = shoe[top - seats - 1 - i] & 15
+                count = 1
+                # no decisions after a peeked dealer blackjack or for split Aces
+                one_card = peeked
+                j = 0
+                while j < count:
+                    c1, c2 = first[j], second[j]
+                    hard = values[c1] + values[c2]
+                    aces = (c1 == ACE) + (c2 == ACE)
+                    two = True
+                    stake = bet
+                    gave_up = False
+                    while not one_card:
+                        if two and c1 == c2:
+                            state = PAIR_BASE + c1
+                        elif aces and hard <= 11:
+                            state = SOFT_BASE + hard - 1
+                        else:
+                            state = hard if hard < HARD_STATES else HARD_STATES - 1
+                        action = table[(state << 4) | up]
+                        if action == SPLIT:
+                            if two and c1 == c2 and count <= max_splits:
+                                # each half draws its second card, this hand first
+                                if pos < 2:
+                                    raise IndexError("draw from an empty shoe")
+                                pos -= 2
+                                c2 = shoe[pos + 1] & 15
+                                first[count], second[count] = c1, shoe[pos] & 15
+                                count += 1
+                                hard = values[c1] + values[c2]
+                                aces = (c1 == ACE) + (c2 == ACE)
+                                if c1 == ACE and one_card_aces:
+                                    one_card = True
+                                continue
+                            # no split allowed: play the pair's total
+                            state = SOFT_BASE + hard - 1 if aces and hard <= 11 else hard
+                            action = table[(state << 4) | up]
+                        if action == SURRENDER:
+                            if surrender and count == 1 and two:
+                                gave_up = True
+                                break
+                            action = plain[(state << 4) | up]
+                        if action == DOUBLE and count > 1 and not das:
+                            action = HIT
+                        if action != HIT and action != DOUBLE:
+                            break
+                        if pos < 1:
+                            raise IndexError("draw from an empty shoe")
+                        pos -= 1
+                        c = shoe[pos] & 15
+                        hard += values[c]
+                        if c == ACE:
+                            aces += 1
+                        two = False
+                        if action == DOUBLE:
+                            stake = 2 * bet
+                            break
+                        if hard > 21:
+                            break
+                    if gave_up:
+                        state = SURRENDERED
+                    elif aces and hard <= 11:
+                        # a split hand's two-card 21 is not a blackjack
+                        state = BLACKJACK if hard == 11 and two and count == 1 else hard + 10
+                    else:
+                        state = BUST if hard > 21 else hard
+                    hand_seat[n_hands] = out + i
+                    hand_state[n_hands] = state
+                    hand_stake[n_hands] = stake
+                    n_hands += 1
+                    j += 1
+
+            hard = values[up] + values[hole]
+            aces = (up == ACE) + (hole == ACE)
+            if aces and hard == 11:
+                dealer = BLACKJACK
+            else:
+                # without blackjack the dealer plays out, like Dealer.play
+                while True:
+                    total = hard + 10 if aces and hard <= 11 else hard
+                    if total < 17 or (h17 and total == 17 and hard == 7):
+                        if pos < 1:
+                            raise IndexError("draw from an empty shoe")
+                        pos -= 1
+                        c = shoe[pos] & 15
+                        hard += values[c]
+                        if c == ACE:
+                            aces += 1
+                        continue
+                    break
+                dealer = BUST if total > 21 else total
+            dealer_states[r] = dealer
+
+            for k in range(n_hands):
+                stake = hand_stake[k]
+                at = hand_seat[k]
+                nets[at] += payouts[hand_state[k] * NUM_STATES + dealer] * stake
+                bets[at] += stake
+            out += seats
+        self.pos = pos
+        shape = (rounds, seats)
+        return TableResults(np.frombuffer(nets).reshape(shape), np.frombuffer(bets).reshape(shape),
+                            np.frombuffer(dealer_states, dtype=np.uint8), self.shoes - shoes_before)
+
+# Gemaakt door Joshua Meuleman
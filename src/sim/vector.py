@@ -0,0 +1,208 @@
+# Gemaakt door Joshua Meuleman
+"""Gevectoriseerde Monte Carlo engine: duizenden shoes tegelijk met NumPy.
+
+Elke rij van een 2-D array is één shoe met rank codes (0..12) in trekvolgorde.
+Alle shoes spelen in lock-step dezelfde ronde: handtotalen, soft-vlaggen en
+bust-maskers zijn arrays over de shoes, en elke beslissing is één indexering
+in de gecompileerde strategy table (`basic_strategy.rules_table` van de regels
+of een tabel uit `strategy_loader`).
+
+De regels volgen `Game.play_round` met `BaselinePlayer` spelers en dezelfde
+`Rules` exact. Alleen regels zonder splitsen (`max_splits=0`), surrender,
+peek en cut card spread worden ondersteund; andere geven een ValueError.
+- herschudden vóór een ronde zodra het resterende deel <= `reshuffle_at_percent`
+  (een vaste cut card);
+- per ronde eerst één kaart per speler en dan de dealer, twee keer;
+- een surrender cel speelt de actie zonder surrender
+  (`basic_strategy.without_surrender`), double kan op elk moment;
+- er wordt niet gesplitst: een paar speelt de actie van zijn totaal
+  (`basic_strategy.without_splits`);
+- de dealer speelt altijd (geen peek) volgens `Dealer`;
+- blackjack betaalt `blackjack_payout`, dealer blackjack wint van alles behalve blackjack.
+Voor dezelfde shoe-volgorde geeft `play_shoes` dus dezelfde netto resultaten
+per ronde als `Game.play_round` met die regels.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from ..deck import RANK_MASK
+from ..hand import HARD_VALUES, ACE, rank_code
+from ..rules import Rules
+from ..ai.basic_strategy import (
+    HIT, DOUBLE, SOFT_BASE, PAIR_BASE, HARD_STATES, rules_table, without_splits, without_surrender,
+)
+
+_VALUES = np.array(HARD_VALUES, dtype=np.int64)
+_TEN = 8
+
+
+class ShoeResults(NamedTuple):
+    """Resultaten van `VectorSimulator.play_shoes`.
+
+    nets: netto resultaat per (shoe, ronde, seat); rondes na het einde van een
+    shoe zijn 0. rounds: aantal gespeelde rondes per shoe.
+    """
+    nets: np.ndarray
+    rounds: np.ndarray
+
+    def played(self) -> np.ndarray:
+        """Netto resultaten van alle gespeelde rondes als (rondes, seats)."""
+        mask = np.arange(self.nets.shape[1]) < self.rounds[:, None]
+        return self.nets[mask]
+
+
+def game_draw_order(shoe) -> np.ndarray:
+    """Rank codes van een `Game` shoe (dicts of kaartcodes) in trekvolgorde."""
+    return np.array([rank_code(c) for c in reversed(shoe)], dtype=np.uint8)
+
+
+class VectorSimulator:
+    """Speelt volledige shoes voor `seats` spelers met een vaste inzet.
+
+    num_decks / reshuffle_at_percent: zoals bij `Game`
+    strategy: gecompileerde strategy table (standaard die van de regels)
+    rules: `Rules` set; vervangt num_decks, reshuffle_at_percent, de soft 17
+    regel en de blackjack payout
+    """
+
+    def __init__(self, num_decks: int = 6, seats: int = 1, reshuffle_at_percent: float = 0.25,
+                 strategy: Optional[bytes] = None, bet: int = 1, stand_on_soft_17: bool = True,
+                 blackjack_payout: float = 1.5, rules: Optional[Rules] = None):
+        if rules is None:
+            rules = Rules(num_decks=int(num_decks), stand_on_soft_17=stand_on_soft_17,
+                          blackjack_payout=blackjack_payout, max_splits=0,
+                          penetration=round(1.0 - reshuffle_at_percent, 12))
+        if rules.max_splits > 0 or rules.surrender or rules.peek or rules.cut_card_spread:
+            raise ValueError("VectorSimulator needs rules without splits, surrender, peek "
+                             f"or cut card spread, got {rules}")
+        self.rules = rules
+        self.num_decks = rules.num_decks
+        self.seats = int(seats)
+        self.reshuffle_at_percent = rules.reshuffle_at_percent
+        self.bet = bet
+        self.stand_on_soft_17 = rules.stand_on_soft_17
+        self.blackjack_payout = rules.blackjack_payout
+        # the lock-step rounds cannot split; pairs play their total, and the
+        # players at the table do not surrender
+        table = without_surrender(without_splits(strategy or rules_table(rules)))
+        self._table = np.frombuffer(table, dtype=np.uint8).copy()
+        self._deck = np.tile(np.arange(13, dtype=np.uint8), 4)
+
+    def shuffle_shoes(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """`n` geschudde shoes als (n, 52 * num_decks) array met rank codes."""
+        rng = rng if rng is not None else np.random.default_rng()
+        shoes = np.tile(self._deck, (int(n), self.num_decks))
+        return rng.permuted(shoes, axis=1, out=shoes)
+
+    def run(self, n_shoes: int, rng: Optional[np.random.Generator] = None,
+            batch_size: int = 4096) -> ShoeResults:
+        """Schud en speel `n_shoes` shoes in batches van `batch_size`."""
+        if n_shoes <= 0:
+            return ShoeResults(np.zeros((0, 0, self.seats)), np.zeros(0, dtype=np.int64))
+        parts = []
+        for start in range(0, n_shoes, batch_size):
+            parts.append(self.play_shoes(self.shuffle_shoes(min(batch_size, n_shoes - start), rng)))
+        width = max(p.nets.shape[1] for p in parts)
+        nets = np.concatenate([np.pad(p.nets, ((0, 0), (0, width - p.nets.shape[1]), (0, 0)))
+                               for p in parts])
+        return ShoeResults(nets, np.concatenate([p.rounds for p in parts]))
+
+    def play_shoes(self, shoes) -> ShoeResults:
+        """Speel elke shoe (rij, rank codes in trekvolgorde) tot herschudden."""
+        shoes = np.asarray(shoes, dtype=np.uint8) & RANK_MASK
+        if shoes.ndim == 1:
+            shoes = shoes[None, :]
+        n, size = shoes.shape
+        per_round = 2 * (self.seats + 1)
+        # spare ten-valued cards so a round that runs past the end can be
+        # played out with masks; such a round is dropped (Game would raise)
+        pad = 12 * (self.seats + 1)
+        cards = np.full((n, size + pad), _TEN, dtype=np.uint8)
+        cards[:, :size] = shoes
+
+        max_rounds = size // per_round + 1
+        nets = np.zeros((n, max_rounds, self.seats))
+        rounds = np.zeros(n, dtype=np.int64)
+        pos = np.zeros(n, dtype=np.int64)
+        active = np.ones(n, dtype=bool)
+        for r in range(max_rounds):
+            # same test as Game.should_reshuffle
+            active &= (size - pos) / float(size) > self.reshuffle_at_percent
+            rows = np.flatnonzero(active)
+            if not rows.size:
+                break
+            net, end = self._play_round(cards, rows, pos[rows])
+            ok = end <= size
+            nets[rows[ok], r] = net[ok]
+            rounds[rows[ok]] += 1
+            pos[rows] = end
+            active[rows[~ok]] = False
+        return ShoeResults(nets, rounds)
+
+    def _play_round(self, cards: np.ndarray, rows: np.ndarray, p: np.ndarray):
+        """Eén ronde voor de shoes `rows` vanaf positie `p`; retourneert (nets, nieuwe p)."""
+        seats = self.seats
+        table = self._table
+        first = cards[rows[:, None], p[:, None] + np.arange(2 * (seats + 1))].astype(np.int64)
+        p = p + 2 * (seats + 1)
+        upcard = first[:, seats]
+
+        totals = []
+        for i in range(seats):
+            c1, c2 = first[:, i], first[:, seats + 1 + i]
+            hard = _VALUES[c1] + _VALUES[c2]
+            ace = (c1 == ACE) | (c2 == ACE)
+            mult = np.ones(rows.size)
+            drew = np.zeros(rows.size, dtype=bool)
+            live = np.ones(rows.size, dtype=bool)
+            pair = np.where(c1 == c2, PAIR_BASE + c1, -1)
+            two_cards = True
+            while live.any():
+                soft = ace & (hard <= 11)
+                state = np.where(soft, SOFT_BASE + hard - 1, np.minimum(hard, HARD_STATES - 1))
+                if two_cards:
+                    # pair states only apply to the first two cards
+                    state = np.where(pair >= 0, pair, state)
+                    two_cards = False
+                action = table[(state << 4) | upcard]
+                take = live & ((action == HIT) | (action == DOUBLE))
+                card = cards[rows, p]
+                hard = hard + np.where(take, _VALUES[card], 0)
+                ace |= take & (card == ACE)
+                p = p + take
+                drew |= take
+                mult[take & (action == DOUBLE)] = 2.0
+                live = take & (action == HIT) & (hard <= 21)
+            natural = ~drew & ace & (hard == 11)
+            totals.append((np.where(ace & (hard <= 11), hard + 10, hard), natural, mult))
+
+        d1, d2 = first[:, seats], first[:, 2 * seats + 1]
+        hard = _VALUES[d1] + _VALUES[d2]
+        ace = (d1 == ACE) | (d2 == ACE)
+        dealer_bj = ace & (hard == 11)
+        while True:
+            soft = ace & (hard <= 11)
+            total = np.where(soft, hard + 10, hard)
+            need = total < 17
+            if not self.stand_on_soft_17:
+                need |= soft & (total == 17)
+            if not need.any():
+                break
+            card = cards[rows, p]
+            hard = hard + np.where(need, _VALUES[card], 0)
+            ace |= need & (card == ACE)
+            p = p + need
+
+        net = np.empty((rows.size, seats))
+        for i, (player, natural, mult) in enumerate(totals):
+            outcome = np.sign(player - total).astype(float)
+            outcome[total > 21] = 1.0
+            outcome[dealer_bj] = -1.0
+            outcome[player > 21] = -1.0
+            outcome[natural & dealer_bj] = 0.0
+            outcome[natural & ~dealer_bj] = self.blackjack_payout
+            net[:, i] = outcome * mult * self.bet
+        return net, p
+
+# Gemaakt door Joshua Meuleman
@@ -0,0 +1,95 @@
+#gemaakt door Joshua Meuleman
+import itertools
+import random
+
+from src.ai.basic_strategy import (
+    choose_action, choose_action_code, hand_state, ACTIONS,
+)
+from src.hand import Hand, parse_card, value, card_value, is_pair, rank_code
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+
+def reference_choose_action(player_hand, dealer_upcard):
+    """The branch-based `choose_action` of the original module, independent of the table.
+
+    The one difference: pair rules only apply to a two-card hand, as in the
+    compiled table (the original split any hand whose first two cards paired).
+    """
+    total, usable = value(player_hand)
+    dealer_rank = parse_card(dealer_upcard)
+    if dealer_rank in ("A", "Ace"):
+        d = 11
+    else:
+        d = card_value(dealer_rank)
+
+    if len(player_hand) == 2 and is_pair(player_hand):
+        r = parse_card(player_hand[0])
+        if r in ("A", "Ace"):
+            return "split"
+        if r == "8":
+            return "split"
+        if r == "5":
+            total = 10
+            usable = False
+        if r in ("10", "J", "Q", "K", "Jack", "Queen", "King"):
+            return "stand"
+        if r in ("2", "3"):
+            return "split" if 2 <= d <= 7 else "hit"
+        if r == "6":
+            return "split" if 2 <= d <= 6 else "hit"
+        if r == "7":
+            return "split" if 2 <= d <= 7 else "hit"
+        if r == "9":
+            return "split" if (2 <= d <= 6) or d in (8, 9) else "stand"
+
+    if usable:
+        if total >= 19:
+            return "stand"
+        if total == 18:
+            if 2 <= d <= 6:
+                return "double"
+            if d in (7, 8):
+                return "stand"
+            return "hit"
+        if total <= 17:
+            if 4 <= d <= 6:
+                return "double"
+            return "hit"
+
+    if total >= 17:
+        return "stand"
+    if 13 <= total <= 16:
+        return "stand" if 2 <= d <= 6 else "hit"
+    if total == 12:
+        return "stand" if 4 <= d <= 6 else "hit"
+    if total == 11:
+        return "double"
+    if total == 10 and d <= 9:
+        return "double"
+    if total == 9 and 3 <= d <= 6:
+        return "double"
+    return "hit"
+
+
+def test_table_matches_chart_for_every_two_card_hand():
+    for a, b, up in itertools.product(RANKS, RANKS, RANKS):
+        assert choose_action([a, b], up) == reference_choose_action([a, b], up)
+
+
+def test_table_matches_chart_for_every_three_card_hand():
+    for a, b, c, up in itertools.product(RANKS, RANKS, RANKS, RANKS):
+        assert choose_action([a, b, c], up) == reference_choose_action([a, b, c], up)
+
+
+def test_table_matches_chart_for_multi_card_hands():
+    rng = random.Random(3)
+    for _ in range(5000):
+        cards = [rng.choice(RANKS) for _ in range(rng.randint(1, 6))]
+        up = rng.choice(RANKS)
+        hand = Hand()
+        for c in cards:
+            hand.add(c)
+        expected = reference_choose_action(cards, up)
+        assert choose_action(cards, up) == expected
+        assert ACTIONS[choose_action_code(hand_state(hand), rank_code(up))] == expected
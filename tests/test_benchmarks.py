@@ -0,0 +1,23 @@
+#gemaakt door Joshua Meuleman
+from benchmarks.harness import Benchmark, compare, run_benchmark
+
+
+def test_run_benchmark_reports_timing_and_memory():
+    def setup():
+        return lambda: [0] * 1000
+    res = run_benchmark(Benchmark("alloc", "micro", 1, "op", setup), repeat=3, min_time=0.001, warmup=0.0)
+    assert res["median_ns"] > 0
+    assert res["min_ns"] <= res["median_ns"]
+    assert res["peak_bytes"] >= 8000
+
+
+def test_compare_flags_slowdowns():
+    base = {"results": {"a": {"median_ns": 100.0}, "b": {"median_ns": 100.0}}}
+    cur = {"results": {"a": {"median_ns": 105.0}, "b": {"median_ns": 130.0}, "new": {"median_ns": 1.0}}}
+    rows = {r["name"]: r for r in compare(base, cur, threshold=0.10)}
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"]["regression"]
+    assert rows["b"]["regression"]
+    assert rows["b"]["ratio"] == 1.3
+
+#gemaakt door Joshua Meuleman
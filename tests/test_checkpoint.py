@@ -0,0 +1,52 @@
+#gemaakt door Joshua Meuleman
+import pytest
+
+from src.sim import runner
+from src.sim.checkpoint import load_checkpoint
+from src.sim.runner import simulate_rounds, simulate_shoes
+
+
+class Preempted(Exception):
+    pass
+
+
+def preempt_after(monkeypatch, cls, calls):
+    """Let `cls.step` raise after `calls` calls, like a killed node."""
+    original = cls.step
+    count = {"n": 0}
+
+    def step(self, max_rounds=None):
+        count["n"] += 1
+        if count["n"] > calls:
+            raise Preempted()
+        original(self, max_rounds)
+    monkeypatch.setattr(cls, "step", step)
+    return original
+
+
+def test_resume_mid_task_is_bit_exact(tmp_path, monkeypatch):
+    args = dict(rounds=900, num_decks=2, seed=4, chunk_rounds=400)
+    expected = simulate_rounds(**args)
+    path = str(tmp_path / "run.ckpt")
+    original = preempt_after(monkeypatch, runner.RoundsTask, 4)
+    with pytest.raises(Preempted):
+        simulate_rounds(**args, checkpoint=path, checkpoint_every=150)
+    state = load_checkpoint(path)
+    # the open task (shoe, RNG, NPC, bankrolls) is part of the checkpoint
+    assert state["current"] is not None and state["current"].stats["rounds"] > 0
+    monkeypatch.setattr(runner.RoundsTask, "step", original)
+    assert simulate_rounds(**args, checkpoint=path, checkpoint_every=150, resume=True) == expected
+
+
+def test_resume_vector_run_and_spec_check(tmp_path, monkeypatch):
+    args = dict(n_shoes=48, num_decks=2, seed=9, chunk_shoes=16)
+    expected = simulate_shoes(**args)
+    path = str(tmp_path / "shoes.ckpt")
+    original = preempt_after(monkeypatch, runner.ShoesTask, 2)
+    with pytest.raises(Preempted):
+        simulate_shoes(**args, checkpoint=path, checkpoint_every=1)
+    monkeypatch.setattr(runner.ShoesTask, "step", original)
+    with pytest.raises(ValueError):
+        simulate_shoes(**dict(args, num_decks=6), checkpoint=path, resume=True)
+    assert simulate_shoes(**args, checkpoint=path, checkpoint_every=1, resume=True) == expected
+#gemaakt door Joshua Meuleman
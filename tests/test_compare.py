@@ -0,0 +1,31 @@
+#gemaakt door Joshua Meuleman
+import numpy as np
+
+from src.game import Game
+from src.sim.compare import compare_strategies, play_shoes_crn, shoe_feed
+from src.sim.runner import task_seeds, python_rng
+
+
+def test_shoe_source_replaces_shuffling():
+    feed_a = shoe_feed(1, python_rng(task_seeds(3, 1)[0]))
+    feed_b = shoe_feed(1, python_rng(task_seeds(3, 1)[0]))
+    game = Game(num_decks=1, compact=True, shoe_source=feed_a)
+    game.start_shoe()
+    assert game.shoe == feed_b()
+
+
+def test_same_seed_replays_the_same_shoes():
+    seed = task_seeds(5, 1)[0]
+    a = play_shoes_crn("baseline", None, 20, 2, seed)
+    b = play_shoes_crn("baseline", None, 20, 2, seed)
+    assert np.array_equal(a["net"], b["net"]) and np.array_equal(a["rounds"], b["rounds"])
+
+
+def test_paired_comparison_reduces_variance():
+    one = compare_strategies(("baseline", "npc"), n_shoes=60, num_decks=2, seed=7, chunk_shoes=20)
+    two = compare_strategies(("baseline", "npc"), n_shoes=60, num_decks=2, seed=7, chunk_shoes=20,
+                             workers=2)
+    assert one["per_strategy"] == two["per_strategy"] and one["paired"] == two["paired"]
+    assert one["variance_ratio"]["npc"] > 1.0
+    assert one["paired"]["npc"].n == 60
+#gemaakt door Joshua Meuleman
@@ -0,0 +1,66 @@
+#gemaakt door Joshua Meuleman
+import pickle
+
+import numpy as np
+import pytest
+
+from src.game import Game
+from src.player_impls import BaselinePlayer
+from src.rules import Rules
+from src.sim.compare import compare_strategies
+from src.sim.corpus import HEADER_SIZE, ShoeCorpus, write_corpus
+from src.sim.runner import simulate_shoes
+from src.sim.vector import VectorSimulator, game_draw_order
+
+
+def test_write_and_reopen(tmp_path):
+    path = write_corpus(str(tmp_path / "shoes.bin"), 10, num_decks=2, seed=1)
+    corpus = ShoeCorpus(path)
+    assert len(corpus) == 10 and corpus.num_decks == 2 and corpus.shoe_size == 104
+    assert (tmp_path / "shoes.bin").stat().st_size == HEADER_SIZE + 10 * 104
+    # every record is a permutation of the same shoe
+    assert all(sorted(corpus.shoe(i)) == sorted(corpus.shoe(0)) for i in range(10))
+    clone = pickle.loads(pickle.dumps(corpus))
+    assert np.array_equal(clone.rows(), corpus.rows())
+    (tmp_path / "bad.bin").write_bytes(b"not a corpus" * 4)
+    with pytest.raises(ValueError):
+        ShoeCorpus(str(tmp_path / "bad.bin"))
+
+
+def test_game_and_vector_engine_replay_the_same_shoes(tmp_path):
+    path = write_corpus(str(tmp_path / "shoes.bin"), 5, num_decks=1, seed=2)
+    corpus = ShoeCorpus(path)
+    game = Game(compact=True, corpus=path, corpus_start=1, rules=Rules(max_splits=0))
+    assert game.num_decks == 1
+    player = BaselinePlayer("p")
+    player.bankroll = 1e12
+    sim = VectorSimulator(num_decks=1)
+    for i in range(1, 5):
+        game.start_shoe()
+        assert game.shoe == corpus.shoe(i)
+        assert np.array_equal(game_draw_order(game.shoe), corpus.rows(i, i + 1)[0] & 0x0F)
+        nets = []
+        while not game.should_reshuffle():
+            try:
+                nets.append(game.play_round([player])[player.id]["net"])
+            except IndexError:
+                # the shoe ran out mid-round
+                break
+        out = sim.play_shoes(corpus.rows(i, i + 1))
+        assert np.array_equal(out.played().ravel(), nets)
+
+
+def test_simulators_accept_a_corpus(tmp_path):
+    path = write_corpus(str(tmp_path / "shoes.bin"), 30, num_decks=2, seed=3)
+    a = simulate_shoes(100, seed=1, chunk_shoes=8, corpus=path)
+    b = simulate_shoes(30, seed=2, chunk_shoes=16, workers=2, corpus=path)
+    assert a["shoes"] == b["shoes"] == 30
+    # same rounds; only the merge order of the chunks differs
+    assert a["hand_stats"].n == b["hand_stats"].n
+    assert a["hand_stats"].edge == pytest.approx(b["hand_stats"].edge)
+    one = compare_strategies(("baseline", "npc"), n_shoes=12, seed=1, chunk_shoes=5, corpus=path)
+    two = compare_strategies(("baseline", "npc"), n_shoes=12, seed=9, chunk_shoes=4, corpus=path)
+    for kind in ("baseline", "npc"):
+        assert one["per_strategy"][kind].n == two["per_strategy"][kind].n == 12
+        assert one["per_strategy"][kind].edge == pytest.approx(two["per_strategy"][kind].edge)
+#gemaakt door Joshua Meuleman
@@ -34,3 +34,38 @@ def test_true_count():
     assert abs(tc - 2.0) < 1e-6
 
 #gemaakt door Joshua Meuleman
+
+
+def test_composition_and_bounded_history(tmp_path):
+    c = Counting(history_size=3)
+    for r in (2, 'K', 'A', 5, 'K'):
+        c.update(make_card(r))
+    assert c.cards_seen == 5
+    assert c.composition[11] == 2  # two Kings
+    assert list(c.history) == ['A', '5', 'K']
+    path = tmp_path / "count.json"
+    c.save(str(path))
+    d = Counting(history_size=3)
+    d.load(str(path))
+    assert d.running_count() == c.running_count()
+    assert d.composition == c.composition and d.cards_seen == 5
+    assert list(d.history) == ['A', '5', 'K']
+
+
+def test_multi_counting_matches_hi_lo_and_batches():
+    from src.ai.multi_counting import MultiCounting
+    from src.deck import create_shoe, shuffle
+    shoe = create_shoe(2)
+    shuffle(shoe)
+    cards = list(shoe[:60])
+    single = MultiCounting(num_decks=2)
+    batch = MultiCounting(num_decks=2)
+    hi_lo = Counting()
+    for card in cards:
+        single.update(card)
+        hi_lo.update(card)
+    batch.update_many(cards)
+    assert single.running_counts() == batch.running_counts()
+    assert single.running_counts()["hi_lo"] == hi_lo.running_count()
+    assert single.running_counts()["ko"] == 4 - 4 * 2 + sum(1 for c in cards if (c & 15) <= 5) - sum(1 for c in cards if (c & 15) >= 8)
+    assert abs(single.true_counts(1.0)["hi_lo"] - hi_lo.true_count(1.0)) < 1e-9
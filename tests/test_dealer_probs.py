@@ -0,0 +1,53 @@
+#gemaakt door Joshua Meuleman
+import itertools
+from fractions import Fraction
+
+from src.ai.dealer_probs import dealer_probabilities, shoe_composition, remove_cards, value_index, OUTCOMES
+from src.dealer import Dealer
+
+
+class _ListGame:
+    def __init__(self, cards):
+        self.cards = list(cards)
+
+    def deal_card(self):
+        return self.cards.pop(0)
+
+
+def exhaustive(upcard, cards, stand_on_soft_17):
+    """Play the dealer over every ordering of a tiny shoe."""
+    counts = dict.fromkeys(OUTCOMES, 0)
+    perms = list(itertools.permutations(cards))
+    for order in perms:
+        dealer = Dealer(stand_on_soft_17=stand_on_soft_17)
+        dealer.receive_card(upcard)
+        dealer.receive_card(order[0])
+        if dealer.is_blackjack():
+            counts["blackjack"] += 1
+            continue
+        dealer.play(_ListGame(order[1:]))
+        v = dealer.best_value()
+        counts["bust" if v > 21 else str(v)] += 1
+    return [Fraction(counts[o], len(perms)) for o in OUTCOMES]
+
+
+def test_matches_exhaustive_enumeration():
+    cards = ["A", "6", "10", "K", "2", "5", "A"]
+    comp = [0] * 10
+    for c in cards:
+        comp[value_index(c)] += 1
+    for up in ("6", "A", "10"):
+        for s17 in (True, False):
+            exact = exhaustive(up, cards, s17)
+            got = dealer_probabilities(up, comp, stand_on_soft_17=s17, peek=False)
+            for e, g in zip(exact, got):
+                assert abs(float(e) - g) < 1e-12
+
+
+def test_six_deck_known_values_and_peek():
+    comp = shoe_composition(6)
+    six = dealer_probabilities("6", remove_cards(comp, ["6"]))
+    assert abs(six[5] - 0.4228) < 5e-4
+    ten = dealer_probabilities("K", remove_cards(comp, ["K"]))
+    assert ten[6] == 0.0
+    assert abs(sum(ten) - 1.0) < 1e-12
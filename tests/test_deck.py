@@ -0,0 +1,120 @@
+#gemaakt door Joshua Meuleman
+
+from src.deck import create_deck, create_shoe, card_code, card_from_code, shuffle, draw
+from src.hand import parse_card
+
+
+def test_compact_shoe_matches_dict_deck():
+    deck = create_deck(2)
+    shoe = create_shoe(2)
+    assert len(shoe) == len(deck) == 104
+    assert [card_from_code(c) for c in shoe] == deck
+    assert [card_code(c) for c in deck] == list(shoe)
+
+
+def test_compact_shoe_shuffle_and_draw():
+    shoe = create_shoe(1)
+    shuffle(shoe)
+    assert sorted(shoe) == sorted(create_shoe(1))
+    last = shoe[-1]
+    card = draw(shoe)
+    assert card == last
+    assert len(shoe) == 51
+    assert parse_card(card) == parse_card(card_from_code(card))
+
+
+def test_draw_many_matches_repeated_draw_and_batches_observers():
+    from src.deck import draw_many, register_batch_observer, unregister_batch_observer
+    deck_a = create_deck(1)
+    deck_b = create_deck(1)
+    batches = []
+    register_batch_observer(batches.append)
+    try:
+        cards = draw_many(deck_a, 5)
+    finally:
+        unregister_batch_observer(batches.append)
+    assert cards == [draw(deck_b) for _ in range(5)]
+    assert deck_a == deck_b
+    assert len(batches) == 1 and list(batches[0]) == cards
+
+
+def test_game_observers_are_scoped_per_table():
+    from src.game import Game
+    a, b = Game(num_decks=1), Game(num_decks=1)
+    a.start_shoe()
+    b.start_shoe()
+    seen_a, seen_b = [], []
+    a.register_draw_observer(seen_a.append)
+    b.register_batch_observer(seen_b.extend)
+    a.deal_card()
+    a.deal_cards(3)
+    b.deal_card()
+    assert len(seen_a) == 4
+    assert len(seen_b) == 1
+    b.unregister_batch_observer(seen_b.extend)
+    b.deal_cards(2)
+    assert len(seen_b) == 1
+
+
+def test_game_shoe_buffer_and_cut_card():
+    import random
+    from src.game import Game
+    from src.player_impls import BaselinePlayer
+    from src.rules import Rules
+    game = Game(compact=True, rng=random.Random(3),
+                rules=Rules(num_decks=2, penetration=0.75, cut_card_spread=0.05))
+    starts = []
+    game.register_shoe_observer(starts.append)
+    assert game.should_reshuffle()
+    game.start_shoe()
+    shoe = game.shoe
+    player = BaselinePlayer("p")
+    player.bankroll = 1e9
+    cuts = {game._cut}
+    for _ in range(300):
+        before, cut, shoes = game.pos, game._cut, len(starts)
+        game.play_round([player])
+        if len(starts) > shoes:
+            # a new shoe only starts once the cut card came out in an earlier round
+            assert before <= cut
+            cuts.add(game._cut)
+        # reshuffled in the same buffer
+        assert game.shoe is shoe and sorted(shoe) == sorted(create_shoe(2))
+    # the cut card lands within penetration +- spread of the 104 cards
+    assert len(starts) > 5 and set(starts) == {2}
+    assert len(cuts) > 1 and all(26 - 5 <= c <= 26 + 5 for c in cuts)
+
+
+def test_game_deals_from_position_without_consuming_the_buffer():
+    from src.game import Game
+    game = Game(num_decks=1, compact=True, shoe_source=lambda: create_shoe(1))
+    game.start_shoe()
+    assert game.pos == 52 and not game.should_reshuffle()
+    assert game.deal_card() == game.shoe[51]
+    assert list(game.deal_cards(3)) == [game.shoe[50], game.shoe[49], game.shoe[48]]
+    assert game.pos == 48 and len(game.shoe) == 52
+    game.deal_cards(48)
+    try:
+        game.deal_card()
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("dealing from an empty shoe should fail")
+    assert game.should_reshuffle()
+
+
+def test_random_cut_card_leaves_room_for_the_last_round():
+    import random
+    from src.game import Game
+    from src.player_impls import BaselinePlayer
+    from src.rules import Rules, round_reserve
+    rules = Rules(num_decks=1, cut_card_spread=0.1)
+    for seats in (3, 5, 7):
+        game = Game(compact=True, rng=random.Random(seats), rules=rules)
+        players = [BaselinePlayer(f"p{i}") for i in range(seats)]
+        for p in players:
+            p.bankroll = 1e9
+        # used to run out of cards within the first hundred rounds
+        for _ in range(500):
+            game.play_round(players)
+            assert game._cut >= round_reserve(seats)
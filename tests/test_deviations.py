@@ -0,0 +1,70 @@
+#gemaakt door Joshua Meuleman
+import os
+
+from src.ai import deviations
+from src.ai.basic_strategy import hand_state, STAND, HIT
+from src.ai.deviations import (
+    DEFAULT_DEVIATIONS, SURRENDER_DEVIATIONS, generate_deviations, count_composition,
+)
+from src.ai.npc import NPC
+from src.rules import Rules
+
+
+def test_default_table_keys():
+    # 16 vs 10 is one cell per ten-valued upcard
+    for up in ("10", "Jack", "Queen", "King"):
+        key = (hand_state(["10", "6"]) << 4) | deviations.rank_code(up)
+        assert DEFAULT_DEVIATIONS[key] == (0.0, STAND, HIT)
+
+
+def test_npc_applies_deviation_by_true_count():
+    hand = [{"rank": "10"}, {"rank": "2"}]
+    npc = NPC(deviations=DEFAULT_DEVIATIONS)
+    npc.start_shoe(1)
+    assert npc.choose_action(hand, "2") == "hit"
+    npc.observe_cards(["2", "3", "4", "5", "6"] * 2)
+    assert npc.true_count() >= 3
+    assert npc.choose_action(hand, "2") == "stand"
+    assert NPC(deviations={}).choose_action(hand, "2") == "hit"
+
+
+def test_surrender_deviations_only_with_surrender():
+    hand = [{"rank": "10"}, {"rank": "5"}]
+    hot = ["2", "3", "4", "5", "6"] * 2
+    npc = NPC(deviations=DEFAULT_DEVIATIONS, surrender_deviations=SURRENDER_DEVIATIONS)
+    npc.start_shoe(1)
+    npc.observe_cards(hot)
+    assert npc.true_count() >= 5
+    # without surrender 15 vs 10 keeps the Illustrious 18 stand at +4
+    assert npc.choose_action(hand, "10") == "stand"
+    npc = NPC(deviations=DEFAULT_DEVIATIONS, surrender_deviations=SURRENDER_DEVIATIONS,
+              rules=Rules(surrender=True))
+    npc.start_shoe(1)
+    npc.observe_cards(["10"] * 4)
+    # below the surrender index the Illustrious 18 cell decides
+    assert npc.choose_action(hand, "King") == "hit"
+    npc.observe_cards(hot)
+    assert npc.choose_action(hand, "King") == "surrender"
+
+
+
+def test_count_composition():
+    comp = count_composition(2, 2)
+    assert sum(comp) == 104 - 4
+    assert count_composition(-1, 2)[9] == 30
+
+
+def test_generate_deviations_is_cached(tmp_path, monkeypatch):
+    args = dict(candidates=[(("10", "2"), "4")], counts=(-4, 0, 4),
+                decks_remaining=1, workers=1, cache_dir=str(tmp_path))
+    table = generate_deviations(**args)
+    key = (hand_state(["10", "2"]) << 4) | deviations.rank_code("4")
+    index, above, below = table[key]
+    assert (above, below) == (STAND, HIT)
+    assert len(os.listdir(tmp_path)) == 1
+
+    def fail(task):
+        raise AssertionError("cached tables must not be recomputed")
+    monkeypatch.setattr(deviations, "_best_by_count", fail)
+    assert generate_deviations(**args) == table
+#gemaakt door Joshua Meuleman
@@ -0,0 +1,127 @@
+#gemaakt door Joshua Meuleman
+import itertools
+
+from src.ai.ev import action_evs, best_action
+from src.ai.dealer_probs import shoe_composition, remove_cards, value_index
+from src.ai.npc import NPC
+from src.dealer import Dealer
+from src.hand import value
+
+
+class _ListGame:
+    def __init__(self, cards):
+        self.cards = list(cards)
+
+    def deal_card(self):
+        return self.cards.pop(0)
+
+
+def brute_force_double(player, upcard, cards):
+    """Double over every ordering of a tiny shoe (no peek)."""
+    total = 0.0
+    perms = list(itertools.permutations(cards))
+    for order in perms:
+        mine, _ = value(player + [order[0]])
+        dealer = Dealer()
+        dealer.receive_card(upcard)
+        dealer.receive_card(order[1])
+        if dealer.is_blackjack():
+            total -= 2
+            continue
+        if mine > 21:
+            total -= 2
+            continue
+        dealer.play(_ListGame(order[2:]))
+        d = dealer.best_value()
+        total += 2 if d > 21 or mine > d else (0 if mine == d else -2)
+    return total / len(perms)
+
+
+def test_double_matches_brute_force():
+    cards = ["A", "2", "5", "10", "K", "7", "9"]
+    comp = [0] * 10
+    for c in cards:
+        comp[value_index(c)] += 1
+    for player, up in ((["5", "6"], "6"), (["A", "7"], "10"), (["10", "2"], "A")):
+        evs = action_evs(player, up, comp, peek=False)
+        assert abs(evs["double"] - brute_force_double(player, up, cards)) < 1e-9
+
+
+def test_known_six_deck_values():
+    full = shoe_composition(6)
+    evs = action_evs(["5", "6"], "6", remove_cards(full, ["5", "6", "6"]))
+    assert abs(evs["double"] - 0.667) < 0.02
+    assert best_action(["5", "6"], "6", remove_cards(full, ["5", "6", "6"])) == "double"
+    assert best_action(["8", "8"], "10", remove_cards(full, ["8", "8", "10"])) == "split"
+    evs = action_evs(["10", "6"], "10", remove_cards(full, ["10", "6", "10"]))
+    assert evs["hit"] > evs["stand"] > -0.6
+    assert set(evs) == {"stand", "hit", "double"}
+
+
+def test_blackjack_and_split_depth():
+    full = shoe_composition(1)
+    comp = remove_cards(full, ["A", "K", "9"])
+    assert action_evs(["A", "K"], "9", comp) == {"stand": 1.5}
+    comp = remove_cards(full, ["8", "8", "6"])
+    once = action_evs(["8", "8"], "6", comp)["split"]
+    assert "split" not in action_evs(["8", "8"], "6", comp, max_splits=0)
+    assert action_evs(["8", "8"], "6", comp, max_splits=3)["split"] >= once
+
+
+def test_split_hands_only_get_the_allowed_actions():
+    full = shoe_composition(1)
+    comp = remove_cards(full, ["8", "8", "6"])
+    evs = action_evs(["8", "8"], "6", comp, max_splits=1, hands=2, surrender=True)
+    assert set(evs) == {"stand", "hit", "double"}
+    evs = action_evs(["8", "8"], "6", comp, max_splits=1, hands=2, double_after_split=False)
+    assert set(evs) == {"stand", "hit"}
+    assert "split" in action_evs(["8", "8"], "6", comp, max_splits=3, hands=3)
+    assert "split" not in action_evs(["8", "8"], "6", comp, max_splits=3, hands=4)
+    # a split hand's two-card 21 is no blackjack
+    comp = remove_cards(full, ["A", "K", "9"])
+    assert action_evs(["A", "K"], "9", comp, hands=2)["stand"] < 1.0
+    npc = NPC(composition_play=True, ev_rules={"peek": False, "double_after_split": False})
+    npc.start_shoe(1)
+    npc.observe_cards(["5", "6", "6"])
+    assert npc.choose_action(["5", "6"], "6") == "double"
+    assert npc.choose_action(["5", "6"], "6", hands=2) == "hit"
+
+
+def test_npc_composition_play():
+    npc = NPC(composition_play=True)
+    npc.start_shoe(1)
+    # every 2..6 is gone: a hard 14 busts on most hits
+    npc.observe_cards([r for r in ("2", "3", "4", "5", "6") for _ in range(4)])
+    npc.observe_cards(["7", "7", "8"])
+    assert npc.remaining_composition() == (4, 0, 0, 0, 0, 0, 2, 3, 4, 16)
+    player = [{"rank": "7"}, {"rank": "7"}]
+    assert npc.choose_action(player, "8") == "stand"
+    assert NPC().choose_action(player, "8") == "hit"
+
+
+def test_caches_stay_bounded_across_decisions():
+    from src.ai import dealer_probs, ev
+    ev.clear_cache()
+    assert dealer_probs.cache_size() == 0
+    full = shoe_composition(6)
+    seen = ["4", "5", "6"]
+    for k in range(4):
+        comp = remove_cards(full, seen[:k] + ["2", "3", "7"])
+        action_evs(["2", "3"], "7", comp, peek=False)
+        # never more than the limit plus one decision's own states
+        assert dealer_probs.cache_size() <= ev.CACHE_LIMIT + 80_000
+    ev.clear_cache()
+    assert dealer_probs.cache_size() == 0
+
+
+
+def test_surrender_ev_against_a_possible_blackjack():
+    full = shoe_composition(6)
+    comp = remove_cards(full, ["10", "6", "A"])
+    assert action_evs(["10", "6"], "A", comp, peek=True, surrender=True)["surrender"] == -0.5
+    evs = action_evs(["10", "6"], "A", comp, peek=False, surrender=True)
+    # without peek surrender loses the full bet to the 95/309 dealer blackjacks
+    assert abs(evs["surrender"] - (-0.5 - 0.5 * 95 / 309)) < 1e-12
+
+
+#gemaakt door Joshua Meuleman
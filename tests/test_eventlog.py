@@ -0,0 +1,78 @@
+#gemaakt door Joshua Meuleman
+import random
+
+import numpy as np
+
+from src.deck import RANKS
+from src.game import Game
+from src.hand import HI_LO_TAGS
+from src.player_impls import BaselinePlayer
+from src.sim.eventlog import (DEAL, DEALER, DEALER_SEAT, DECISION, DRAW, NO_CARD, RESHUFFLE,
+                              SETTLE, EventLog, iter_chunks, read_events)
+
+
+def play(path, rounds=300, compact=True, **log_args):
+    random.seed(4)
+    drawn = []
+    nets = []
+    with EventLog(path, **log_args) as log:
+        game = Game(num_decks=1, compact=compact, event_log=log)
+        game.register_batch_observer(drawn.extend)
+        players = [BaselinePlayer(f"p{i}") for i in range(2)]
+        for p in players:
+            p.bankroll = 1e12
+        for _ in range(rounds):
+            res = game.play_round(players)
+            nets.append([res[p.id]["net"] for p in players])
+    return drawn, np.array(nets)
+
+
+def test_events_replay_the_table(tmp_path):
+    drawn, nets = play(str(tmp_path / "events.bin"))
+    events = read_events(str(tmp_path / "events.bin"))
+    assert events["round"].max() == 300
+
+    cards = events[np.isin(events["kind"], (DEAL, DRAW, DEALER)) & (events["card"] != NO_CARD)]
+    assert list(cards["card"]) == list(drawn)
+    # running Hi-Lo count and cards dealt restart at every reshuffle
+    count = dealt = 0
+    for e in events:
+        if e["kind"] == RESHUFFLE:
+            count = dealt = 0
+        elif e["card"] != NO_CARD:
+            count += HI_LO_TAGS[e["card"] & 0x0F]
+            dealt += 1
+        assert (e["count"], e["dealt"]) == (count, dealt)
+
+    settle = events[events["kind"] == SETTLE]
+    per_seat = np.zeros_like(nets)
+    np.add.at(per_seat, (settle["round"] - 1, settle["seat"]), settle["amount"])
+    assert np.array_equal(per_seat, nets)
+    # split hands settle one by one
+    assert settle["hand"].max() > 0
+    deal = events[(events["kind"] == DEAL) & (events["seat"] != DEALER_SEAT)]
+    assert set(deal["amount"]) == {1.0}
+    # every hit or double is followed by the card it drew
+    kinds = events["kind"]
+    hits = np.flatnonzero((kinds == DECISION) & np.isin(events["action"], (0, 2)))
+    assert np.all(kinds[hits + 1] == DRAW)
+    assert np.all(events["seat"][hits + 1] == events["seat"][hits])
+    assert np.all(events[kinds == DEALER]["seat"] == DEALER_SEAT)
+
+
+def test_batching_and_compression_do_not_change_the_events(tmp_path):
+    play(str(tmp_path / "a.bin"))
+    play(str(tmp_path / "b.bin"), batch=7, compress=6)
+    a = read_events(str(tmp_path / "a.bin"))
+    b = read_events(str(tmp_path / "b.bin"))
+    assert len(list(iter_chunks(str(tmp_path / "b.bin")))) > 1
+    assert a.tobytes() == b.tobytes()
+    assert (tmp_path / "b.bin").stat().st_size < (tmp_path / "a.bin").stat().st_size
+
+
+def test_dict_cards(tmp_path):
+    drawn, _ = play(str(tmp_path / "events.bin"), rounds=20, compact=False)
+    cards = read_events(str(tmp_path / "events.bin"))
+    cards = cards[cards["card"] != NO_CARD]
+    assert [RANKS[c & 0x0F] for c in cards["card"]] == [d["rank"] for d in drawn]
+#gemaakt door Joshua Meuleman
@@ -27,3 +27,35 @@ def test_is_soft_false():
 	hand = [{'rank': 'A', 'suit': 'Hearts'}, {'rank': 'K', 'suit': 'Clubs'}, {'rank': '2', 'suit': 'Clubs'}]
 	assert is_soft(hand) is False
 
+
+
+def test_hand_running_totals_match_value():
+	import random
+	from src.hand import Hand
+	ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+	rng = random.Random(7)
+	for _ in range(500):
+		hand = Hand()
+		cards = []
+		for _ in range(rng.randint(1, 7)):
+			card = {'rank': rng.choice(ranks), 'suit': 'Hearts'}
+			hand.add(card)
+			cards.append(card)
+			total, usable = value(cards)
+			assert hand.best_value() == total
+			assert hand.is_soft() is usable
+			assert hand.is_bust() == is_bust(cards)
+			assert hand.is_blackjack() == is_blackjack(cards)
+
+
+def test_rank_table_accepts_every_spelling():
+	from src.hand import rank_code, parse_card, RANK_NAMES
+	from src.deck import create_shoe, card_from_code
+	assert rank_code('Jack') == rank_code('J') == rank_code({'rank': 'Jack'}) == 9
+	assert RANK_NAMES[rank_code('T')] == 'Ten'
+	assert rank_code('joker') == -1
+	for code in create_shoe(1):
+		assert parse_card(code) == parse_card(card_from_code(code))
+	# an int is a card code, a numeric rank is a string
+	assert parse_card(10) == 'Q' and parse_card('10') == '10'
+	assert rank_code(2) == rank_code('4')
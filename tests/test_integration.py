@@ -18,7 +18,7 @@ def test_integration_round_counts_and_bet():
         npc.observe_card(c)
     npc.observe_card(dealer[0])
 
-    assert len(npc.counting.seen) == 3
+    assert npc.counting.cards_seen == 3
     # recommended bet returns an integer and true_count is a float
     assert isinstance(npc.recommended_bet(), int)
     assert isinstance(npc.true_count(), float)
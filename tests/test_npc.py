@@ -15,7 +15,7 @@ def test_npc_remembers_seen_cards_and_counts():
     for c in seq:
         npc.observe_card(c)
     # seen should equal number of observed cards
-    assert len(npc.counting.seen) == len(seq)
+    assert npc.counting.cards_seen == len(seq)
     # running count should be +5 for 2-6
     assert npc.running_count() == 5
     # recommended bet should be at least 1 (and increase when TC rises)
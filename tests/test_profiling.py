@@ -0,0 +1,51 @@
+#gemaakt door Joshua Meuleman
+import pickle
+import random
+
+from src.game import Game
+from src.player_impls import BaselinePlayer
+from src.profiling import GAME_PHASES, PhaseProfiler, format_snapshot, periodic_dump
+from src.sim.runner import simulate_rounds
+
+
+def test_game_phases_are_counted():
+    random.seed(2)
+    prof = PhaseProfiler()
+    game = Game(num_decks=1, compact=True, profiler=prof)
+    player = BaselinePlayer("p")
+    player.bankroll = 1e12
+    for _ in range(200):
+        game.play_round([player])
+    snap = prof.snapshot()
+    assert list(snap) == list(GAME_PHASES)
+    assert all(snap[name]["calls"] == 200 for name in GAME_PHASES[1:])
+    assert 0 < snap["shuffle"]["calls"] < 200
+    assert all(sum(h) == c for h, c in zip(prof.hist, prof.calls))
+    for s in snap.values():
+        assert s["p50_us"] <= s["p99_us"] and s["mean_us"] <= s["max_us"]
+    assert "settle" in format_snapshot(snap)
+
+    copy = pickle.loads(pickle.dumps(prof))
+    both = prof + copy
+    assert both.calls == [2 * c for c in prof.calls]
+    assert both.max_ns == prof.max_ns
+
+
+def test_percentile_bucket_bounds():
+    prof = PhaseProfiler(("a",))
+    for ns in (1000, 1000, 1000, 9000):
+        prof.hist[0][4 * ns.bit_length() + (ns >> (ns.bit_length() - 3)) - 4] += 1
+        prof.calls[0] += 1
+    assert 1000 <= prof.percentile(0, 0.5) <= 1250
+    assert 9000 <= prof.percentile(0, 0.99) <= 10240
+
+
+def test_simulator_profile_and_progress():
+    dumps = []
+    plain = simulate_rounds(3000, num_decks=2, seed=5, chunk_rounds=1000)
+    timed = simulate_rounds(3000, num_decks=2, seed=5, chunk_rounds=1000, profile=True,
+                            progress=periodic_dump(0.0, write=dumps.append))
+    assert timed["profile"].calls[GAME_PHASES.index("settle")] == 3000
+    assert len(dumps) == 3
+    assert timed["npc"] == plain["npc"] and timed["baseline"] == plain["baseline"]
+#gemaakt door Joshua Meuleman
@@ -0,0 +1,93 @@
+#gemaakt door Joshua Meuleman
+import random
+
+import numpy as np
+
+from src.ai.basic_strategy import BASIC_TABLE, choose_action, rules_table
+from src.dealer import Dealer
+from src.deck import create_shoe
+from src.game import Game
+from src.hand import Hand
+from src.player_impls import BaselinePlayer
+from src.rules import DEFAULT_RULES, Rules, as_rules
+from src.sim.table import HeadlessTable
+
+
+def _hand(*cards):
+    h = Hand()
+    for c in cards:
+        h.add(c)
+    return h
+
+
+def test_rules_are_immutable_values():
+    assert as_rules(None) == DEFAULT_RULES
+    assert as_rules({"num_decks": 2}) == Rules(num_decks=2)
+    r = Rules(penetration=0.7)
+    assert r.reshuffle_at_percent == 0.3 and r.cards == 312
+    assert hash(r) == hash(Rules(penetration=0.7))
+
+
+def test_rules_table_per_rule_set():
+    assert rules_table(DEFAULT_RULES) is BASIC_TABLE
+    assert choose_action(_hand("10", "6"), "10") == "hit"
+    assert choose_action(_hand("10", "6"), "10", Rules(surrender=True)) == "surrender"
+    assert choose_action(_hand("2", "2"), "3") == "split"
+    assert choose_action(_hand("2", "2"), "3", {"double_after_split": False}) == "hit"
+    assert choose_action(_hand("8", "8"), "10", Rules(max_splits=0)) == "hit"
+    assert choose_action(_hand("A", "8"), "6", Rules(stand_on_soft_17=False)) == "double"
+    assert rules_table(Rules(surrender=True)) is rules_table(Rules(surrender=True))
+
+
+def test_dealer_soft_17_rule():
+    soft17 = _hand("A", "6")
+    assert not Dealer().must_hit(soft17)
+    assert Dealer(rules=Rules(stand_on_soft_17=False)).must_hit(soft17)
+    assert Dealer(stand_on_soft_17=False).must_hit(soft17)
+
+
+def _stacked(draw_order):
+    """Shoe source that deals `draw_order` first (shoes are drawn from the end)."""
+    def source():
+        shoe = create_shoe(1)
+        for code in draw_order:
+            shoe.remove(code)
+        shoe.extend(reversed(draw_order))
+        return shoe
+    return source
+
+
+def test_game_blackjack_payout_and_peek():
+    ace, ten, king, nine, seven = 0x0C, 0x18, 0x2B, 0x07, 0x05
+    player = BaselinePlayer("p")
+    player.bankroll = 100
+    # player 9 + 7 against a dealer 10 with an Ace in the hole
+    for peek, cards_left in ((True, 48), (False, 47)):
+        game = Game(compact=True, rules=Rules(num_decks=1, peek=peek),
+                    shoe_source=_stacked([nine, ten, seven, 0x1C, 0x2C]))
+        res = game.play_round([player])["p"]
+        assert res["per_hand"][0]["outcome"] in ("dealer_blackjack", "bust")
+        # with peek the player does not get to hit the 16
+        assert game.pos == cards_left
+
+    game = Game(compact=True, rules=Rules(num_decks=1, blackjack_payout=1.2),
+                shoe_source=_stacked([ace, ten, king, nine]))
+    res = game.play_round([player])["p"]
+    assert res["per_hand"][0]["outcome"] == "blackjack"
+    assert res["net"] == 1.2
+
+
+def test_headless_table_follows_rules():
+    rules = Rules(num_decks=2, peek=True, penetration=0.7)
+    game = Game(compact=True, rng=random.Random(3), rules=rules)
+    players = [BaselinePlayer(f"s{i}") for i in range(3)]
+    for p in players:
+        p.bankroll = 1e12
+    expected = []
+    for _ in range(300):
+        res = game.play_round(players)
+        expected.append([res[p.id]["net"] for p in players])
+    table = HeadlessTable(seats=3, rng=random.Random(3), rules=rules)
+    assert np.array_equal(table.play(300).nets, np.array(expected))
+
+#gemaakt door Joshua Meuleman
@@ -0,0 +1,52 @@
+#gemaakt door Joshua Meuleman
+import random
+
+from src.deck import create_deck, shuffle
+from src.sim.runner import simulate_rounds, simulate_shoes
+
+
+def test_shuffle_with_own_rng_is_reproducible():
+    a, b = create_deck(1), create_deck(1)
+    shuffle(a, random.Random(7))
+    shuffle(b, random.Random(7))
+    assert a == b
+
+
+def test_same_seed_same_result_for_any_worker_count():
+    one = simulate_rounds(600, num_decks=2, seed=5, workers=1, chunk_rounds=200)
+    two = simulate_rounds(600, num_decks=2, seed=5, workers=2, chunk_rounds=200)
+    assert one == two
+    assert one["rounds"] == 600
+    assert simulate_rounds(600, num_decks=2, seed=6, workers=1, chunk_rounds=200) != one
+
+
+def test_vector_shoes_are_seeded_per_task():
+    one = simulate_shoes(40, num_decks=2, seed=1, workers=1, chunk_shoes=16)
+    two = simulate_shoes(40, num_decks=2, seed=1, workers=2, chunk_shoes=16)
+    assert one == two
+    assert one["shoes"] == 40 and one["hands"] == one["rounds"]
+
+
+def test_rounds_task_bets_do_not_depend_on_the_bankroll():
+    from src.sim.runner import RoundsTask, task_seeds
+    task = RoundsTask(3000, 2, None, task_seeds(1, 1)[0])
+    task._setup()
+    game = task.table[0]
+    play_round, bets = game.play_round, []
+
+    def recording(players):
+        res = play_round(players)
+        bets.extend(r["per_hand"][0]["bet"] for r in res.values())
+        return res
+    game.play_round = recording
+    task.step()
+    assert len(bets) == 6000 and min(bets) >= 1
+
+    one = simulate_rounds(4000, num_decks=2, seed=3, chunk_rounds=4000)
+    many = simulate_rounds(4000, num_decks=2, seed=3, chunk_rounds=250)
+    for key in ("baseline", "npc"):
+        assert one[key].n == many[key].n == 4000
+        assert abs(one[key].mean_bet - many[key].mean_bet) < 0.1
+    assert one["baseline"].mean_bet >= 1
+
+#gemaakt door Joshua Meuleman
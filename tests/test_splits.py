@@ -0,0 +1,105 @@
+#gemaakt door Joshua Meuleman
+from src.deck import create_shoe
+from src.game import Game
+from src.player_impls import BaselinePlayer, NPCPlayer
+from src.rules import Rules
+
+RANK = {"2": 0, "3": 1, "5": 3, "6": 4, "8": 6, "9": 7, "10": 8, "A": 12}
+
+
+def stacked(*ranks):
+    """Shoe source dealing `ranks` first: player, upcard, player, hole card, draws."""
+    def source():
+        shoe = create_shoe(1)
+        codes = []
+        for r in ranks:
+            code = next(c for c in shoe if c & 0x0F == RANK[r] and c not in codes)
+            codes.append(code)
+        for code in codes:
+            shoe.remove(code)
+        shoe.extend(reversed(codes))
+        return shoe
+    return source
+
+
+def play(ranks, player=None, **rules):
+    game = Game(compact=True, rules=Rules(num_decks=1, **rules), shoe_source=stacked(*ranks))
+    player = player or BaselinePlayer("p")
+    player.bankroll = 100
+    return game.play_round([player])["p"], player
+
+
+def test_split_with_double_after_split():
+    res, player = play(["8", "6", "8", "10", "3", "10", "10", "9"])
+    assert [h["bet"] for h in res["per_hand"]] == [2, 1]
+    assert [h["outcome"] for h in res["per_hand"]] == ["dealer_bust_win", "dealer_bust_win"]
+    assert res["net"] == 3.0
+    assert [h.best_value() for h in player.hands] == [21, 18]
+
+
+def test_no_double_after_split():
+    res, player = play(["8", "6", "8", "10", "3", "10", "10", "9"], double_after_split=False)
+    # 11 is hit instead of doubled
+    assert [h["bet"] for h in res["per_hand"]] == [1, 1]
+
+
+def test_split_aces_take_one_card():
+    res, player = play(["A", "9", "A", "10", "10", "2", "10"])
+    assert [len(h.cards) for h in player.hands] == [2, 2]
+    # a split Ace with a ten is 21, not a blackjack
+    assert [h["outcome"] for h in res["per_hand"]] == ["win", "lose"]
+    assert res["net"] == 0.0
+
+    res, player = play(["A", "9", "A", "10", "10", "2", "6", "10"], hit_split_aces=True)
+    assert [len(h.cards) for h in player.hands] == [2, 3]
+
+
+def test_resplit_limit():
+    res, player = play(["8", "6", "8", "10", "8", "10", "8", "9"], max_splits=1)
+    assert len(player.hands) == 2
+    res, player = play(["8", "6", "8", "10", "8", "10", "3", "10", "10", "9"], max_splits=3)
+    assert len(player.hands) == 3
+
+
+def test_late_surrender():
+    res, _ = play(["10", "10", "6", "9", "2"], surrender=True)
+    assert res["per_hand"] == [{"bet": 1, "outcome": "surrender", "net": -0.5}]
+    res, player = play(["10", "10", "6", "9", "2"])
+    assert len(player.hands[0].cards) == 3
+
+
+def test_surrender_cell_without_surrender_plays_the_chart():
+    # 10,2 hits to a three-card 17 against an Ace: the H17 surrender cell
+    # cannot be played any more, so the hand stands instead of hitting
+    res, player = play(["10", "A", "2", "9", "5", "6"], surrender=True, stand_on_soft_17=False)
+    assert player.hands[0].best_value() == 17 and not player.hands[0].surrendered
+    assert res["per_hand"] == [{"bet": 1, "outcome": "lose", "net": -1.0}]
+    # split 8s against a ten: the first hand draws another 8 and may neither
+    # resplit nor surrender its 16, so it hits
+    res, player = play(["8", "10", "8", "9", "8", "10", "3"], surrender=True, max_splits=1)
+    assert [h.best_value() for h in player.hands] == [19, 18]
+
+
+
+def test_surrender_against_dealer_blackjack():
+    # 16 against a ten with an Ace in the hole
+    res, player = play(["10", "10", "6", "A"], surrender=True)
+    assert player.hands[0].surrendered
+    assert res["per_hand"] == [{"bet": 1, "outcome": "dealer_blackjack", "net": -1.0}]
+    # with peek the round ends before the player can surrender
+    res, player = play(["10", "10", "6", "A"], surrender=True, peek=True)
+    assert not player.hands[0].surrendered
+    assert res["per_hand"] == [{"bet": 1, "outcome": "dealer_blackjack", "net": -1.0}]
+
+
+
+def test_npc_player_splits_and_reuses_hands():
+    player = NPCPlayer("p")
+    player.npc.start_shoe(1)
+    res, _ = play(["8", "6", "8", "10", "3", "10", "10", "9"], player=player)
+    assert len(res["per_hand"]) == 2
+    pool = list(player._pool)
+    play(["8", "6", "8", "10", "3", "10", "10", "9"], player=player)
+    assert player._pool == pool and all(a is b for a, b in zip(player._pool, pool))
+
+#gemaakt door Joshua Meuleman
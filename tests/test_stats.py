@@ -0,0 +1,50 @@
+#gemaakt door Joshua Meuleman
+import math
+
+import numpy as np
+
+from src.sim.stats import Accumulator
+from src.sim.runner import simulate_shoes
+
+
+def test_welford_matches_numpy_and_merges():
+    rng = np.random.default_rng(0)
+    nets = rng.choice([-2.0, -1.0, 0.0, 1.0, 1.5, 2.0], size=1000)
+    bets = rng.choice([1.0, 2.0, 4.0], size=1000)
+    one = Accumulator()
+    for n, b in zip(nets, bets):
+        one.add(n, b)
+    assert one.n == 1000
+    assert math.isclose(one.mean_net, nets.mean())
+    assert math.isclose(one.variance, nets.var(ddof=1))
+    assert math.isclose(one.edge, nets.sum() / bets.sum())
+    assert one.wins == np.count_nonzero(nets > 0)
+
+    left, right = Accumulator(), Accumulator()
+    left.add_many(nets[:300], bets[:300])
+    right.add_many(nets[300:], bets[300:])
+    merged = left + right
+    for key, val in one.to_dict().items():
+        assert math.isclose(getattr(merged, key), val, abs_tol=1e-9)
+    assert Accumulator.from_dict(merged.to_dict()) == merged
+
+
+def test_confidence_interval_and_derived_values():
+    acc = Accumulator()
+    acc.add_many(np.tile([1.0, -1.0, -1.0, 1.0, 1.0], 2000))
+    low, high = acc.confidence_interval()
+    assert low < acc.edge < high
+    assert math.isclose(acc.edge, 0.2)
+    assert math.isclose(acc.n0, acc.variance / 0.04)
+    assert math.isclose(acc.score, 1e6 * 0.04 / acc.variance)
+    assert acc.rates() == (0.6, 0.4, 0.0)
+
+
+def test_early_stop_is_reproducible():
+    full = simulate_shoes(64, num_decks=2, seed=3, chunk_shoes=8)
+    early = simulate_shoes(64, num_decks=2, seed=3, chunk_shoes=8, ci_width=0.2)
+    assert early["shoes"] < full["shoes"]
+    low, high = early["hand_stats"].confidence_interval()
+    assert high - low <= 0.2
+    assert simulate_shoes(64, num_decks=2, seed=3, chunk_shoes=8, ci_width=0.2, workers=2) == early
+#gemaakt door Joshua Meuleman
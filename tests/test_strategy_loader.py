@@ -0,0 +1,63 @@
+#gemaakt door Joshua Meuleman
+import os
+
+import pytest
+
+from src.ai.basic_strategy import ACTIONS, choose_action_code, hard_state, soft_state, pair_state
+from src.ai.strategy_loader import load_strategy, read_strategy_csv
+from src.ai.npc import NPC
+from src.hand import rank_code
+
+CSV = os.path.join(os.path.dirname(__file__), "BasicStrategy.csv")
+
+
+def action(table, state, up):
+    return ACTIONS[choose_action_code(state, rank_code(up), table)]
+
+
+def test_load_basic_strategy_csv(tmp_path):
+    table = load_strategy(CSV, cache_dir=str(tmp_path))
+    assert action(table, hard_state(16), "K") == "surrender"
+    assert action(table, hard_state(12), "4") == "stand"
+    assert action(table, soft_state(18), "3") == "double"
+    assert action(table, pair_state(rank_code("A")), "A") == "split"
+    assert action(table, pair_state(rank_code("Q")), "6") == "stand"
+    npc = NPC(strategy=table)
+    assert npc.choose_action(["10", "6"], "10") == "surrender"
+
+
+def test_positional_layout_and_cache_roundtrip(tmp_path):
+    with open(CSV) as f:
+        lines = f.read().splitlines()
+    # StrategyImporter only relies on row order, not on the labels
+    unlabeled = tmp_path / "unlabeled.csv"
+    unlabeled.write_text("\n".join([lines[0]] + ["x" + l[l.index(";"):] for l in lines[1:]]))
+    cache = tmp_path / "cache"
+    table = load_strategy(str(unlabeled), cache_dir=str(cache))
+    assert len(os.listdir(cache)) == 1
+    assert table == load_strategy(CSV, cache_dir="")
+    assert read_strategy_csv(str(unlabeled)) == read_strategy_csv(CSV)
+
+
+def test_cache_key_includes_the_compiler(tmp_path, monkeypatch):
+    from src.ai import strategy_loader
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(strategy_loader, "_loaded", {})
+    table = load_strategy(CSV, cache_dir=str(cache))
+    # a stale table under the old key must not be read by a new compiler
+    old = cache / os.listdir(cache)[0]
+    old.write_bytes(old.read_bytes()[:-1] + b"\x00")
+    monkeypatch.setattr(strategy_loader, "_loaded", {})
+    monkeypatch.setattr(strategy_loader, "_CACHE_SALT", b"compiler=2\n")
+    assert load_strategy(CSV, cache_dir=str(cache)) == table
+    assert len(os.listdir(cache)) == 2
+
+
+
+def test_invalid_action_is_rejected(tmp_path):
+    with open(CSV) as f:
+        text = f.read()
+    bad = tmp_path / "bad.csv"
+    bad.write_text(text.replace("16;S;", "16;X;"))
+    with pytest.raises(ValueError):
+        load_strategy(str(bad), cache_dir="")
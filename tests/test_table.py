@@ -0,0 +1,92 @@
+#gemaakt door Joshua Meuleman
+import random
+from array import array
+
+import numpy as np
+import pytest
+
+from src.game import Game
+from src.player_impls import BaselinePlayer
+from src.rules import Rules
+from src.settlement import BLACKJACK, BUST, NUM_STATES, OUTCOMES, outcome_table
+from src.sim.table import HeadlessTable
+
+
+def test_outcome_table():
+    codes, payouts = outcome_table(1.5)
+
+    def lookup(player, dealer):
+        i = player * NUM_STATES + dealer
+        return OUTCOMES[codes[i]], payouts[i]
+
+    assert lookup(BLACKJACK, 20) == ("blackjack", 1.5)
+    assert lookup(BLACKJACK, BLACKJACK) == ("push", 0.0)
+    assert lookup(BUST, BUST) == ("bust", -1.0)
+    assert lookup(21, BLACKJACK) == ("dealer_blackjack", -1.0)
+    assert lookup(12, BUST) == ("dealer_bust_win", 1.0)
+    assert lookup(19, 18) == ("win", 1.0)
+    assert lookup(18, 18) == ("push", 0.0)
+    assert lookup(17, 18) == ("lose", -1.0)
+    assert outcome_table(1.2)[1][BLACKJACK * NUM_STATES + 20] == 1.2
+
+
+@pytest.mark.parametrize("seats", [1, 3, 7])
+def test_headless_table_matches_game(seats):
+    game = Game(num_decks=2, compact=True, rng=random.Random(seats))
+    players = [BaselinePlayer(f"s{i}") for i in range(seats)]
+    for p in players:
+        p.bankroll = 1e12
+    expected = []
+    for _ in range(400):
+        res = game.play_round(players)
+        expected.append([res[p.id]["net"] for p in players])
+
+    table = HeadlessTable(seats=seats, num_decks=2, rng=random.Random(seats))
+    first, rest = table.play(150), table.play(250)
+    nets = np.concatenate([first.nets, rest.nets])
+    assert nets.shape == (400, seats)
+    assert np.array_equal(nets, np.array(expected))
+    bets = np.concatenate([first.bets, rest.bets])
+    assert bets.min() >= 1.0 and bets.max() > 2.0
+    assert first.shoes + rest.shoes > 1
+
+
+@pytest.mark.parametrize("rules", [
+    Rules(num_decks=2, surrender=True, stand_on_soft_17=False),
+    Rules(num_decks=2, double_after_split=False, max_splits=1),
+    Rules(num_decks=2, hit_split_aces=True, peek=True, surrender=True),
+    Rules(num_decks=2, max_splits=0, blackjack_payout=1.2, cut_card_spread=0.1),
+])
+def test_headless_table_matches_game_under_rules(rules):
+    game = Game(compact=True, rng=random.Random(9), rules=rules)
+    players = [BaselinePlayer(f"s{i}") for i in range(5)]
+    for p in players:
+        p.bankroll = 1e12
+    expected = []
+    for _ in range(500):
+        res = game.play_round(players)
+        expected.append([res[p.id]["net"] for p in players])
+    table = HeadlessTable(seats=5, rng=random.Random(9), rules=rules)
+    assert np.array_equal(table.play(500).nets, np.array(expected))
+
+
+def test_headless_table_seat_limit():
+    with pytest.raises(ValueError):
+        HeadlessTable(seats=8)
+
+
+@pytest.mark.parametrize("cards", [
+    [5, 4, 8, 8],   # 16 against a 10 hits
+    [4, 8, 8, 8],   # the dealer's 16 draws
+    [5, 6, 8, 6],   # a pair of 8s splits
+])
+def test_headless_table_runs_out_of_cards(cards):
+    # shoe from the bottom: hole card, second card, upcard, first card
+    table = HeadlessTable(seats=1)
+    table.shoe = array('B', cards)
+    table.pos = len(cards)
+    table._cut = -1
+    with pytest.raises(IndexError):
+        table.play(1)
+
+#gemaakt door Joshua Meuleman
@@ -0,0 +1,93 @@
+#gemaakt door Joshua Meuleman
+import random
+
+import numpy as np
+import pytest
+
+from src.game import Game
+from src.player_impls import BaselinePlayer
+from src.rules import Rules
+from src.sim.vector import VectorSimulator, game_draw_order
+
+
+def play_game_shoe(game, players):
+    """Play one shoe through Game.play_round; return per-round nets."""
+    game.start_shoe()
+    order = game_draw_order(game.shoe)
+    nets = []
+    while not game.should_reshuffle():
+        try:
+            res = game.play_round(players)
+        except IndexError:
+            # the shoe ran out mid-round
+            break
+        nets.append([res[p.id]["net"] for p in players])
+    return order, np.array(nets).reshape(-1, len(players))
+
+
+def test_matches_game_play_round():
+    random.seed(11)
+    for decks, seats in ((1, 1), (2, 3), (1, 5)):
+        game = Game(compact=True, rules=Rules(num_decks=decks, max_splits=0))
+        players = [BaselinePlayer(f"p{i}") for i in range(seats)]
+        for p in players:
+            p.bankroll = 1e12
+        sim = VectorSimulator(num_decks=decks, seats=seats)
+        for _ in range(25):
+            order, expected = play_game_shoe(game, players)
+            out = sim.play_shoes(order)
+            assert out.rounds[0] == len(expected)
+            assert np.array_equal(out.nets[0, :out.rounds[0]], expected)
+
+
+@pytest.mark.parametrize("rules", [
+    Rules(num_decks=2, stand_on_soft_17=False, max_splits=0),
+    Rules(num_decks=1, blackjack_payout=1.2, max_splits=0, penetration=0.6),
+])
+def test_matches_game_under_rules(rules):
+    random.seed(5)
+    game = Game(compact=True, rules=rules)
+    players = [BaselinePlayer(f"p{i}") for i in range(3)]
+    for p in players:
+        p.bankroll = 1e12
+    sim = VectorSimulator(seats=3, rules=rules)
+    for _ in range(25):
+        order, expected = play_game_shoe(game, players)
+        out = sim.play_shoes(order)
+        assert out.rounds[0] == len(expected)
+        assert np.array_equal(out.nets[0, :out.rounds[0]], expected)
+
+
+def test_soft_19_doubles_against_6_under_h17():
+    # A,8 against a 6 (hole 10); a double draws the 2, the dealer busts on a 10
+    first = [12, 4, 6, 8, 0, 8]
+    deck = list(np.tile(np.arange(13), 4))
+    for c in first:
+        deck.remove(c)
+    order = np.array(first + deck, dtype=np.uint8)
+    s17 = VectorSimulator(num_decks=1, rules=Rules(num_decks=1, max_splits=0))
+    h17 = VectorSimulator(num_decks=1, rules=Rules(num_decks=1, stand_on_soft_17=False, max_splits=0))
+    assert s17.play_shoes(order).nets[0, 0, 0] == 1.0
+    assert h17.play_shoes(order).nets[0, 0, 0] == 2.0
+
+
+def test_rejects_unsupported_rules():
+    for rules in (Rules(), Rules(max_splits=0, surrender=True), Rules(max_splits=0, peek=True)):
+        with pytest.raises(ValueError):
+            VectorSimulator(rules=rules)
+
+
+def test_run_no_shoes():
+    res = VectorSimulator(seats=2).run(0)
+    assert res.nets.shape == (0, 0, 2)
+    assert len(res.played()) == 0
+
+
+def test_run_shapes_and_edge():
+    sim = VectorSimulator(num_decks=6, seats=2)
+    res = sim.run(300, np.random.default_rng(3), batch_size=128)
+    assert res.nets.shape[0] == 300 and res.nets.shape[2] == 2
+    played = res.played()
+    assert len(played) == res.rounds.sum()
+    assert -0.1 < played.mean() < 0.05
+#gemaakt door Joshua Meuleman